@@ -0,0 +1 @@
+# Make benchmarks a proper package
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Benchmark: cold-start load time and memory of the dill pickles vs the linear artifact.
+
+A TF-IDF + LogisticRegression model is trained on a synthetic corpus and saved both
+ways. Then --workers processes load the same artifact at once and classify a batch,
+as several serving workers on one host would. For each format the report gives the
+import and load time and, per worker, RSS, PSS (RSS with shared pages split between
+the processes mapping them) and private memory, read from /proc/<pid>/smaps_rollup.
+
+Usage:
+    python benchmarks/bench_artifact_load.py --rows 50000 --max-features 0 --workers 4
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+FORMATS = ("pickle", "linear")
+
+
+def build(work_dir, rows, max_features):
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from benchmarks.bench_train_memory import synthetic_tickets
+    from src.components.data_transformation import DataTransformation
+    from src.components.linear_artifact import LinearTextClassifier, export_linear_artifact
+    from utils import save_object
+
+    df = synthetic_tickets(rows)
+    preprocessor = DataTransformation().get_data_transformer_object()
+    preprocessor.set_params(text_processing__tfidf__max_features=max_features or None)
+    model = LogisticRegression(multi_class='ovr', solver='liblinear')
+    model.fit(preprocessor.fit_transform(df[['text']]), df['category'])
+
+    save_object(os.path.join(work_dir, "preprocessor.pkl"), preprocessor)
+    save_object(os.path.join(work_dir, "model.pkl"), model)
+    export_linear_artifact(preprocessor, model, os.path.join(work_dir, "linear_model"))
+
+    sample = df['text'].head(1000).tolist()
+    expected = model.predict_proba(preprocessor.transform(df[['text']].head(1000)))
+    actual = LinearTextClassifier.load(os.path.join(work_dir, "linear_model")).predict_proba(sample)
+    print(f"vocabulary: {len(preprocessor.transformers_[0][1].steps[0][1].vocabulary_)} terms, "
+          f"max |probability difference| vs sklearn: {np.abs(expected - actual).max():.2e}")
+    with open(os.path.join(work_dir, "sample.json"), "w") as file_obj:
+        json.dump(sample, file_obj)
+
+
+def worker(work_dir, artifact_format):
+    """Load one format, classify the sample, report timings and wait to be measured."""
+    start = time.perf_counter()
+    if artifact_format == "pickle":
+        import pandas as pd
+        from utils import load_object
+        imported = time.perf_counter()
+        preprocessor = load_object(os.path.join(work_dir, "preprocessor.pkl"))
+        model = load_object(os.path.join(work_dir, "model.pkl"))
+        loaded = time.perf_counter()
+        classify = lambda texts: model.predict_proba(preprocessor.transform(pd.DataFrame({'text': texts})))
+    else:
+        from src.components.linear_artifact import LinearTextClassifier
+        imported = time.perf_counter()
+        model = LinearTextClassifier.load(os.path.join(work_dir, "linear_model"))
+        loaded = time.perf_counter()
+        classify = model.predict_proba
+
+    with open(os.path.join(work_dir, "sample.json")) as file_obj:
+        sample = json.load(file_obj)
+    classify(sample)
+    scored = time.perf_counter()
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "load_ms": (loaded - imported) * 1000,
+        "first_batch_ms": (scored - loaded) * 1000,
+    }), flush=True)
+    sys.stdin.read()
+
+
+def smaps_rollup(pid):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as file_obj:
+        for line in file_obj:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return values
+
+
+def measure(work_dir, artifact_format, workers):
+    processes = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--worker", work_dir, "--format", artifact_format],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+        for _ in range(workers)
+    ]
+    timings = [json.loads(process.stdout.readline()) for process in processes]
+    # Every worker is alive and loaded here, so shared pages are split between them.
+    memory = [smaps_rollup(process.pid) for process in processes]
+    for process in processes:
+        process.communicate("")
+
+    mean = lambda rows, key: sum(row[key] for row in rows) / len(rows)
+    private = [row["Private_Clean"] + row["Private_Dirty"] for row in memory]
+    print(
+        f"{artifact_format:6}: import {mean(timings, 'import_ms'):7.1f} ms, load {mean(timings, 'load_ms'):7.1f} ms, "
+        f"first batch {mean(timings, 'first_batch_ms'):7.1f} ms | per worker: RSS {mean(memory, 'Rss'):6.1f} MB, "
+        f"PSS {mean(memory, 'Pss'):6.1f} MB, private {sum(private) / len(private):6.1f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="Synthetic training corpus size")
+    parser.add_argument("--max-features", type=int, default=5000, help="TF-IDF vocabulary cap (0 = no cap)")
+    parser.add_argument("--workers", type=int, default=4, help="Processes loading the artifact at once")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--format", choices=FORMATS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.format)
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        build(work_dir, args.rows, args.max_features)
+        for artifact_format in FORMATS:
+            measure(work_dir, artifact_format, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: sequential vs concurrent LLM enrichment.
+
+Runs PredictionPipeline.predict (two LLM calls back to back) and
+PredictionPipeline.apredict_many (both calls concurrently, many tickets at once)
+against FakeTicketChatModel with an injected per-call latency.
+
+Usage:
+    python benchmarks/bench_async_llm.py --n 50 --latency 0.2 --max-concurrency 16
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.fake_llm import FakeTicketChatModel
+from src.components.llm_service import LLMService
+from src.pipelines.prediction_pipeline import PredictionPipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=50, help="Number of tickets")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per fake LLM call")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="Tickets enriched at once")
+    args = parser.parse_args()
+
+    llm_service = LLMService(model=FakeTicketChatModel(latency=args.latency))
+    pipeline = PredictionPipeline(llm_service=llm_service)
+    texts = [f"My internet has been down since morning, ticket {i}" for i in range(args.n)]
+    pipeline.predict_batch(texts[:1])
+
+    start = time.perf_counter()
+    pipeline.predict(texts[0])
+    single_sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    asyncio.run(pipeline.apredict(texts[0]))
+    single_concurrent = time.perf_counter() - start
+
+    n_sequential = min(args.n, 10)
+    start = time.perf_counter()
+    for text in texts[:n_sequential]:
+        pipeline.predict(text)
+    sequential_rate = n_sequential / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    asyncio.run(pipeline.apredict_many(texts, max_concurrency=args.max_concurrency))
+    concurrent_rate = args.n / (time.perf_counter() - start)
+
+    print(f"single ticket, sequential calls : {single_sequential * 1000:8.1f} ms")
+    print(f"single ticket, concurrent calls : {single_concurrent * 1000:8.1f} ms")
+    print(f"sequential predict()            : {sequential_rate:8.1f} tickets/sec")
+    print(f"apredict_many (limit={args.max_concurrency:<3})       : {concurrent_rate:8.1f} tickets/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: per-ticket classification loop vs PredictionPipeline.predict_batch.
+
+Uses the saved artifacts in saved_models/ and the tweets in data/twcs/sample.csv,
+replicated to the requested number of tickets. LLM enrichment is not exercised.
+
+Usage:
+    python benchmarks/bench_batch_prediction.py --n 20000 --chunk-size 1000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pipelines.prediction_pipeline import PredictionPipeline
+
+
+def load_texts(n):
+    sample = pd.read_csv(os.path.join('data', 'twcs', 'sample.csv'))
+    texts = sample['text'].astype(str).tolist()
+    return (texts * (n // len(texts) + 1))[:n]
+
+
+def per_ticket_loop(pipeline, texts):
+    preprocessor = pipeline.registry.get(pipeline.preprocessor_path)
+    model = pipeline.registry.get(pipeline.model_path)
+    return [
+        model.predict(preprocessor.transform(pd.DataFrame([text], columns=['text'])))[0]
+        for text in texts
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=20000, help="Number of tickets")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="predict_batch chunk size")
+    parser.add_argument("--loop-n", type=int, default=2000, help="Tickets to time in the per-ticket loop")
+    args = parser.parse_args()
+
+    pipeline = PredictionPipeline()
+    texts = load_texts(args.n)
+    # Warm the registry so neither side pays for the first unpickle.
+    pipeline.predict_batch(texts[:10])
+
+    loop_texts = texts[:args.loop_n]
+    start = time.perf_counter()
+    per_ticket_loop(pipeline, loop_texts)
+    loop_rate = len(loop_texts) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pipeline.predict_batch(texts, chunk_size=args.chunk_size)
+    batch_rate = len(texts) / (time.perf_counter() - start)
+
+    print(f"per-ticket loop : {loop_rate:10.0f} tickets/sec ({len(loop_texts)} tickets)")
+    print(f"predict_batch   : {batch_rate:10.0f} tickets/sec ({len(texts)} tickets, chunk_size={args.chunk_size})")
+    print(f"speedup         : {batch_rate / loop_rate:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: import time and cold start of `run.py --predict --classify-only`.
+
+A small TF-IDF + LogisticRegression model is trained into a temporary
+saved_models/ directory. run.py is then started --runs times per setup, as a
+fresh process each time, with (a) the exported linear artifact and (b) only the
+dill pickles, and the wall time to a printed category is reported. It also
+reports import time of the prediction module and which heavy libraries a
+classification-only prediction ends up loading.
+
+Usage:
+    python benchmarks/bench_cli_startup.py --runs 5
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+HEAVY_MODULES = ("pandas", "sklearn", "scipy", "dill", "mlflow", "langchain_core", "langchain_groq")
+TICKET = "my order was charged twice, please refund"
+
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+from src.pipelines.prediction_pipeline import PredictionPipeline
+imported = time.perf_counter()
+PredictionPipeline().predict_batch([{TICKET!r}])
+done = time.perf_counter()
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(f"import {{(imported - start) * 1000:.0f}} ms, first prediction {{(done - imported) * 1000:.0f}} ms, "
+      f"heavy modules loaded: {{', '.join(loaded) or 'none'}}")
+"""
+
+
+def build(work_dir):
+    from sklearn.linear_model import LogisticRegression
+    from benchmarks.bench_train_memory import synthetic_tickets
+    from src.components.data_transformation import DataTransformation
+    from src.components.linear_artifact import export_linear_artifact
+    from utils import save_object
+
+    df = synthetic_tickets(20000)
+    preprocessor = DataTransformation().get_data_transformer_object()
+    model = LogisticRegression(multi_class='ovr', solver='liblinear')
+    model.fit(preprocessor.fit_transform(df[['text']]), df['category'])
+    save_object(os.path.join(work_dir, "saved_models", "preprocessor.pkl"), preprocessor)
+    save_object(os.path.join(work_dir, "saved_models", "model.pkl"), model)
+    export_linear_artifact(preprocessor, model, os.path.join(work_dir, "saved_models", "linear_model"),
+                           model_path=os.path.join(work_dir, "saved_models", "model.pkl"))
+
+
+def time_cli(work_dir, runs):
+    command = [sys.executable, os.path.join(REPO_ROOT, "run.py"), "--predict", TICKET, "--classify-only"]
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run(command, cwd=work_dir, check=True, capture_output=True, text=True).stdout
+        seconds.append(time.perf_counter() - start)
+        if "Category:" not in output:
+            raise RuntimeError(f"run.py printed no category:\n{output}")
+    return seconds
+
+
+def probe(work_dir):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    return subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=work_dir, env=env, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per setup")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        build(work_dir)
+        for label in ("linear artifact", "pickles only"):
+            if label == "pickles only":
+                shutil.rmtree(os.path.join(work_dir, "saved_models", "linear_model"))
+            seconds = time_cli(work_dir, args.runs)
+            print(
+                f"{label:15}: run.py --classify-only median {statistics.median(seconds) * 1000:6.0f} ms "
+                f"(min {min(seconds) * 1000:.0f} ms) | {probe(work_dir)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
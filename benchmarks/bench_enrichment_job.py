@@ -0,0 +1,118 @@
+"""
+Benchmark: bulk enrichment throughput and crash recovery.
+
+Writes a synthetic processed dataset and enriches it with EnrichmentJob against
+FakeTicketChatModel (fixed per-call latency), first with a single worker (the
+one-ticket-at-a-time loop the job replaces) and then with a worker pool. Then
+the job is run in a child process that is SIGKILLed part way through and run
+again, and the output is checked: every ticket exactly once, and only the
+tickets after the last checkpoint enriched twice.
+
+Usage:
+    python benchmarks/bench_enrichment_job.py --tickets 2000 --workers 32 --latency 0.05
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.fake_llm import FakeTicketChatModel
+
+
+def write_dataset(path, n):
+    pd.DataFrame({
+        "tweet_id": np.arange(1, n + 1, dtype=np.int64) * 7,
+        "author_id": [str(i) for i in range(n)],
+        "text": [f"Order {i} never arrived and support keeps ignoring me" for i in range(n)],
+        "category": "shipping",
+    }).to_parquet(path, index=False)
+
+
+def make_job(work_dir, workers, latency, checkpoint_every=100):
+    from src.components.llm_service import LLMService
+    from src.pipelines.enrichment_job import EnrichmentJob, EnrichmentJobConfig
+    from src.pipelines.prediction_pipeline import PredictionPipeline
+
+    config = EnrichmentJobConfig(
+        data_path=os.path.join(work_dir, "tickets.parquet"),
+        output_path=os.path.join(work_dir, "enriched.jsonl"),
+        ids_path=os.path.join(work_dir, "enriched.ids"),
+        state_path=os.path.join(work_dir, "enriched.state.json"),
+        workers=workers,
+        checkpoint_every=checkpoint_every,
+        report_every=1.0,
+    )
+    service = LLMService(model=FakeTicketChatModel(latency=latency))
+    return EnrichmentJob(config, PredictionPipeline(llm_service=service, llm_mode="combined"))
+
+
+def timed_run(n, workers, latency):
+    work_dir = tempfile.mkdtemp()
+    write_dataset(os.path.join(work_dir, "tickets.parquet"), n)
+    start = time.perf_counter()
+    result = make_job(work_dir, workers, latency).run_enrichment()
+    return result["completed"] / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--kill-at", type=float, default=0.4, help="Share of tickets written when the child is killed")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        make_job(args.child, args.workers, args.latency).run_enrichment()
+        return
+
+    single = timed_run(min(args.tickets, 100), 1, args.latency)
+    pooled = timed_run(args.tickets, args.workers, args.latency)
+    print(f"1 worker        : {single:7.1f} tickets/s")
+    print(f"{args.workers:2d} workers      : {pooled:7.1f} tickets/s")
+
+    work_dir = tempfile.mkdtemp()
+    write_dataset(os.path.join(work_dir, "tickets.parquet"), args.tickets)
+    command = [sys.executable, os.path.abspath(__file__), "--child", work_dir,
+               "--workers", str(args.workers), "--latency", str(args.latency)]
+    output_path = os.path.join(work_dir, "enriched.jsonl")
+    child = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    lines_at_kill = 0
+    while lines_at_kill < args.kill_at * args.tickets:
+        time.sleep(0.01)
+        if os.path.exists(output_path):
+            with open(output_path, "rb") as file_obj:
+                lines_at_kill = file_obj.read().count(b"\n")
+    child.send_signal(signal.SIGKILL)
+    child.wait()
+    with open(output_path, "rb") as file_obj:
+        lines_at_kill = file_obj.read().count(b"\n")
+    with open(os.path.join(work_dir, "enriched.state.json")) as file_obj:
+        checkpointed = json.load(file_obj)["completed"]
+
+    start = time.perf_counter()
+    resumed = make_job(work_dir, args.workers, args.latency).run_enrichment()
+    elapsed = time.perf_counter() - start
+
+    with open(output_path) as file_obj:
+        ids = [json.loads(line)["tweet_id"] for line in file_obj]
+    print(f"killed run      : {lines_at_kill} records written, {checkpointed} checkpointed")
+    print(f"resumed run     : {resumed['completed']} tickets enriched in {elapsed:.1f} s "
+          f"({lines_at_kill - checkpointed} redone)")
+    print(f"final output    : {len(ids)} records, {len(set(ids))} unique ids "
+          f"({'OK' if len(ids) == len(set(ids)) == args.tickets else 'MISMATCH'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: throughput of `run.py --predict-file` against the number of workers.
+
+A TF-IDF + LogisticRegression model (see bench_triage.py) is saved with its linear
+artifact in a temporary saved_models/, and a --rows synthetic TWCS CSV is written
+with corpus.py. The file is then classified with FilePredictionJob for each
+--workers count (0 classifies in this process) and the rows/s reported; every
+run's output must match the in-process one row for row.
+
+With N workers the parent still reads the CSV, pickles chunks to the workers,
+unpickles the results and writes the output on its own, so throughput is capped
+at 1 / (parent seconds per row) however many cores there are. That cost is
+measured separately (one pass over the file without classifying) next to the
+classify cost per row, and the expected rows/s on N cores is printed as
+min(N / classify, 1 / parent) rows per second.
+
+Usage:
+    python benchmarks/bench_file_prediction.py --rows 1000000 --workers 0 1 2 4
+"""
+
+import os
+import sys
+import time
+import pickle
+import tempfile
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_triage import build
+from benchmarks.corpus import write_corpus
+from src.pipelines.file_prediction import FilePredictionJob, FilePredictionConfig, _init_worker, _classify_chunk
+
+
+def parent_cost(input_path, output_path, chunk_size):
+    """Seconds the parent spends per row without classifying: read, pickle, unpickle and write."""
+    job = FilePredictionJob(FilePredictionConfig(input_path=input_path, output_path=output_path,
+                                                 chunk_size=chunk_size))
+    job._path = output_path
+    seconds = 0.0
+    start = time.perf_counter()
+    for ids, texts in job.iter_chunks():
+        pickle.dumps((ids, texts), pickle.HIGHEST_PROTOCOL)
+        seconds += time.perf_counter() - start
+        # What a worker sends back, rendered outside the timer.
+        frame = pd.DataFrame({"tweet_id": ids, "category": "General", "confidence": np.random.uniform(size=len(texts))})
+        rendered = pickle.dumps(frame.to_csv(index=False, header=False), pickle.HIGHEST_PROTOCOL)
+        start = time.perf_counter()
+        job._write(len(texts), pickle.loads(rendered))
+    job._file.close()
+    seconds += time.perf_counter() - start
+    return seconds / job.rows
+
+
+def classify_cost(input_path, chunk_size):
+    """Seconds a worker spends per row classifying and rendering CSV (chunks read up front, not timed)."""
+    _init_worker()
+    job = FilePredictionJob(FilePredictionConfig(input_path=input_path, chunk_size=chunk_size))
+    chunks = list(job.iter_chunks())
+    start = time.perf_counter()
+    for ids, texts in chunks:
+        pickle.loads(pickle.dumps(_classify_chunk(ids, texts, "tweet_id", False), pickle.HIGHEST_PROTOCOL))
+    return (time.perf_counter() - start) / sum(len(texts) for _, texts in chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--train-rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    os.chdir(work_dir)  # PredictionPipeline loads saved_models/ relative to the working directory
+    build(work_dir, args.train_rows)
+    input_path = write_corpus(os.path.join(work_dir, "twcs.csv"), args.rows)
+    print(f"{args.rows} rows, {os.path.getsize(input_path) / 2**20:.0f} MiB; "
+          f"{os.cpu_count()} cores; chunks of {args.chunk_size}")
+
+    parent = parent_cost(input_path, os.path.join(work_dir, "parent.csv"), args.chunk_size)
+    classify = classify_cost(input_path, args.chunk_size)
+    print(f"parent {parent * 1e6:.1f} us/row, classify {classify * 1e6:.1f} us/row: "
+          f"at most {1 / parent:.0f} rows/s on any number of cores")
+
+    reference = None
+    for workers in args.workers:
+        output_path = os.path.join(work_dir, f"predictions_{workers}.csv")
+        result = FilePredictionJob(FilePredictionConfig(input_path=input_path, output_path=output_path,
+                                                        workers=workers, chunk_size=args.chunk_size)).run()
+        output = pd.read_csv(output_path)
+        if reference is None:
+            reference = output
+        elif not output.equals(reference):
+            raise SystemExit(f"Output with {workers} workers differs from the first run")
+        # In-process, the parent's work and the classifying add up; with workers they overlap.
+        expected = 1 / (parent + classify) if workers == 0 else min(workers / classify, 1 / parent)
+        print(f"workers {workers}: {result['rows_per_second']:8.0f} rows/s in {result['elapsed_seconds']:6.1f} s "
+              f"(expected on {max(workers, 1)} cores: {expected:8.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: successive halving vs exhaustive grid search over the same space.
+
+Both searches tune the TF-IDF preprocessor and classifier on a synthetic corpus in
+which each category only shifts the word distribution a little, so the settings
+actually matter. The report gives wall time, best CV F1 and test F1 for each search,
+and the time each took to produce a model at or above --target-f1.
+
+Usage:
+    python benchmarks/bench_hyperparameter_search.py --rows 20000 --target-f1 0.8
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.metrics import f1_score
+from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV, train_test_split
+from sklearn.pipeline import Pipeline
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.components.data_transformation import DataTransformation
+from src.components.model_trainer import DEFAULT_SEARCH_SPACE
+
+CATEGORIES = ['billing', 'technical', 'account', 'feedback']
+
+
+def noisy_tickets(rows, seed=42):
+    """Tweets drawn from a shared vocabulary plus a small category-specific one."""
+    rng = np.random.default_rng(seed)
+    shared = np.array([f"w{i}" for i in range(5000)])
+    specific = np.array([[f"{c}{i}" for i in range(50)] for c in CATEGORIES])
+    labels = rng.integers(0, len(CATEGORIES), size=rows)
+    texts = []
+    for label in labels:
+        n_shared = rng.integers(5, 25)
+        n_specific = rng.binomial(3, 0.4)
+        words = list(shared[np.minimum(rng.zipf(1.3, size=n_shared) - 1, len(shared) - 1)])
+        words += list(specific[label][rng.integers(0, 50, size=n_specific)])
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+    return pd.DataFrame({'text': texts, 'category': np.array(CATEGORIES)[labels]})
+
+
+def run_search(search_cls, X_train, y_train, X_test, y_test, **kwargs):
+    pipeline = Pipeline(steps=[
+        ("preprocessor", DataTransformation().get_data_transformer_object()),
+        ("model", DEFAULT_SEARCH_SPACE[0]["model"][0]),
+    ])
+    search = search_cls(pipeline, DEFAULT_SEARCH_SPACE, scoring="f1_weighted", cv=3, error_score=0.0, **kwargs)
+    start = time.perf_counter()
+    search.fit(X_train, y_train)
+    seconds = time.perf_counter() - start
+    test_f1 = f1_score(y_test, search.best_estimator_.predict(X_test), average='weighted')
+    return seconds, search.best_score_, test_f1, len(search.cv_results_['params'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Synthetic corpus size")
+    parser.add_argument("--target-f1", type=float, default=0.8, help="Test F1 the search has to reach")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel CV fits")
+    args = parser.parse_args()
+
+    df = noisy_tickets(args.rows)
+    X_train, X_test, y_train, y_test = train_test_split(df[['text']], df['category'], test_size=0.2, random_state=42)
+
+    searches = {
+        "successive halving": (HalvingGridSearchCV, {"factor": 3, "random_state": 42}),
+        "exhaustive grid": (GridSearchCV, {}),
+    }
+    for name, (search_cls, kwargs) in searches.items():
+        seconds, cv_f1, test_f1, trials = run_search(
+            search_cls, X_train, y_train, X_test, y_test, n_jobs=args.n_jobs, **kwargs
+        )
+        reached = f"{seconds:8.1f} s" if test_f1 >= args.target_f1 else "  not reached"
+        print(
+            f"{name:19}: {seconds:8.1f} s, {trials:4d} candidate evaluations, best CV F1 {cv_f1:.4f}, "
+            f"test F1 {test_f1:.4f}, time to F1>={args.target_f1}: {reached}"
+        )
+
+
+if __name__ == "__main__":
+    main()
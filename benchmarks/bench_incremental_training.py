@@ -0,0 +1,98 @@
+"""
+Benchmark: peak RSS and time of out-of-core incremental training as the corpus grows.
+
+For each corpus size a synthetic tickets Parquet file is written chunk by chunk and
+IncrementalTrainer trains on it from scratch in its own subprocess, so peak RSS is
+measured independently. Peak RSS should stay flat across sizes. Then 10% more rows
+are appended and the trainer resumes from its checkpoint, which should only train
+on the new rows.
+
+Usage:
+    python benchmarks/bench_incremental_training.py --rows 100000 400000 --classifier sgd
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import argparse
+import subprocess
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_train_memory import synthetic_tickets
+
+CHUNK_ROWS = 50_000
+
+
+def write_corpus(path, rows, seed_offset=0):
+    """Write (or rewrite) a tickets dataset of `rows` rows, one row group per chunk."""
+    with pq.ParquetWriter(path, pa.schema([('text', pa.string()), ('category', pa.string())])) as writer:
+        for chunk, start in enumerate(range(0, rows, CHUNK_ROWS)):
+            df = synthetic_tickets(min(CHUNK_ROWS, rows - start), seed=seed_offset + chunk)
+            writer.write_table(pa.Table.from_pandas(df, preserve_index=False))
+
+
+def run(work_dir, classifier):
+    os.environ.setdefault("MLFLOW_TRACKING_URI", "file:" + os.path.join(work_dir, "mlruns"))
+    from src.components.incremental_trainer import IncrementalTrainer, IncrementalTrainerConfig
+
+    config = IncrementalTrainerConfig(
+        data_path=os.path.join(work_dir, "tickets.parquet"),
+        trained_model_file_path=os.path.join(work_dir, "model.pkl"),
+        preprocessor_file_path=os.path.join(work_dir, "preprocessor.pkl"),
+        checkpoint_dir=os.path.join(work_dir, "checkpoint"),
+        classifier=classifier,
+    )
+    start = time.perf_counter()
+    result = IncrementalTrainer(config).initiate_incremental_training()
+    result["seconds"] = time.perf_counter() - start
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(result))
+
+
+def train_in_subprocess(work_dir, classifier):
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", work_dir, "--classifier", classifier],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(label, result):
+    f1 = result["progressive_f1_score"]
+    print(
+        f"{label:24}: trained {result['rows_trained']:9d} rows in {result['seconds']:7.2f} s, "
+        f"peak RSS {result['peak_rss_mb']:7.1f} MB, progressive F1 {f1 if f1 is None else round(f1, 4)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 400_000], help="Corpus sizes to train on")
+    parser.add_argument("--classifier", choices=["sgd", "nb", "pa"], default="sgd")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run(args.worker, args.classifier)
+        return
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as work_dir:
+            data_path = os.path.join(work_dir, "tickets.parquet")
+            write_corpus(data_path, rows)
+            report(f"{rows} rows, scratch", train_in_subprocess(work_dir, args.classifier))
+
+            # Same rows plus 10% new ones at the end, as a re-ingested export would look.
+            write_corpus(data_path, rows + rows // 10)
+            report(f"{rows} rows, +10% resume", train_in_subprocess(work_dir, args.classifier))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: KeywordLabeler vs the notebook's per-row assign_category.
+
+The tweets in data/twcs/sample.csv are replicated to --rows rows. Both labelers
+must produce identical labels.
+
+Usage:
+    python benchmarks/bench_keyword_labeler.py --rows 1000000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.components.keyword_labeler import DEFAULT_KEYWORDS, KeywordLabeler
+
+
+def assign_category(text):
+    """The original per-row labeler from notebooks/notebook.ipynb."""
+    if not isinstance(text, str):
+        return 'Uncategorized'
+
+    text = text.lower()
+    for category, kws in DEFAULT_KEYWORDS.items():
+        if any(kw in text for kw in kws):
+            return category
+    return 'General Inquiry'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of tweets after replication")
+    args = parser.parse_args()
+
+    sample = pd.read_csv(os.path.join('data', 'twcs', 'sample.csv'))['text']
+    texts = pd.concat([sample] * (args.rows // len(sample) + 1), ignore_index=True).iloc[:args.rows]
+
+    start = time.perf_counter()
+    expected = texts.apply(assign_category)
+    apply_seconds = time.perf_counter() - start
+
+    labeler = KeywordLabeler()
+    start = time.perf_counter()
+    labels = labeler.label(texts)
+    labeler_seconds = time.perf_counter() - start
+
+    assert (labels.to_numpy() == expected.to_numpy()).all(), "KeywordLabeler disagrees with assign_category"
+    print(f"rows            : {len(texts)}")
+    print(f"apply(per row)  : {apply_seconds:7.2f} s")
+    print(f"KeywordLabeler  : {labeler_seconds:7.2f} s")
+    print(f"speedup         : {apply_seconds / labeler_seconds:7.1f}x")
+    print(expected.value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: one structured analyze_ticket call vs the two-call enrichment path.
+
+Both paths run against FakeTicketChatModel, which reports word counts as token
+usage, so the numbers show relative savings rather than real Groq token counts.
+
+Usage:
+    python benchmarks/bench_llm_analysis.py --n 20 --latency 0.1
+"""
+
+import os
+import sys
+import argparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.fake_llm import FakeTicketChatModel
+from src.components.llm_service import LLMService, LLMUsage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=20, help="Number of tickets")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per fake LLM call")
+    args = parser.parse_args()
+
+    texts = pd.read_csv(os.path.join('data', 'twcs', 'sample.csv'))['text'].astype(str).tolist()[:args.n]
+    service = LLMService(model=FakeTicketChatModel(latency=args.latency))
+
+    combined = LLMUsage()
+    separate = LLMUsage()
+    for text in texts:
+        usage = service.analyze_ticket(text)["usage"]
+        combined.add(LLMUsage(usage["calls"], usage["input_tokens"], usage["output_tokens"], usage["latency_seconds"]))
+        service._analyze_separately(text, separate)
+
+    for name, usage in (("two calls", separate), ("analyze_ticket", combined)):
+        print(
+            f"{name:15}: {usage.calls / len(texts):4.1f} calls/ticket, "
+            f"{usage.input_tokens / len(texts):7.1f} input tokens/ticket, "
+            f"{usage.output_tokens / len(texts):6.1f} output tokens/ticket, "
+            f"{usage.latency_seconds / len(texts) * 1000:7.1f} ms/ticket"
+        )
+
+
+if __name__ == "__main__":
+    main()
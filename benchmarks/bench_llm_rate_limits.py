@@ -0,0 +1,106 @@
+"""
+Benchmark: LLM enrichment under provider rate limits.
+
+Starts FakeLLMEndpoint (fake_llm_endpoint.py) with requests/min and tokens/min
+quotas and runs LLMService.aanalyze_ticket over many tickets at a fixed
+concurrency through the real ChatGroq client pointed at it. A share of the
+tickets are exact duplicates submitted at the same time, as happens when a
+complaint is retweeted. Two configurations are compared:
+
+    bare      the previous behaviour: no limiter, no coalescing, only the SDK's
+              own two retries
+    client    LLMClient with token buckets matched to the quotas, jittered
+              backoff and request coalescing (SDK retries off)
+
+Reported: tickets enriched and failed, throughput, 429s answered by the endpoint
+and the client counters.
+
+Usage:
+    python benchmarks/bench_llm_rate_limits.py --tickets 300 --rpm 600 --tpm 60000 --concurrency 32
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_groq import ChatGroq
+
+from benchmarks.fake_llm_endpoint import FakeLLMEndpoint, serve_in_thread
+from src.components.llm_client import LLMClientConfig
+from src.components.llm_service import LLMService
+
+
+def tickets(n, duplicate_share):
+    unique = max(1, round(n * (1 - duplicate_share)))
+    texts = [f"My order {i} arrived damaged and nobody answers my emails" for i in range(unique)]
+    # Duplicates sit right next to their original so both are in flight together.
+    out = []
+    for i, text in enumerate(texts):
+        out.append(text)
+        if len(out) < n and i < n - unique:
+            out.append(text)
+    return out[:n]
+
+
+async def enrich_all(service, texts, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(text):
+        async with semaphore:
+            try:
+                await service.aanalyze_ticket(text)
+                return True
+            except Exception:
+                return False
+
+    return await asyncio.gather(*(one(text) for text in texts))
+
+
+def run(name, args, texts, sdk_retries, client_config):
+    endpoint = FakeLLMEndpoint(args.rpm, args.tpm, window_seconds=args.window, latency=args.latency)
+    server = serve_in_thread(endpoint)
+    model = ChatGroq(api_key="fake", base_url=endpoint.url, model="llama-3.3-70b-versatile",
+                     max_tokens=1000, max_retries=sdk_retries, timeout=10)
+    service = LLMService(model=model, client_config=client_config)
+
+    start = time.perf_counter()
+    ok = asyncio.run(enrich_all(service, texts, args.concurrency))
+    elapsed = time.perf_counter() - start
+    server.should_exit = True
+
+    stats = service.client_stats()
+    print(
+        f"{name:7}: {sum(ok):4d} enriched, {len(ok) - sum(ok):4d} failed in {elapsed:5.1f} s "
+        f"({sum(ok) / elapsed:5.1f} tickets/s); endpoint: {endpoint.accepted} calls, {endpoint.rejected} x 429; "
+        f"client: {stats['retries']} retries, {stats['coalesced']} coalesced, "
+        f"{stats['throttled_seconds']:.1f} s throttled"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=300)
+    parser.add_argument("--duplicates", type=float, default=0.2, help="Share of tickets that are duplicates")
+    parser.add_argument("--concurrency", type=int, default=32, help="Tickets enriched at once")
+    parser.add_argument("--rpm", type=float, default=600, help="Endpoint requests per minute")
+    parser.add_argument("--tpm", type=float, default=60000, help="Endpoint tokens (words) per minute")
+    parser.add_argument("--window", type=float, default=1.0, help="Seconds over which the endpoint enforces quotas")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per endpoint call")
+    args = parser.parse_args()
+
+    # One INFO line per HTTP request would drown the results.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    texts = tickets(args.tickets, args.duplicates)
+    bare = LLMClientConfig(requests_per_minute=None, tokens_per_minute=None, max_retries=0, coalesce=False)
+    limited = LLMClientConfig(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    run("bare", args, texts, 2, bare)
+    run("client", args, texts, 0, limited)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: per-call cost of `logger.info` under concurrent load.
+
+--threads threads each log --records records, sleeping --work-us between calls
+(request threads mostly wait on the model or the LLM, with the GIL released),
+into a log file in a temporary directory. Each call is timed in the
+calling thread. Configurations:
+
+    sync          handlers run in the calling thread (the previous logger.py)
+    async         records go to a bounded queue (block when full), one listener
+                  thread formats and writes them
+    async-drop    the same, dropping records when the queue is full
+    async-json    async with JsonFormatter
+
+Reported per configuration: p50/p99/max call latency, total wall time, time to
+drain the queue at the end, records written and dropped.
+
+Usage:
+    python benchmarks/bench_logging.py --threads 16 --records 1000 --work-us 1000
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logger import logger, configure_logging, shutdown_logging, logging_stats, LoggingConfig
+
+CONFIGURATIONS = {
+    "sync": dict(mode="sync"),
+    "async": dict(mode="async", queue_policy="block"),
+    "async-drop": dict(mode="async", queue_policy="drop"),
+    "async-json": dict(mode="async", queue_policy="block", json=True),
+}
+
+
+def worker(records, work_seconds, latencies, barrier):
+    barrier.wait()
+    for i in range(records):
+        start = time.perf_counter()
+        logger.info(f"prediction pipeline completed successfully (llm tier) in {i * 0.01:.1f} ms")
+        latencies[i] = time.perf_counter() - start
+        time.sleep(work_seconds)
+
+
+def run(name, args, work_dir):
+    log_file = os.path.join(work_dir, f"{name}.log")
+    configure_logging(LoggingConfig(file_path=log_file, console=False, queue_size=args.queue_size,
+                                    **CONFIGURATIONS[name]), force=True)
+    latencies = [np.zeros(args.records) for _ in range(args.threads)]
+    barrier = threading.Barrier(args.threads + 1)
+    threads = [
+        threading.Thread(target=worker, args=(args.records, args.work_us / 1e6, latencies[t], barrier))
+        for t in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    dropped = logging_stats()["dropped"]
+    shutdown_logging()  # Drains the queue
+    drained = time.perf_counter() - start - elapsed
+
+    with open(log_file) as file_obj:
+        written = sum(1 for _ in file_obj)
+    calls_us = np.concatenate(latencies) * 1e6
+    print(
+        f"{name:10}: p50 {np.percentile(calls_us, 50):7.1f} us, p99 {np.percentile(calls_us, 99):8.1f} us, "
+        f"max {calls_us.max():9.1f} us per call; {elapsed:6.2f} s wall + {drained:5.2f} s drain; "
+        f"{written} lines written, {dropped} dropped"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--records", type=int, default=5000, help="Records logged per thread")
+    parser.add_argument("--work-us", type=float, default=1000.0, help="Microseconds slept between calls")
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--only", choices=list(CONFIGURATIONS), help="Run one configuration")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    for name in [args.only] if args.only else CONFIGURATIONS:
+        run(name, args, work_dir)
+
+
+if __name__ == "__main__":
+    main()
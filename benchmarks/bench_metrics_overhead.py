@@ -0,0 +1,136 @@
+"""
+Benchmark: cost of the latency metrics and the sampling profiler.
+
+A TF-IDF + LogisticRegression model is trained on the noisy synthetic corpus in a
+temporary saved_models/ (see bench_triage.py). Then:
+
+    timer        ns per `metrics.timer` block and per `metrics.inc`, enabled and
+                 disabled
+    pipeline     single-ticket classify-only `predict_batch` latency with the
+                 metrics registry enabled and disabled (rounds interleaved so
+                 both see the same machine state)
+    breakdown    per-stage p50/p95/p99 recorded while enriching tickets through
+                 FakeTicketChatModel in "combined" mode, and the size of the
+                 Prometheus export
+    profiler     the same classify loop under SamplingProfiler: slowdown, samples
+                 taken and the hottest frames
+
+Usage:
+    python benchmarks/bench_metrics_overhead.py --tickets 2000 --rounds 5
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_hyperparameter_search import noisy_tickets
+from benchmarks.bench_triage import build
+from benchmarks.fake_llm import FakeTicketChatModel
+
+
+def ns_per_call(fn, n):
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter_ns() - start) / n
+
+
+def bench_timer(metrics, n):
+    def timed():
+        with metrics.timer("bench_seconds", stage="x"):
+            pass
+
+    def counted():
+        metrics.inc("bench_total", stage="x")
+
+    rows = []
+    for enabled in (True, False):
+        metrics.enabled = enabled
+        rows.append((enabled, ns_per_call(timed, n), ns_per_call(counted, n)))
+    metrics.enabled = True
+    for enabled, timer_ns, inc_ns in rows:
+        print(f"timer     : metrics {'on ' if enabled else 'off'} {timer_ns:7.0f} ns per timer, {inc_ns:7.0f} ns per inc")
+
+
+def classify_loop(pipeline, texts):
+    latencies = np.empty(len(texts))
+    for i, text in enumerate(texts):
+        start = time.perf_counter()
+        pipeline.predict_batch([text])
+        latencies[i] = time.perf_counter() - start
+    return latencies * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--train-rows", type=int, default=20000)
+    parser.add_argument("--tickets", type=int, default=2000, help="Tickets classified per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--enrich-tickets", type=int, default=200, help="Tickets enriched for the stage breakdown")
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds per fake LLM call")
+    parser.add_argument("--interval", type=float, default=0.005, help="Profiler sampling interval in seconds")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    build(work_dir, args.train_rows)
+    os.chdir(work_dir)
+
+    from metrics import metrics, SamplingProfiler
+    from src.components.llm_service import LLMService
+    from src.pipelines.prediction_pipeline import PredictionPipeline
+
+    bench_timer(metrics, 200_000)
+
+    texts = noisy_tickets(args.tickets, seed=2)['text'].tolist()
+    pipeline = PredictionPipeline()
+    pipeline.predict_batch(texts[:10])
+    medians = {True: [], False: []}
+    for _ in range(args.rounds):
+        for enabled in (True, False):
+            metrics.enabled = enabled
+            medians[enabled].append(np.median(classify_loop(pipeline, texts)))
+    metrics.enabled = True
+    on, off = np.median(medians[True]), np.median(medians[False])
+    print(f"pipeline  : metrics off {off:7.1f} us, on {on:7.1f} us per ticket (median of {args.rounds} rounds), "
+          f"overhead {on - off:+.1f} us ({(on - off) / off:+.2%})")
+
+    metrics.reset()
+    service = LLMService(model=FakeTicketChatModel(latency=args.latency))
+    enriching = PredictionPipeline(llm_service=service, llm_mode="combined")
+    for text in texts[:args.enrich_tickets]:
+        enriching.predict(text)
+    snapshot = metrics.snapshot()
+    for name, summary in snapshot["histograms"].items():
+        print(f"breakdown : {name:45} n={summary['count']:5d} p50 {summary['p50'] * 1e3:7.3f} ms "
+              f"p95 {summary['p95'] * 1e3:7.3f} ms p99 {summary['p99'] * 1e3:7.3f} ms")
+    for name, value in snapshot["counters"].items():
+        print(f"breakdown : {name:45} {value:g}")
+    exported = metrics.render_prometheus()
+    print(f"breakdown : Prometheus export {len(exported.splitlines())} lines, {len(exported)} bytes")
+
+    base = np.median(classify_loop(pipeline, texts))
+    profile_path = os.path.join(work_dir, "profile.folded")
+    with SamplingProfiler(profile_path, interval=args.interval) as profiler:
+        profiled = np.median(classify_loop(pipeline, texts))
+    # Idle pool threads are sampled too; the hottest frames are read from the main thread's stacks.
+    frames = Counter()
+    for stack, count in profiler.samples.items():
+        if stack.startswith("<module>"):
+            frames[stack.rsplit(";", 1)[-1]] += count
+    total = sum(profiler.samples.values())
+    main_total = sum(frames.values())
+    print(f"profiler  : {base:7.1f} us -> {profiled:7.1f} us per ticket ({(profiled - base) / base:+.2%}), "
+          f"{total} samples, {len(profiler.samples)} distinct stacks in {profile_path}")
+    for frame, count in frames.most_common(5):
+        print(f"profiler  :   {count / main_total:6.1%} {frame}")
+
+
+if __name__ == "__main__":
+    main()
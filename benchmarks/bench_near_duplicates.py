@@ -0,0 +1,131 @@
+"""
+Benchmark: MinHash/LSH near-duplicate removal before training.
+
+Inbound tickets come from the synthetic corpus (corpus.py), labeled with
+KeywordLabeler as in ingestion. --duplicates of the final rows are then made
+copies of earlier tickets with the variations TWCS is full of: another
+@mention, "RT @user:" in front, a link, an emoji or "!!" at the end, one word
+dropped. Reported:
+
+- detection speed, and how well clusters match the injected copies (share of
+  copies put in their original's cluster; originals wrongly merged together)
+- training rows, time (split + detection + TF-IDF, then the fit of each
+  ModelTrainer candidate)
+  and weighted F1 with and without dropping near-duplicates from the training
+  split; the test split is the same in both runs.
+
+Usage:
+    python benchmarks/bench_near_duplicates.py --rows 100000 --duplicates 0.3 --threshold 0.8 --models lr rf
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.corpus import CorpusGenerator
+from src.components.keyword_labeler import KeywordLabeler
+from src.components.near_duplicates import NearDuplicateDetector, NearDuplicateConfig
+
+
+def tickets_with_copies(rows, duplicate_rate, seed=0):
+    """Labeled tickets and, per row, the row it is a copy of (itself for originals)."""
+    generator = CorpusGenerator(seed=seed)
+    texts = []
+    while len(texts) < rows:
+        chunk = generator.chunk(rows)
+        texts += chunk.loc[chunk["inbound"], "text"].tolist()
+    texts = texts[:rows]
+
+    rng = np.random.default_rng(seed)
+    n_originals = int(rows * (1 - duplicate_rate))
+    source = np.arange(rows)
+    source[n_originals:] = rng.integers(0, n_originals, size=rows - n_originals)
+    for i in range(n_originals, rows):
+        words = texts[source[i]].split()
+        variant = i % 5
+        if variant == 0:
+            words[0] = f"@user{rng.integers(10**6)}"
+        elif variant == 1:
+            words = ["RT", f"@user{rng.integers(10**6)}:"] + words
+        elif variant == 2:
+            words.append(f"https://t.co/{rng.integers(10**10):010d}")
+        elif variant == 3:
+            words.append("!!" if i % 2 else "😡")
+        elif len(words) > 8:
+            del words[rng.integers(1, len(words))]
+        texts[i] = " ".join(words)
+    df = pd.DataFrame({"text": texts})
+    df["category"] = KeywordLabeler().label(df["text"]).to_numpy()
+    return df, source
+
+
+CANDIDATES = {
+    "lr": "Logistic Regression",
+    "rf": "Random Forest",
+}
+
+
+def train(df, detector, model_keys):
+    """Training rows, then (name, seconds, F1) for the transformation and each model."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from src.components.data_transformation import DataTransformation
+    from src.components.model_trainer import ModelTrainer, ModelTrainerConfig
+
+    # The candidates of ModelTrainer.initiate_model_training.
+    models = {
+        "Logistic Regression": LogisticRegression(multi_class='ovr', solver='liblinear'),
+        "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42),
+    }
+    models = {CANDIDATES[key]: models[CANDIDATES[key]] for key in model_keys}
+
+    start = time.perf_counter()
+    X_train, y_train, X_test, y_test, _ = DataTransformation(near_duplicates=detector).initiate_data_transformation(
+        df, "category"
+    )
+    stages = [("transformation", time.perf_counter() - start, None)]
+    report = ModelTrainer(ModelTrainerConfig(n_jobs=1)).evaluate_models(X_train, y_train, X_test, y_test, models)
+    stages += [(name, entry["fit_seconds"], entry["f1_score"]) for name, entry in report.items()]
+    return X_train.shape[0], stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--duplicates", type=float, default=0.3, help="Share of rows that are copies")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--num-perm", type=int, default=128)
+    parser.add_argument("--models", nargs="+", choices=list(CANDIDATES), default=["lr", "rf"])
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())  # DataTransformation saves saved_models/preprocessor.pkl
+    df, source = tickets_with_copies(args.rows, args.duplicates)
+    detector = NearDuplicateDetector(NearDuplicateConfig(threshold=args.threshold, num_perm=args.num_perm))
+
+    start = time.perf_counter()
+    cluster_ids = detector.cluster_ids(df["text"])
+    seconds = time.perf_counter() - start
+    copies = source != np.arange(args.rows)
+    found = (cluster_ids[copies] == cluster_ids[source[copies]]).mean()
+    originals = ~copies
+    merged = (cluster_ids[originals] != np.arange(args.rows)[originals]).sum()
+    print(f"detection: {args.rows / seconds:.0f} tickets/s ({seconds:.1f} s, {detector.bands} bands of "
+          f"{detector.rows}); {found:.1%} of copies found, {merged} originals merged into another cluster")
+
+    for label, run_detector in (("all tickets", None), ("near-duplicates dropped", detector)):
+        rows, stages = train(df, run_detector, args.models)
+        total = sum(seconds for _, seconds, _ in stages)
+        details = ", ".join(f"{name} {seconds:.1f} s" + (f" (F1 {f1:.4f})" if f1 is not None else "")
+                            for name, seconds, f1 in stages)
+        print(f"{label:24}: {rows:7d} training rows, {total:6.1f} s: {details}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Load test: latency and throughput of the inference server at several concurrency levels.
+
+By default a server is started in a subprocess (`run.py --serve`) from a temporary
+directory holding a freshly trained model, so the numbers don't depend on
+whatever is in saved_models/. Pass --url to load an already running server instead.
+For each concurrency level, that many clients send POST /predict back to back;
+the report gives throughput, p50/p99 latency and the server's mean micro-batch size.
+
+Usage:
+    python benchmarks/bench_server_load.py --concurrency 1 8 32 128 --requests 2000
+    python benchmarks/bench_server_load.py --url http://127.0.0.1:8000 --enrich
+"""
+
+import os
+import sys
+import time
+import json
+import socket
+import asyncio
+import tempfile
+import argparse
+import subprocess
+import urllib.request
+from urllib.error import URLError
+from urllib.parse import urlsplit
+
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.bench_cli_startup import build
+from benchmarks.bench_train_memory import synthetic_tickets
+
+
+class Connection:
+    """
+    Minimal keep-alive HTTP/1.1 client on asyncio streams.
+
+    Much lighter than a full client library, so on a small machine the load
+    generator doesn't starve the server it is measuring of CPU.
+    """
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def run_level(url, texts, concurrency, enrich):
+    parsed = urlsplit(url)
+    latencies, errors = [], 0
+    cursor = iter(range(len(texts)))
+    connections = [Connection(parsed.hostname, parsed.port) for _ in range(concurrency)]
+    _, before = await connections[0].request("GET", "/stats")
+
+    async def client_loop(connection):
+        nonlocal errors
+        for i in cursor:
+            start = time.perf_counter()
+            status, _ = await connection.request("POST", "/predict", {"text": texts[i], "enrich": enrich})
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(connection) for connection in connections))
+    elapsed = time.perf_counter() - start
+    _, after = await connections[0].request("GET", "/stats")
+    for connection in connections:
+        connection.close()
+
+    batches = after["batching"]["batches"] - before["batching"]["batches"]
+    items = after["batching"]["items"] - before["batching"]["items"]
+    latencies_ms = np.array(latencies) * 1000
+    print(
+        f"concurrency {concurrency:4d}: {len(texts) / elapsed:8.1f} req/s, p50 {np.percentile(latencies_ms, 50):7.1f} ms, "
+        f"p99 {np.percentile(latencies_ms, 99):7.1f} ms, mean batch {items / batches if batches else 0:5.1f}, "
+        f"errors {errors}"
+    )
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url, process, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            with urllib.request.urlopen(url + "/readyz") as response:
+                if response.status == 200:
+                    return
+        except (URLError, ConnectionError):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Load an already running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per concurrency level")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--enrich", action="store_true", help="Ask for LLM enrichment too (calls the real LLM)")
+    args = parser.parse_args()
+
+    texts = synthetic_tickets(args.requests, seed=7)['text'].tolist()
+    if args.url:
+        for concurrency in args.concurrency:
+            asyncio.run(run_level(args.url, texts, concurrency, args.enrich))
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        build(work_dir)
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(REPO_ROOT, "run.py"), "--serve", "--port", str(port),
+             "--max-batch-size", str(args.max_batch_size), "--max-wait-ms", str(args.max_wait_ms)],
+            cwd=work_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready(url, server)
+            for concurrency in args.concurrency:
+                asyncio.run(run_level(url, texts, concurrency, args.enrich))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark: conversation-thread index vs per-row Python dicts.
+
+Writes a synthetic TWCS CSV (threads alternating customer and brand tweets, with
+interleaved ids like the real export) and, each in its own process so peak RSS
+is comparable:
+
+    index   ThreadIndex.from_csv: flat NumPy arrays, pointer jumping, CSR threads
+    dicts   the obvious alternative: {tweet_id: parent}, {tweet_id: [children]}
+            and {tweet_id: text} dicts, walking up to the root and back down
+
+Reported: build time, peak RSS, conversation assembly time per lookup, and how
+many LLM enrichment calls a per-tweet vs a per-conversation pipeline would make.
+
+Usage:
+    python benchmarks/bench_thread_index.py --rows 2000000 --lookups 10000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+BASE_TIME = pd.Timestamp("2017-10-01", tz="UTC")
+
+
+def write_twcs(path, rows, seed=0, chunk=500_000):
+    """Synthetic TWCS CSV with `rows` tweets; returns the number of threads."""
+    rng = np.random.default_rng(seed)
+    sizes = []
+    while sum(sizes) < rows:
+        sizes.extend(rng.geometric(0.3, size=100_000).tolist())
+    sizes = np.array(sizes)
+    sizes = sizes[np.cumsum(sizes) <= rows]
+    sizes = np.append(sizes, rows - sizes.sum()) if sizes.sum() < rows else sizes
+    thread = np.repeat(np.arange(len(sizes)), sizes)
+    step = np.arange(rows) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    ids = rng.permutation(rows).astype(np.int64) + 1
+    parents = np.where(step > 0, np.roll(ids, 1), -1)
+    seconds = thread * 7 + step * 300
+    created = (BASE_TIME + pd.to_timedelta(seconds, unit="s")).strftime("%a %b %d %H:%M:%S +0000 %Y")
+
+    header = True
+    for start in range(0, rows, chunk):
+        part = slice(start, start + chunk)
+        inbound = step[part] % 2 == 0
+        reply_to = pd.array(parents[part], dtype="Int64")
+        reply_to[parents[part] < 0] = pd.NA
+        pd.DataFrame({
+            "tweet_id": ids[part],
+            "author_id": np.where(inbound, "customer", "BrandSupport"),
+            "inbound": inbound,
+            "created_at": created[part],
+            "text": [f"tweet {i} about order {t}" for i, t in zip(ids[part], thread[part])],
+            "response_tweet_id": "",
+            "in_response_to_tweet_id": reply_to,
+        }).to_csv(path, mode="w" if header else "a", header=header, index=False)
+        header = False
+    return len(sizes)
+
+
+def run_index(path, queries):
+    from src.components.thread_index import ThreadIndex
+
+    start = time.perf_counter()
+    index = ThreadIndex.from_csv(path)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for tweet_id in queries:
+        index.conversation_text(int(tweet_id), inbound_only=False)
+    lookup = (time.perf_counter() - start) / len(queries)
+    conversations = sum(1 for _ in index.iter_conversations())
+    return {"build": build, "lookup": lookup, "conversations": conversations,
+            "inbound": int(index.inbound.sum()), "index_mb": index.nbytes() / 2 ** 20}
+
+
+def run_dicts(path, queries):
+    start = time.perf_counter()
+    parent, children, texts, created = {}, defaultdict(list), {}, {}
+    columns = ["tweet_id", "in_response_to_tweet_id", "created_at", "text"]
+    for chunk in pd.read_csv(path, usecols=columns, dtype={"in_response_to_tweet_id": "Int64"}, chunksize=500_000):
+        stamps = pd.to_datetime(chunk["created_at"], format="%a %b %d %H:%M:%S %z %Y").astype(np.int64)
+        for tweet_id, reply_to, stamp, text in zip(chunk["tweet_id"], chunk["in_response_to_tweet_id"], stamps,
+                                                   chunk["text"]):
+            texts[tweet_id] = text
+            created[tweet_id] = stamp
+            if reply_to is not pd.NA:
+                parent[tweet_id] = reply_to
+                children[reply_to].append(tweet_id)
+    build = time.perf_counter() - start
+
+    def conversation(tweet_id):
+        root = tweet_id
+        while root in parent and parent[root] in texts:
+            root = parent[root]
+        stack, seen = [root], []
+        while stack:
+            node = stack.pop()
+            seen.append(node)
+            stack.extend(children.get(node, ()))
+        return "\n".join(texts[node] for node in sorted(seen, key=created.__getitem__))
+
+    start = time.perf_counter()
+    for tweet_id in queries:
+        conversation(int(tweet_id))
+    lookup = (time.perf_counter() - start) / len(queries)
+    return {"build": build, "lookup": lookup}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        method, path = args.child
+        queries = np.random.default_rng(1).integers(1, args.rows + 1, size=args.lookups)
+        result = (run_index if method == "index" else run_dicts)(path, queries)
+        result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(json.dumps(result))
+        return
+
+    path = os.path.join(tempfile.mkdtemp(), "twcs.csv")
+    start = time.perf_counter()
+    threads = write_twcs(path, args.rows)
+    print(f"wrote {args.rows} tweets in {threads} threads ({time.perf_counter() - start:.1f} s)")
+
+    results = {}
+    for method in ("index", "dicts"):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--rows", str(args.rows), "--lookups", str(args.lookups),
+             "--child", method, path],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results[method] = json.loads(output.strip().splitlines()[-1])
+        result = results[method]
+        print(f"{method:5}: build {result['build']:6.1f} s, peak RSS {result['peak_rss_mb']:7.0f} MB, "
+              f"conversation lookup {result['lookup'] * 1e6:7.1f} us")
+
+    index = results["index"]
+    print(f"index arrays + texts: {index['index_mb']:.0f} MB")
+    print(f"LLM calls: {index['inbound']} per customer tweet vs {index['conversations']} per conversation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: TF-IDF features from the token store vs TfidfVectorizer on the text.
+
+A --rows synthetic TWCS corpus (corpus.py) is ingested into a processed Parquet
+dataset and tokenized once into a TokenStore (timed, with its size on disk).
+Then, for each vectorizer setting, the train/test TF-IDF matrices of
+DataTransformation's split are built both ways, as every retrain or
+experiment does: from the text alone, and with the terms selected from the
+store and counted from its token ids. The matrices and the vocabulary must
+be identical.
+
+Finally DataTransformation.initiate_data_transformation is timed end to end
+with and without the store, and the preprocessor fitted from the store is
+checked to transform the test text into the same matrix.
+
+Usage:
+    python benchmarks/bench_token_store.py --rows 500000
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.corpus import write_corpus
+from src.components.data_ingestion import DataIngestion, DataIngestionConfig
+from src.components.data_transformation import DataTransformation
+from src.components.token_store import TokenStore, TokenStoreConfig
+
+SETTINGS = [
+    dict(stop_words="english", max_features=5000),
+    dict(stop_words="english", max_features=20000),
+    dict(stop_words="english", max_features=None),
+    dict(stop_words="english", max_features=20000, ngram_range=(1, 2)),
+    dict(stop_words="english", max_features=None, ngram_range=(1, 2), sublinear_tf=True),
+]
+
+
+def same_matrix(a, b) -> bool:
+    return a.shape == b.shape and abs(a - b).max() < 1e-12 if a.nnz or b.nnz else a.shape == b.shape
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000, help="Tweets in the corpus (about half are inbound)")
+    args = parser.parse_args()
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    work_dir = tempfile.mkdtemp()
+    os.chdir(work_dir)  # DataTransformation saves saved_models/preprocessor.pkl
+    raw_path = write_corpus(os.path.join(work_dir, "twcs.csv"), args.rows)
+    data_path = DataIngestion(DataIngestionConfig(
+        raw_data_path=raw_path, processed_data_path=os.path.join(work_dir, "processed_tickets.parquet")
+    )).initiate_data_ingestion()
+    df = pd.read_parquet(data_path, columns=["text", "category"])
+
+    config = TokenStoreConfig(store_dir=os.path.join(work_dir, "token_store"))
+    start = time.perf_counter()
+    store = TokenStore(config).sync(data_path)
+    build_seconds = time.perf_counter() - start
+    size = sum(os.path.getsize(os.path.join(config.store_dir, name)) for name in os.listdir(config.store_dir))
+    start = time.perf_counter()
+    store = TokenStore(config)
+    open_seconds = time.perf_counter() - start
+    print(f"{len(df)} tickets, {store.manifest['tokens']} tokens, {store.manifest['vocabulary_size']} distinct; "
+          f"store built once in {build_seconds:.1f} s, {size / 2**20:.0f} MiB, opened in {open_seconds * 1e3:.0f} ms")
+
+    X_train, X_test, _, _ = DataTransformation().split_data(df, "category")
+    for settings in SETTINGS:
+        vectorizer = TfidfVectorizer(**settings)
+        start = time.perf_counter()
+        expected_train = vectorizer.fit_transform(X_train["text"])
+        expected_test = vectorizer.transform(X_test["text"])
+        text_seconds = time.perf_counter() - start
+
+        preprocessor = DataTransformation().get_data_transformer_object()
+        preprocessor.transformers[0][1].named_steps["tfidf"].set_params(**settings)
+        start = time.perf_counter()
+        train, test = DataTransformation(token_store=store).transform_from_token_store(preprocessor, X_train, X_test)
+        store_seconds = time.perf_counter() - start
+
+        fitted = preprocessor.named_transformers_["text_processing"].named_steps["tfidf"]
+        identical = (same_matrix(train, expected_train) and same_matrix(test, expected_test)
+                     and fitted.vocabulary_ == vectorizer.vocabulary_)
+        if not identical:
+            raise SystemExit(f"Features from the store differ from TfidfVectorizer with {settings}")
+        print(f"{str(settings):85}: text {text_seconds:6.2f} s, store {store_seconds:6.2f} s "
+              f"({text_seconds / store_seconds:4.1f}x), {train.shape[1]} features")
+
+    for label, token_store in (("text", None), ("token store", store)):
+        start = time.perf_counter()
+        _, _, X_test_processed, _, preprocessor_path = DataTransformation(
+            token_store=token_store
+        ).initiate_data_transformation(df, "category")
+        seconds = time.perf_counter() - start
+        print(f"initiate_data_transformation from {label}: {seconds:.2f} s")
+    from utils import load_object
+    reloaded = load_object(preprocessor_path).transform(X_test).tocsr()
+    if not same_matrix(reloaded, X_test_processed):
+        raise SystemExit("The saved preprocessor does not reproduce the store's test matrix")
+    print("saved preprocessor reproduces the store's test matrix")
+
+
+if __name__ == "__main__":
+    main()
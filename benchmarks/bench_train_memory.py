@@ -0,0 +1,83 @@
+"""
+Benchmark: peak RSS of the training path with dense vs sparse features.
+
+"dense" reproduces the old flow: TF-IDF output densified with toarray(), stacked
+with the string labels into one object array, then sliced apart again for the
+model. "sparse" passes the CSR matrix and label vector straight through. Each
+mode runs in its own subprocess so peak RSS is measured independently.
+
+Usage:
+    python benchmarks/bench_train_memory.py --rows 50000
+"""
+
+import os
+import sys
+import time
+import resource
+import tempfile
+import argparse
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+CATEGORIES = ['billing', 'technical', 'account', 'feedback']
+
+
+def synthetic_tickets(rows, seed=42):
+    """Random tweets over a Zipf-distributed vocabulary, with a category-specific word mixed in."""
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(20000)])
+    lengths = rng.integers(5, 30, size=rows)
+    words = vocab[np.minimum(rng.zipf(1.2, size=lengths.sum()) - 1, len(vocab) - 1)]
+    labels = rng.integers(0, len(CATEGORIES), size=rows)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    texts = [
+        " ".join(words[offsets[i]:offsets[i + 1]]) + f" {CATEGORIES[labels[i]]}"
+        for i in range(rows)
+    ]
+    return pd.DataFrame({'text': texts, 'category': np.array(CATEGORIES)[labels]})
+
+
+def run(mode, rows):
+    from sklearn.linear_model import LogisticRegression
+    from src.components.data_transformation import DataTransformation
+    from src.components.model_trainer import ModelTrainer
+
+    df = synthetic_tickets(rows)
+    start = time.perf_counter()
+    data_transformation = DataTransformation()
+    # Don't overwrite the real preprocessor in saved_models/.
+    data_transformation.preprocessor_obj_file_path = os.path.join(tempfile.mkdtemp(), 'preprocessor.pkl')
+    X_train, y_train, X_test, y_test, _ = data_transformation.initiate_data_transformation(df, 'category')
+
+    if mode == "dense":
+        train_arr = np.hstack([X_train.toarray(), y_train.reshape(-1, 1)])
+        test_arr = np.hstack([X_test.toarray(), y_test.reshape(-1, 1)])
+        X_train, y_train = train_arr[:, :-1], train_arr[:, -1]
+        X_test, y_test = test_arr[:, :-1], test_arr[:, -1]
+
+    models = {"Logistic Regression": LogisticRegression(multi_class='ovr', solver='liblinear')}
+    report = ModelTrainer().evaluate_models(X_train, y_train, X_test, y_test, models)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:6}: peak RSS {peak_mb:9.1f} MB, {elapsed:7.2f} s, report={report}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="Synthetic corpus size")
+    parser.add_argument("--mode", choices=["dense", "sparse"], help="Run a single mode in this process")
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode, args.rows)
+        return
+    for mode in ("dense", "sparse"):
+        subprocess.run([sys.executable, __file__, "--rows", str(args.rows), "--mode", mode], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: LLM spend, latency and categorization quality with and without triage.
+
+A TF-IDF + LogisticRegression model is trained on a noisy synthetic corpus (see
+bench_hyperparameter_search.py) in a temporary saved_models/. A TriagePolicy is
+calibrated on a validation split against --llm-budget and --min-local-accuracy.
+Then the same test tickets, about 10% of them made urgent, go through
+PredictionPipeline.predict in "combined" mode with every ticket sent to the LLM,
+and again with the policy. The LLM is FakeTicketChatModel with a fixed
+per-call latency, so token counts are word counts.
+
+Usage:
+    python benchmarks/bench_triage.py --tickets 400 --latency 0.05 --llm-budget 0.3
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.fake_llm import FakeTicketChatModel
+from benchmarks.bench_hyperparameter_search import noisy_tickets
+
+URGENT_SUFFIXES = [" this is urgent!!", " my card was stolen", " I want to cancel NOW", " still waiting again"]
+
+
+def build(work_dir, rows):
+    from sklearn.linear_model import LogisticRegression
+    from src.components.data_transformation import DataTransformation
+    from src.components.linear_artifact import export_linear_artifact
+    from utils import save_object
+
+    df = noisy_tickets(rows)
+    preprocessor = DataTransformation().get_data_transformer_object()
+    model = LogisticRegression(multi_class='ovr', solver='liblinear')
+    model.fit(preprocessor.fit_transform(df[['text']]), df['category'])
+    saved = os.path.join(work_dir, "saved_models")
+    save_object(os.path.join(saved, "preprocessor.pkl"), preprocessor)
+    save_object(os.path.join(saved, "model.pkl"), model)
+    export_linear_artifact(preprocessor, model, os.path.join(saved, "linear_model"),
+                           model_path=os.path.join(saved, "model.pkl"))
+
+
+def with_urgent(df, seed):
+    rng = np.random.default_rng(seed)
+    texts = df['text'].tolist()
+    for i in np.flatnonzero(rng.uniform(size=len(texts)) < 0.1):
+        texts[i] += URGENT_SUFFIXES[i % len(URGENT_SUFFIXES)]
+    return texts, df['category'].to_numpy()
+
+
+def run(texts, labels, latency, policy):
+    from src.components.llm_service import LLMService
+    from src.pipelines.prediction_pipeline import PredictionPipeline
+
+    service = LLMService(model=FakeTicketChatModel(latency=latency))
+    pipeline = PredictionPipeline(llm_service=service, llm_mode="combined", triage_policy=policy)
+    latencies, results = [], []
+    for text in texts:
+        start = time.perf_counter()
+        results.append(pipeline.predict(text))
+        latencies.append(time.perf_counter() - start)
+
+    latencies_ms = np.array(latencies) * 1000
+    tiers = np.array([result["tier"] for result in results])
+    correct = np.array([result["category"] for result in results]) == labels
+    local = tiers == "local"
+    return {
+        "llm_calls": service.usage.calls,
+        "tokens": service.usage.input_tokens + service.usage.output_tokens,
+        "p50_ms": np.percentile(latencies_ms, 50),
+        "p99_ms": np.percentile(latencies_ms, 99),
+        "llm_share": 1 - local.mean(),
+        "accuracy": correct.mean(),
+        "local_accuracy": correct[local].mean() if local.any() else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--train-rows", type=int, default=20000)
+    parser.add_argument("--tickets", type=int, default=400, help="Test tickets run through the pipeline")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--llm-budget", type=float, default=0.3, help="Max share of tickets sent to the LLM")
+    parser.add_argument("--min-local-accuracy", type=float, default=0.95)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    build(work_dir, args.train_rows)
+    os.chdir(work_dir)
+
+    from src.components.triage_policy import TriagePolicy
+    from src.pipelines.prediction_pipeline import PredictionPipeline
+
+    validation_texts, validation_labels = with_urgent(noisy_tickets(3000, seed=1), seed=1)
+    results = PredictionPipeline().predict_batch(validation_texts)
+    policy, report = TriagePolicy.calibrate(
+        [result["confidence"] for result in results],
+        TriagePolicy().urgency_scores(validation_texts),
+        [result["category"] == label for result, label in zip(results, validation_labels)],
+        max_llm_fraction=args.llm_budget, min_local_accuracy=args.min_local_accuracy,
+    )
+    print(
+        f"calibrated: confidence >= {report['confidence_threshold']:.3f}, validation LLM share "
+        f"{report['llm_fraction']:.1%}, local accuracy {report['local_accuracy']:.3f} "
+        f"(meets accuracy: {report['meets_accuracy']}, meets budget: {report['meets_budget']})"
+    )
+
+    texts, labels = with_urgent(noisy_tickets(args.tickets, seed=2), seed=2)
+    for name, triage_policy in (("all tickets to LLM", None), ("triage", policy)):
+        stats = run(texts, labels, args.latency, triage_policy)
+        print(
+            f"{name:18}: {stats['llm_calls']:4d} LLM calls, {stats['tokens']:7d} tokens, "
+            f"p50 {stats['p50_ms']:6.1f} ms, p99 {stats['p99_ms']:6.1f} ms, LLM share {stats['llm_share']:.1%}, "
+            f"category accuracy {stats['accuracy']:.3f} (local tier {stats['local_accuracy']:.3f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
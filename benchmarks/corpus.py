@@ -0,0 +1,204 @@
+"""
+Synthetic TWCS-shaped corpus generator.
+
+Writes a CSV with the columns of the Kaggle "Customer Support on Twitter" export
+(tweet_id, author_id, inbound, created_at, text, response_tweet_id,
+in_response_to_tweet_id) at any scale, in chunks so 10M rows need no more memory
+than 10k:
+
+- Conversations are reply chains of geometric length (mean about 3 tweets) that
+  alternate customer and brand tweets, linked both ways by tweet id.
+- Customer tweets open with @Brand, brand replies with @customer and a signature.
+- Tweet lengths are log-normal (median about 14 words, capped at 280 characters).
+- Words follow a Zipf distribution over a vocabulary of common support words and
+  pseudo-words; most conversations are about one topic whose words (the
+  KeywordLabeler keywords among them) recur in the customer's tweets.
+
+Usage:
+    python benchmarks/corpus.py --rows 1000000 --output data/twcs/synthetic.csv
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.components.keyword_labeler import DEFAULT_KEYWORDS
+
+TWCS_COLUMNS = ["tweet_id", "author_id", "inbound", "created_at", "text", "response_tweet_id",
+                "in_response_to_tweet_id"]
+BRANDS = ["AppleSupport", "AmazonHelp", "Uber_Support", "SpotifyCares", "comcastcares", "TMobileHelp",
+          "British_Airways", "SouthwestAir", "VirginTrains", "ChaseSupport", "XboxSupport", "sprintcare"]
+COMMON_WORDS = (
+    "i my the to and a is it you for of in this on me have not with but can that be what please your "
+    "just get do are was why now still no again been so at an they or from when how all im any will "
+    "phone app account service time day days back thanks hi hey guys customer update fix working wifi "
+    "internet card email number new since week today trying tried said told wait waiting hours call "
+    "called store flight train package received team problem"
+).split()
+# Keywords (matched as substrings) that the common words and pseudo-words must not contain,
+# so that a ticket's category comes from its topic.
+KEYWORDS = [keyword for keywords in DEFAULT_KEYWORDS.values() for keyword in keywords]
+BRAND_PHRASES = [
+    "Sorry to hear that.", "We'd like to help.", "Please DM us your account details.",
+    "Thanks for reaching out.", "Can you tell us more about what happened?",
+    "We're looking into this for you.", "Have you tried restarting the app?",
+]
+EMOJI = ["😡", "🙄", "😤", "🙏", "😭", "👍", "❤️"]
+BASE_TIME = pd.Timestamp("2017-10-01", tz="UTC")
+
+
+def build_vocabulary(size: int, seed: int = 0) -> np.ndarray:
+    """Common words first (the Zipf head), then pronounceable pseudo-words; none contains a category keyword."""
+    rng = np.random.default_rng(seed)
+    onsets = np.array(["b", "c", "d", "f", "g", "l", "m", "n", "p", "r", "s", "t", "v", "br", "ch", "st", "tr"])
+    vowels = np.array(["a", "e", "i", "o", "u", "ai", "ou"])
+    codas = np.array(["", "n", "r", "s", "t", "ck", "ng"])
+    words = list(dict.fromkeys(COMMON_WORDS))
+    seen = set(words)
+    while len(words) < size:
+        # One to three syllables per candidate, drawn in bulk.
+        batch = 2 * size
+        candidates = np.full(batch, "", dtype=object)
+        syllables = rng.integers(1, 4, size=batch)
+        for k in range(3):
+            syllable = (onsets[rng.integers(0, len(onsets), size=batch)].astype(object)
+                        + vowels[rng.integers(0, len(vowels), size=batch)]
+                        + codas[rng.integers(0, len(codas), size=batch)])
+            candidates = np.where(syllables > k, candidates + syllable, candidates)
+        for word in candidates:
+            if word not in seen and not any(keyword in word for keyword in KEYWORDS):
+                seen.add(word)
+                words.append(word)
+    return np.array(words[:size], dtype=object)
+
+
+class CorpusGenerator:
+    """Generates TWCS-shaped chunks; see the module docstring for the distributions."""
+
+    def __init__(self, vocabulary_size: int = 30_000, seed: int = 0):
+        self.rng = np.random.default_rng(seed)
+        self.vocabulary = build_vocabulary(vocabulary_size, seed)
+        # Zipf's law over the finite vocabulary: the r-th most common word has weight 1/r.
+        self.word_cdf = np.cumsum(1.0 / np.arange(1, vocabulary_size + 1))
+        self.word_cdf /= self.word_cdf[-1]
+        # Topic words: each category's keywords plus 50 words of its own; the last topic is
+        # chatter that matches no category.
+        self.topic_keywords = [np.array(keywords, dtype=object) for keywords in DEFAULT_KEYWORDS.values()]
+        self.topic_keywords.append(np.array([], dtype=object))
+        self.topic_words = [self.vocabulary[1000 + 50 * t:1050 + 50 * t] for t in range(len(self.topic_keywords))]
+        self.next_id = 1
+        self.next_customer = 100_000
+
+    def _zipf_words(self, n: int) -> np.ndarray:
+        return self.vocabulary[np.searchsorted(self.word_cdf, self.rng.uniform(size=n))]
+
+    def _texts(self, inbound: np.ndarray, topic: np.ndarray, brand: np.ndarray, customer: np.ndarray) -> list:
+        n = len(inbound)
+        lengths = np.clip(np.round(self.rng.lognormal(np.log(14), 0.6, size=n)), 1, 50).astype(np.int64)
+        words = self._zipf_words(int(lengths.sum()))
+        ends = np.cumsum(lengths)
+        # Customer tweets get a topic word (a category keyword in about half of them) at a
+        # random position.
+        positions = ends - 1 - (self.rng.uniform(size=n) * lengths).astype(np.int64)
+        use_keyword = self.rng.uniform(size=n) < 0.5
+        for t in range(len(self.topic_words)):
+            rows = inbound & (topic == t)
+            keyword_rows = rows & use_keyword if len(self.topic_keywords[t]) else np.zeros(n, dtype=bool)
+            word_rows = rows & ~keyword_rows
+            if keyword_rows.any():
+                words[positions[keyword_rows]] = self.rng.choice(self.topic_keywords[t], size=int(keyword_rows.sum()))
+            words[positions[word_rows]] = self.rng.choice(self.topic_words[t], size=int(word_rows.sum()))
+        texts = [" ".join(words[end - length:end]) for end, length in zip(ends.tolist(), lengths.tolist())]
+
+        out = []
+        extras = self.rng.uniform(size=n)
+        links = self.rng.integers(0, 10**10, size=n)
+        for i, text in enumerate(texts):
+            if inbound[i]:
+                text = f"@{brand[i]} {text}"
+                if extras[i] < 0.15:
+                    text += " " + EMOJI[i % len(EMOJI)]
+            else:
+                text = f"@{customer[i]} {BRAND_PHRASES[i % len(BRAND_PHRASES)]} {text} ^{chr(65 + i % 26)}{chr(65 + i * 7 % 26)}"
+                if extras[i] < 0.2:
+                    text += f" https://t.co/{links[i]:010d}"
+            out.append(text[:280])
+        return out
+
+    def chunk(self, rows: int) -> pd.DataFrame:
+        """The next `rows` tweets (conversations continue across chunk boundaries only by truncation)."""
+        rng = self.rng
+        sizes = rng.geometric(0.35, size=rows)
+        sizes = sizes[:np.searchsorted(np.cumsum(sizes), rows) + 1]
+        sizes[-1] -= sizes.sum() - rows
+        n_threads = len(sizes)
+        thread = np.repeat(np.arange(n_threads), sizes)
+        step = np.arange(rows) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        ids = np.arange(self.next_id, self.next_id + rows, dtype=np.int64)
+        self.next_id += rows
+
+        inbound = step % 2 == 0
+        customers = np.arange(self.next_customer, self.next_customer + n_threads)
+        self.next_customer += n_threads
+        brand = np.array(BRANDS, dtype=object)[rng.integers(0, len(BRANDS), size=n_threads)][thread]
+        customer = customers[thread]
+        topic = rng.choice(len(self.topic_words), size=n_threads, p=[0.3, 0.3, 0.25, 0.15])[thread]
+
+        last = step == np.repeat(sizes - 1, sizes)
+        response = pd.array(np.where(last, 0, ids + 1), dtype="Int64")
+        response[last] = pd.NA
+        reply_to = pd.array(ids - 1, dtype="Int64")
+        reply_to[step == 0] = pd.NA
+
+        # Threads start anywhere in two months; replies follow minutes to hours apart.
+        elapsed = np.cumsum(np.where(step == 0, 0, rng.exponential(1800, size=rows)))
+        offsets = rng.uniform(0, 60 * 86400, size=n_threads)[thread] + elapsed - elapsed[step == 0][thread]
+        created = (BASE_TIME + pd.to_timedelta(offsets, unit="s")).strftime("%a %b %d %H:%M:%S +0000 %Y")
+
+        return pd.DataFrame({
+            "tweet_id": ids,
+            "author_id": np.where(inbound, customer.astype(str), brand),
+            "inbound": inbound,
+            "created_at": created,
+            "text": self._texts(inbound, topic, brand, customer),
+            "response_tweet_id": response,
+            "in_response_to_tweet_id": reply_to,
+        }, columns=TWCS_COLUMNS)
+
+
+def write_corpus(path: str, rows: int, seed: int = 0, chunk_rows: int = 200_000,
+                 vocabulary_size: int = 30_000) -> str:
+    """Write a `rows`-row synthetic TWCS CSV to `path`."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    generator = CorpusGenerator(vocabulary_size, seed)
+    written = 0
+    while written < rows:
+        chunk = generator.chunk(min(chunk_rows, rows - written))
+        chunk.to_csv(path, mode="w" if written == 0 else "a", header=written == 0, index=False)
+        written += len(chunk)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--output", default=os.path.join("data", "twcs", "synthetic.csv"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vocabulary", type=int, default=30_000, help="Distinct words")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_corpus(args.output, args.rows, args.seed, vocabulary_size=args.vocabulary)
+    seconds = time.perf_counter() - start
+    print(f"Wrote {args.rows} tweets to {args.output} in {seconds:.1f} s "
+          f"({os.path.getsize(args.output) / 2**20:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+A local stand-in for ChatGroq used by the benchmarks.
+
+FakeTicketChatModel answers every prompt after a fixed, injectable delay: the
+structured analysis prompt gets a TicketAnalysis JSON object, the entities prompt
+its TicketEntities half, other prompts that ask for JSON get the extraction JSON,
+everything else gets a one-sentence summary.
+It never touches the network.
+"""
+
+import json
+import time
+import asyncio
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+ENTITIES = {
+    "customer_name": None,
+    "issue_type": "technical",
+    "urgency": "medium",
+    "contact_method": None,
+}
+
+
+def reply_content(prompt: str) -> str:
+    """The canned answer to a prompt, shared with fake_llm_endpoint.py."""
+    if '"summary"' in prompt:
+        return json.dumps({"summary": "The customer reports a problem and asks for help.", "entities": ENTITIES})
+    if '"issue_type"' in prompt:
+        return json.dumps(ENTITIES)
+    if "JSON" in prompt:
+        return json.dumps({
+            "customer_name": None,
+            "product_name": None,
+            "order_id": None,
+        })
+    return "The customer reports a problem and asks for help."
+
+
+class FakeTicketChatModel(BaseChatModel):
+    latency: float = 0.1
+    """Seconds to wait before answering each call."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-ticket-chat-model"
+
+    def _respond(self, messages) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        content = reply_content(prompt)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": len(prompt.split()),
+                "output_tokens": len(content.split()),
+                "total_tokens": len(prompt.split()) + len(content.split()),
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._respond(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._respond(messages)
@@ -0,0 +1,134 @@
+"""
+A local, rate-limited stand-in for the Groq chat completions API.
+
+FakeLLMEndpoint is an ASGI app that answers POST .../chat/completions in the
+OpenAI/Groq wire format with the canned replies of fake_llm.py, after a fixed
+delay. Like the real service it enforces requests/min and tokens/min quotas and
+answers 429 with a Retry-After header once either is used up; tokens are counted
+as words. Quotas are enforced over a sliding `window_seconds` window (scaled down
+from the minute), the way providers quantize their per-minute limits.
+
+Point a ChatGroq at it with base_url=endpoint.url (see serve_in_thread) to run
+the real SDK and LLMService against it without network access.
+"""
+
+import json
+import time
+import socket
+import asyncio
+import threading
+from collections import deque
+
+import uvicorn
+
+from benchmarks.fake_llm import reply_content
+
+
+class FakeLLMEndpoint:
+    def __init__(self, requests_per_minute: float = 600, tokens_per_minute: float = 60_000,
+                 window_seconds: float = 1.0, latency: float = 0.05):
+        self.request_limit = requests_per_minute * window_seconds / 60
+        self.token_limit = tokens_per_minute * window_seconds / 60
+        self.window = window_seconds
+        self.latency = latency
+        self.accepted = 0
+        self.rejected = 0
+        self.tokens = 0
+        self._recent = deque()  # (time, tokens) of accepted calls inside the window
+        self._recent_tokens = 0
+        self.url = None
+
+    def _admit(self, tokens: int):
+        """None if the call fits the quotas, else the seconds until it would."""
+        now = time.monotonic()
+        while self._recent and self._recent[0][0] <= now - self.window:
+            self._recent_tokens -= self._recent.popleft()[1]
+        if len(self._recent) + 1 > self.request_limit or self._recent_tokens + tokens > self.token_limit:
+            return max(0.01, self._recent[0][0] + self.window - now) if self._recent else self.window
+        self._recent.append((now, tokens))
+        self._recent_tokens += tokens
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        if not scope["path"].endswith("/chat/completions"):
+            return await self._send(send, 404, {"error": {"message": "not found"}})
+
+        request = json.loads(body)
+        prompt = "\n".join(str(message["content"]) for message in request["messages"])
+        content = reply_content(prompt)
+        prompt_tokens, completion_tokens = len(prompt.split()), len(content.split())
+
+        wait = self._admit(prompt_tokens + completion_tokens)
+        if wait is not None:
+            self.rejected += 1
+            return await self._send(
+                send, 429,
+                {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                headers=[(b"retry-after", f"{wait:.3f}".encode())],
+            )
+
+        self.accepted += 1
+        self.tokens += prompt_tokens + completion_tokens
+        await asyncio.sleep(self.latency)
+        await self._send(send, 200, {
+            "id": f"chatcmpl-{self.accepted}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    @staticmethod
+    async def _send(send, status, payload, headers=()):
+        body = json.dumps(payload).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                        *headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def stats(self) -> dict:
+        return {"accepted": self.accepted, "rejected": self.rejected, "tokens": self.tokens}
+
+
+def serve_in_thread(endpoint: FakeLLMEndpoint) -> uvicorn.Server:
+    """Start the endpoint on a free local port in a daemon thread; sets `endpoint.url`."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(endpoint, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    endpoint.url = f"http://127.0.0.1:{port}"
+    return server
@@ -0,0 +1,368 @@
+"""
+Benchmark suite: end-to-end timings and peak memory with a JSON history and
+regression checks against a stored baseline.
+
+A synthetic TWCS corpus of --rows tweets (corpus.py) is written to a work
+directory and these cases run in order, each in a fresh process so its peak
+memory is its own:
+
+    corpus            generate the synthetic CSV
+    ingestion         DataIngestion: CSV -> cleaned, labeled Parquet
+    transformation    DataTransformation.initiate_data_transformation
+    training          ModelTrainer.evaluate_models over the candidates of
+                      initiate_model_training (--models), best model saved
+    predict_single    PredictionPipeline.predict_batch on one ticket at a time
+                      (classification only), p50/p99 latency
+    predict_batch     PredictionPipeline.predict_batch over --predict-tickets
+    llm_service       LLMService.analyze_ticket and aanalyze_ticket against
+                      FakeTicketChatModel with --llm-latency injected per call
+
+Each case records wall seconds (of the measured operation only), peak RSS of
+its process and that process's children, and figures of its own. A run is
+appended as one JSON line to --history. With --baseline, cases whose time or
+peak memory grew by more than --time-tolerance or --memory-tolerance are
+reported as regressions and the exit status is 1; --save-baseline stores this
+run as the new baseline. Only runs with the same parameters (--rows, --models,
+ticket counts, ...) are compared; --repeat keeps each case's fastest of N runs,
+which steadies the timings on a noisy machine.
+
+Usage:
+    python benchmarks/suite.py --rows 100000
+    python benchmarks/suite.py --rows 100000 --repeat 3 --save-baseline
+    python benchmarks/suite.py --rows 100000 --cases predict_single predict_batch
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import platform
+import argparse
+import resource
+import tempfile
+import subprocess
+
+import numpy as np
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+CASES = ["corpus", "ingestion", "transformation", "training", "predict_single", "predict_batch", "llm_service"]
+# Cases whose output a case reads; they are run first even when not selected.
+REQUIRES = {
+    "ingestion": ["corpus"],
+    "transformation": ["ingestion"],
+    "training": ["ingestion"],
+    "predict_single": ["training"],
+    "predict_batch": ["training"],
+    "llm_service": ["ingestion"],
+}
+COMPARED = {"seconds": "time", "peak_rss_mb": "memory"}
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux; children covers ModelTrainer's worker pool.
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024
+
+
+def _paths(work_dir):
+    return {
+        "corpus": os.path.join(work_dir, "twcs.csv"),
+        "processed": os.path.join(work_dir, "processed_tickets.parquet"),
+    }
+
+
+def _tickets(work_dir, n):
+    import pyarrow.parquet as pq
+
+    texts = pq.read_table(_paths(work_dir)["processed"], columns=["text"]).column("text").to_pylist()
+    return [texts[i % len(texts)] for i in range(n)]
+
+
+# Each case runs in the work directory (so saved_models/ and mlruns/ land there) and
+# returns (seconds, extra figures).
+
+def case_corpus(args, work_dir):
+    from benchmarks.corpus import write_corpus
+
+    start = time.perf_counter()
+    path = write_corpus(_paths(work_dir)["corpus"], args.rows, seed=args.seed)
+    seconds = time.perf_counter() - start
+    return seconds, {"rows": args.rows, "csv_mb": os.path.getsize(path) / 2**20}
+
+
+def case_ingestion(args, work_dir):
+    from src.components.data_ingestion import DataIngestion, DataIngestionConfig
+
+    paths = _paths(work_dir)
+    config = DataIngestionConfig(raw_data_path=paths["corpus"], processed_data_path=paths["processed"])
+    start = time.perf_counter()
+    DataIngestion(config).initiate_data_ingestion()
+    seconds = time.perf_counter() - start
+    return seconds, {"rows_per_second": args.rows / seconds}
+
+
+def _training_frame(work_dir):
+    import pandas as pd
+
+    return pd.read_parquet(_paths(work_dir)["processed"], columns=["text", "category"])
+
+
+def case_transformation(args, work_dir):
+    from src.components.data_transformation import DataTransformation
+
+    df = _training_frame(work_dir)
+    start = time.perf_counter()
+    X_train, _, _, _, _ = DataTransformation().initiate_data_transformation(df, "category")
+    seconds = time.perf_counter() - start
+    return seconds, {"tickets": len(df), "features": X_train.shape[1], "nnz": int(X_train.nnz)}
+
+
+def case_training(args, work_dir):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from src.components.data_transformation import DataTransformation
+    from src.components.model_trainer import ModelTrainer, ModelTrainerConfig
+    from utils import load_object, save_object
+
+    X_train, y_train, X_test, y_test, preprocessor_path = DataTransformation().initiate_data_transformation(
+        _training_frame(work_dir), "category"
+    )
+    # The candidates of ModelTrainer.initiate_model_training, plus SGD for large corpora.
+    candidates = {
+        "lr": ("Logistic Regression", lambda: LogisticRegression(multi_class='ovr', solver='liblinear')),
+        "rf": ("Random Forest", lambda: RandomForestClassifier(n_estimators=100, random_state=42)),
+        "sgd": ("SGD", lambda: SGDClassifier(loss='log_loss', early_stopping=True, n_iter_no_change=3,
+                                             random_state=42)),
+    }
+    models = {candidates[key][0]: candidates[key][1]() for key in args.models}
+    trainer = ModelTrainer(ModelTrainerConfig(n_jobs=args.n_jobs))
+    start = time.perf_counter()
+    report = trainer.evaluate_models(X_train, y_train, X_test, y_test, models)
+    seconds = time.perf_counter() - start
+
+    # What the prediction cases load: the best model and its linear artifact.
+    best = max(report, key=lambda name: report[name]["f1_score"])
+    save_object(trainer.model_trainer_config.trained_model_file_path, models[best])
+    trainer.export_linear_artifact(load_object(preprocessor_path), models[best])
+    extra = {"best_model": best}
+    for name, entry in report.items():
+        extra[f"f1/{name}"] = entry["f1_score"]
+        extra[f"fit_seconds/{name}"] = entry["fit_seconds"]
+    return seconds, extra
+
+
+def case_predict_single(args, work_dir):
+    from src.pipelines.prediction_pipeline import PredictionPipeline
+
+    texts = _tickets(work_dir, args.predict_tickets)
+    pipeline = PredictionPipeline()
+    pipeline.predict_batch(texts[:1])  # Loads the model; predict_batch reports that time
+    latencies = np.empty(len(texts))
+    start = time.perf_counter()
+    for i, text in enumerate(texts):
+        call_start = time.perf_counter()
+        pipeline.predict_batch([text])
+        latencies[i] = time.perf_counter() - call_start
+    seconds = time.perf_counter() - start
+    return seconds, {
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "tickets_per_second": len(texts) / seconds,
+    }
+
+
+def case_predict_batch(args, work_dir):
+    from src.pipelines.prediction_pipeline import PredictionPipeline
+
+    texts = _tickets(work_dir, args.predict_tickets)
+    pipeline = PredictionPipeline()
+    load_start = time.perf_counter()
+    pipeline.predict_batch(texts[:1])
+    load_seconds = time.perf_counter() - load_start
+    start = time.perf_counter()
+    pipeline.predict_batch(texts)
+    seconds = time.perf_counter() - start
+    return seconds, {"load_seconds": load_seconds, "tickets_per_second": len(texts) / seconds}
+
+
+def case_llm_service(args, work_dir):
+    from benchmarks.fake_llm import FakeTicketChatModel
+    from src.components.llm_service import LLMService
+
+    texts = _tickets(work_dir, args.llm_tickets)
+    service = LLMService(model=FakeTicketChatModel(latency=args.llm_latency))
+    latencies = np.empty(len(texts))
+    start = time.perf_counter()
+    for i, text in enumerate(texts):
+        call_start = time.perf_counter()
+        service.analyze_ticket(text)
+        latencies[i] = time.perf_counter() - call_start
+    seconds = time.perf_counter() - start
+
+    async def analyze_all():
+        semaphore = asyncio.Semaphore(args.llm_concurrency)
+
+        async def one(text):
+            async with semaphore:
+                await service.aanalyze_ticket(text)
+
+        await asyncio.gather(*(one(text) for text in texts))
+
+    async_start = time.perf_counter()
+    asyncio.run(analyze_all())
+    async_seconds = time.perf_counter() - async_start
+    return seconds, {
+        "p50_overhead_ms": float((np.percentile(latencies, 50) - args.llm_latency) * 1000),
+        "async_tickets_per_second": len(texts) / async_seconds,
+        "input_tokens": service.usage.input_tokens,
+    }
+
+
+def run_case(name, args):
+    """Child process: run one case and print its result as JSON on the last line."""
+    os.chdir(args.work_dir)
+    seconds, extra = globals()[f"case_{name}"](args, args.work_dir)
+    result = {"seconds": seconds, "peak_rss_mb": _peak_rss_mb(), **extra}
+    print(json.dumps(result))
+
+
+def parameters(args) -> dict:
+    """What a run's figures depend on; a baseline is only comparable with the same values."""
+    return {key: getattr(args, key) for key in ("rows", "seed", "models", "n_jobs", "predict_tickets",
+                                                 "llm_tickets", "llm_latency", "llm_concurrency")}
+
+
+def spawn_case(name, args, work_dir):
+    command = [sys.executable, os.path.abspath(__file__), "--run-case", name, "--work-dir", work_dir,
+               "--rows", str(args.rows), "--seed", str(args.seed), "--models", *args.models,
+               "--n-jobs", str(args.n_jobs), "--predict-tickets", str(args.predict_tickets),
+               "--llm-tickets", str(args.llm_tickets), "--llm-latency", str(args.llm_latency),
+               "--llm-concurrency", str(args.llm_concurrency)]
+    # Logs go to a file in the work directory, not into the suite's output.
+    env = {**os.environ, "LOG_CONSOLE": "0", "LOG_FILE": os.path.join(work_dir, "suite.log"),
+           "PYTHONPATH": ROOT_DIR}
+    completed = subprocess.run(command, cwd=work_dir, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"case {name} failed:\n{completed.stderr[-4000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(run, baseline, time_tolerance, memory_tolerance, min_seconds):
+    """Regressions of `run` against `baseline`, as printable lines."""
+    tolerances = {"time": time_tolerance, "memory": memory_tolerance}
+    regressions = []
+    for name, result in run["cases"].items():
+        reference = baseline["cases"].get(name)
+        if reference is None:
+            continue
+        for metric, kind in COMPARED.items():
+            old, new = reference.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            if metric == "seconds" and new - old < min_seconds:
+                continue
+            change = new / old - 1
+            if change > tolerances[kind]:
+                regressions.append(f"{name}: {metric} {old:.3f} -> {new:.3f} ({change:+.1%}, "
+                                   f"tolerance {tolerances[kind]:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic corpus size (tweets)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--models", nargs="+", choices=["lr", "rf", "sgd"], default=["lr", "rf"],
+                        help="Training candidates; leave out rf above a few hundred thousand rows")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="ModelTrainer worker processes")
+    parser.add_argument("--predict-tickets", type=int, default=2000)
+    parser.add_argument("--llm-tickets", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.01, help="Seconds per fake LLM call")
+    parser.add_argument("--llm-concurrency", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the fastest is recorded")
+    parser.add_argument("--work-dir", help="Keep the corpus and models here (default: a temporary directory)")
+    parser.add_argument("--history", default=os.path.join(RESULTS_DIR, "history.jsonl"))
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.15, help="Allowed peak memory growth")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="Slowdowns smaller than this many seconds are noise, not regressions")
+    parser.add_argument("--run-case", choices=CASES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        run_case(args.run_case, args)
+        return
+
+    work_dir = os.path.abspath(args.work_dir or tempfile.mkdtemp(prefix="bench_suite_"))
+    os.makedirs(work_dir, exist_ok=True)
+    selected = set(args.cases)
+    pending = list(args.cases)
+    while pending:
+        for required in REQUIRES.get(pending.pop(), []):
+            if required not in selected:
+                selected.add(required)
+                pending.append(required)
+
+    run = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "parameters": parameters(args),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "cases": {},
+    }
+    print(f"Benchmark suite: {args.rows} rows, work dir {work_dir}")
+    for name in CASES:
+        if name not in selected:
+            continue
+        result = min((spawn_case(name, args, work_dir) for _ in range(args.repeat)), key=lambda r: r["seconds"])
+        run["cases"][name] = result
+        extra = ", ".join(f"{key} {value:.4g}" if isinstance(value, float) else f"{key} {value}"
+                          for key, value in result.items() if key not in COMPARED)
+        print(f"{name:15}: {result['seconds']:8.3f} s, peak {result['peak_rss_mb']:7.1f} MB; {extra}")
+
+    os.makedirs(os.path.dirname(args.history) or ".", exist_ok=True)
+    with open(args.history, "a") as file_obj:
+        file_obj.write(json.dumps(run) + "\n")
+    print(f"Appended to {args.history}")
+
+    status = 0
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file_obj:
+            baseline = json.load(file_obj)
+        if baseline.get("parameters") != run["parameters"]:
+            print(f"Baseline {args.baseline} was run with {baseline.get('parameters')}, this run with "
+                  f"{run['parameters']}; not compared")
+        else:
+            regressions = compare(run, baseline, args.time_tolerance, args.memory_tolerance, args.min_seconds)
+            print(f"Compared with baseline from {baseline['timestamp']} (commit {baseline.get('commit')}): "
+                  f"{len(regressions)} regressions")
+            for line in regressions:
+                print(f"  REGRESSION {line}")
+            status = 1 if regressions else 0
+    if args.save_baseline:
+        with open(args.baseline, "w") as file_obj:
+            json.dump(run, file_obj, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,294 @@
-import logging
 import os
-from datetime import datetime
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 
-# Create logs directory if it doesn't exist
+# Create logs directory lazily, on the first record (see configure_logging)
 LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
-
-# Generate log filename with timestamp
-LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
-LOG_FILE_PATH = os.path.join(LOG_DIR, LOG_FILE)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE_PATH),  # Save to file
-        logging.StreamHandler()  # Display in terminal
-    ]
-)
+LOG_FORMAT = "[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s"
+
+# Seconds stopping the listener may wait for room for its sentinel, then for the thread.
+_STOP_TIMEOUT = 5.0
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and is
+# written as a field of its own by JsonFormatter.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in ("0", "false", "no")
+
+
+@dataclass
+class LoggingConfig:
+    """Configuration class for logging; every field can be set from the environment."""
+    level: str = field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
+    # "async": callers only put records on a queue and one listener thread formats and
+    # writes them. "sync": handlers run in the calling thread (the old behaviour).
+    mode: str = field(default_factory=lambda: os.getenv("LOG_MODE", "async"))
+    # Records waiting for the listener; when the queue is full "block" waits for room
+    # and "drop" discards the record (the listener reports how many were lost).
+    queue_size: int = field(default_factory=lambda: int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    queue_policy: str = field(default_factory=lambda: os.getenv("LOG_QUEUE_POLICY", "block"))
+    # One JSON object per line instead of LOG_FORMAT.
+    json: bool = field(default_factory=lambda: _env_flag("LOG_JSON", "0"))
+    # None: a new timestamped file in LOG_DIR per process; "" disables the log file.
+    file_path: str = field(default_factory=lambda: os.getenv("LOG_FILE"))
+    console: bool = field(default_factory=lambda: _env_flag("LOG_CONSOLE", "1"))
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object: time, level, logger, line, message and any extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler over a bounded queue that blocks or drops when the queue is full.
+
+    The caller only renders the message (its arguments may change once the call
+    returns); formatting and I/O happen on the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "block"):
+        if policy not in ("block", "drop"):
+            raise ValueError(f"Unknown queue policy: {policy}")
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process, so the record itself is handed over: no copy, no formatting here.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _DeferredFlush:
+    """Handler mixin for the listener thread: records are flushed in batches by `_Listener`, not one by one."""
+
+    def flush(self):
+        pass
+
+    def flush_now(self, record: logging.LogRecord = None):
+        """Flush the stream; a failure is reported through handleError for `record`, or ignored without one."""
+        try:
+            super().flush()
+        except (OSError, ValueError):
+            # A closed stderr or a broken pipe (`run.py ... | head`), as logging.shutdown tolerates.
+            if record is not None:
+                self.handleError(record)
+
+
+class _DeferredFlushFileHandler(_DeferredFlush, logging.FileHandler):
+    pass
+
+
+class _DeferredFlushStreamHandler(_DeferredFlush, logging.StreamHandler):
+    pass
+
+
+class _Listener(logging.handlers.QueueListener):
+    """
+    QueueListener that reports records dropped by its BoundedQueueHandler and
+    flushes its handlers whenever it has caught up with the queue.
+    """
+
+    def __init__(self, queue_handler: BoundedQueueHandler, *handlers):
+        super().__init__(queue_handler.queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.reported = 0
+
+    def handle(self, record: logging.LogRecord):
+        try:
+            dropped = self.queue_handler.dropped
+            if dropped != self.reported:
+                warning = logging.LogRecord(
+                    record.name, logging.WARNING, __file__, 0,
+                    f"Log queue full: {dropped - self.reported} records dropped", None, None,
+                )
+                self.reported = dropped
+                super().handle(warning)
+            super().handle(record)
+            if self.queue.empty():
+                self.flush(record)
+        except Exception:
+            # Even handleError can fail (it writes to stderr). This thread must outlive
+            # it: with the "block" policy every caller would wait on an undrained queue.
+            pass
+
+    def flush(self, record: logging.LogRecord = None):
+        for handler in self.handlers:
+            handler.flush_now(record)
+
+    def stop(self):
+        # Bounded waits: if the thread is stuck or gone, exiting must not hang on it.
+        if self._thread is not None:
+            try:
+                self.queue.put(self._sentinel, timeout=_STOP_TIMEOUT)
+            except queue.Full:
+                pass
+            self._thread.join(_STOP_TIMEOUT)
+            self._thread = None
+        self.flush()
+
+
+class _LazySetup(logging.Handler):
+    """Placeholder root handler that configures logging on the first record and passes it on."""
+
+    def handle(self, record: logging.LogRecord):
+        configure_logging()
+        logging.getLogger().handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        pass
+
+
+_setup_lock = threading.Lock()
+_lazy_handler = _LazySetup()
+_state = {"config": None, "handlers": [], "queue_handler": None, "listener": None, "log_file": None}
+
+
+def configure_logging(config: LoggingConfig = None, force: bool = False) -> LoggingConfig:
+    """
+    Install the log handlers on the root logger (done automatically on the first
+    record). Call it directly to pick another mode, format or file; with force=True
+    an existing setup is flushed and replaced.
+
+    Returns:
+        LoggingConfig: The configuration in effect.
+    """
+    with _setup_lock:
+        if _state["config"] is not None and not force:
+            return _state["config"]
+        _teardown()
+        config = config or LoggingConfig()
+        if config.mode not in ("async", "sync"):
+            raise ValueError(f"Unknown log mode: {config.mode}")
+
+        formatter = JsonFormatter() if config.json else logging.Formatter(LOG_FORMAT)
+        deferred = config.mode == "async"
+        file_handler = _DeferredFlushFileHandler if deferred else logging.FileHandler
+        stream_handler = _DeferredFlushStreamHandler if deferred else logging.StreamHandler
+        handlers = []
+        if config.file_path != "":
+            log_file = config.file_path
+            if log_file is None:
+                os.makedirs(LOG_DIR, exist_ok=True)
+                log_file = os.path.join(LOG_DIR, f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log")
+            handlers.append(file_handler(log_file))  # Save to file
+            _state["log_file"] = log_file
+        if config.console:
+            handlers.append(stream_handler())  # Display in terminal
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        root = logging.getLogger()
+        root.removeHandler(_lazy_handler)
+        root.setLevel(config.level)
+        if config.mode == "async":
+            queue_handler = BoundedQueueHandler(queue.Queue(config.queue_size), config.queue_policy)
+            listener = _Listener(queue_handler, *handlers)
+            listener.start()
+            root.addHandler(queue_handler)
+            _state.update(queue_handler=queue_handler, listener=listener)
+        else:
+            for handler in handlers:
+                root.addHandler(handler)
+        _state.update(config=config, handlers=handlers)
+        return config
+
+
+def _teardown():
+    root = logging.getLogger()
+    if _state["listener"] is not None:
+        # Detached first, so no new records queue up behind the sentinel.
+        root.removeHandler(_state["queue_handler"])
+        _state["listener"].stop()  # Writes out everything still queued
+    for handler in _state["handlers"]:
+        root.removeHandler(handler)
+        try:
+            handler.close()
+        except (OSError, ValueError):
+            pass
+    _state.update(config=None, handlers=[], queue_handler=None, listener=None, log_file=None)
+
+
+def shutdown_logging():
+    """Write out queued records and close the handlers; logging is set up again on the next record."""
+    with _setup_lock:
+        _teardown()
+        if _lazy_handler not in logging.getLogger().handlers:
+            logging.getLogger().addHandler(_lazy_handler)
+
+
+def _flush_at_exit():
+    # Records logged after this (by later exit hooks) fall back to logging.lastResort.
+    with _setup_lock:
+        _teardown()
+
+
+def logging_stats() -> dict:
+    """Mode, log file, records waiting in the queue and records dropped so far."""
+    queue_handler = _state["queue_handler"]
+    return {
+        "mode": _state["config"].mode if _state["config"] else None,
+        "log_file": _state["log_file"],
+        "queued": queue_handler.queue.qsize() if queue_handler else 0,
+        "dropped": queue_handler.dropped if queue_handler else 0,
+    }
+
+
+def _restart_listener_in_child():
+    # A forked child inherits the queue but not the listener thread; give it its own.
+    listener = _state["listener"]
+    if listener is None:
+        return
+    queue_handler = _state["queue_handler"]
+    queue_handler.queue = queue.Queue(queue_handler.queue.maxsize)
+    queue_handler.dropped = 0
+    listener = _Listener(queue_handler, *_state["handlers"])
+    listener.start()
+    _state["listener"] = listener
+    # multiprocessing children leave through os._exit, skipping atexit; its finalizers still run.
+    multiprocessing_util = sys.modules.get("multiprocessing.util")
+    if multiprocessing_util is not None:
+        multiprocessing_util.Finalize(None, _flush_at_exit, exitpriority=0)
+
+
+# Nothing is opened until the first record: importing this module creates no log file.
+logging.getLogger().setLevel(LoggingConfig().level)
+logging.getLogger().addHandler(_lazy_handler)
+atexit.register(_flush_at_exit)
+os.register_at_fork(after_in_child=_restart_listener_in_child)
 
 # Create a logger instance
 logger = logging.getLogger("CustomerSupportLogger")
@@ -27,10 +297,10 @@ logger = logging.getLogger("CustomerSupportLogger")
 def get_logger(name: str = "CustomerSupportLogger"):
     """
     Get a logger instance with the specified name.
-    
+
     Args:
         name (str): Name of the logger. Defaults to "CustomerSupportLogger".
-    
+
     Returns:
         logging.Logger: Configured logger instance.
     """
@@ -38,4 +308,5 @@ def get_logger(name: str = "CustomerSupportLogger"):
 
 
 # Export the logger for easy import
-__all__ = ['logger', 'get_logger']
+__all__ = ['logger', 'get_logger', 'configure_logging', 'shutdown_logging', 'logging_stats',
+           'LoggingConfig', 'JsonFormatter', 'BoundedQueueHandler']
@@ -0,0 +1,254 @@
+import os
+import sys
+import math
+import time
+import bisect
+import threading
+from collections import Counter as _Counter
+from contextlib import nullcontext
+
+# Latency buckets from 50 us to ~2 min, each sqrt(2) wider than the last, so a
+# percentile read from them is within about 20% of the true value.
+DEFAULT_BUCKETS = tuple(5e-5 * 2 ** (i / 2) for i in range(43))
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values (Prometheus style)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the q-quantile, interpolated inside its bucket."""
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.min), self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else math.nan,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max if self.count else math.nan,
+        }
+
+
+class _Timer:
+    __slots__ = ("registry", "key", "start")
+
+    def __init__(self, registry, key):
+        self.registry = registry
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry._observe(self.key, time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and latency histograms, keyed by name and labels.
+
+    Disabled (METRICS_ENABLED=0 in the environment, or `enabled = False`), every
+    call returns right away and `timer` hands out one shared no-op context
+    manager, so instrumented code pays about one attribute check per call.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items())) if len(labels) > 1 else tuple(labels.items())
+
+    def describe(self, name: str, help_text: str):
+        """Set the HELP line of a metric in the Prometheus export."""
+        self._help[name] = help_text
+
+    def timer(self, name: str, **labels):
+        """Context manager that observes its elapsed seconds in histogram `name`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, self._key(name, labels))
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        self._observe(self._key(name, labels), value)
+
+    def _observe(self, key, value: float):
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict:
+        """Counters and histogram summaries (count, mean, p50, p95, p99, max) as plain dicts."""
+        def label_text(labels):
+            return ",".join(f"{key}={value}" for key, value in labels)
+
+        with self._lock:
+            histograms = {
+                f"{name}{{{label_text(labels)}}}" if labels else name: histogram.summary()
+                for (name, labels), histogram in sorted(self._histograms.items())
+            }
+            counters = {
+                f"{name}{{{label_text(labels)}}}" if labels else name: value
+                for (name, labels), value in sorted(self._counters.items())
+            }
+        return {"histograms": histograms, "counters": counters}
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        def label_text(labels, extra=()):
+            pairs = [*labels, *extra]
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+
+            typed = set()
+            for (name, labels), value in counters:
+                if name not in typed:
+                    typed.add(name)
+                    if name in self._help:
+                        lines.append(f"# HELP {name} {self._help[name]}")
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name}{label_text(labels)} {value:g}")
+
+            for (name, labels), histogram in histograms:
+                if name not in typed:
+                    typed.add(name)
+                    if name in self._help:
+                        lines.append(f"# HELP {name} {self._help[name]}")
+                    lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{label_text(labels, [('le', f'{bound:.6g}')])} {cumulative}")
+                lines.append(f"{name}_bucket{label_text(labels, [('le', '+Inf')])} {histogram.count}")
+                lines.append(f"{name}_sum{label_text(labels)} {histogram.sum:.9g}")
+                lines.append(f"{name}_count{label_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class SamplingProfiler:
+    """
+    Opt-in statistical profiler that writes flame-graph-ready folded stacks.
+
+    A background thread samples the stack of every other thread every `interval`
+    seconds. `stop` writes one "outer;...;inner count" line per distinct stack,
+    the input format of flamegraph.pl, speedscope and inferno. Nothing runs until
+    `start` is called, so it costs nothing when not in use.
+
+    Usage:
+        with SamplingProfiler("profile.folded"):
+            pipeline.predict_batch(texts)
+    """
+
+    def __init__(self, output_path: str, interval: float = 0.005):
+        self.output_path = output_path
+        self.interval = interval
+        self.samples = _Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> str:
+        """Stop sampling and write the folded stacks; returns the output path."""
+        self._stop.set()
+        self._thread.join()
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        with open(self.output_path, "w") as file_obj:
+            for stack, count in self.samples.most_common():
+                file_obj.write(f"{stack} {count}\n")
+        return self.output_path
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+
+metrics = MetricsRegistry(enabled=os.getenv("METRICS_ENABLED", "1").lower() not in ("0", "false", "no"))
+
+
+def get_metrics() -> MetricsRegistry:
+    """The process-wide metrics registry."""
+    return metrics
+
+
+# Export the registry for easy import
+__all__ = ['metrics', 'get_metrics', 'MetricsRegistry', 'Histogram', 'SamplingProfiler']
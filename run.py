@@ -8,7 +8,18 @@ This script provides a simple interface to:
 
 Usage:
     python run.py --train  # Train the model
+    python run.py --train --search  # Tune hyperparameters with successive halving
+    python run.py --train --incremental  # Train only on tickets added since the last run
+    python run.py --train --calibrate-triage  # Tune which tickets can skip the LLM
+    python run.py --train --dedup 0.8  # Collapse near-duplicate tickets before training
+    python run.py --train --token-store  # Build the TF-IDF features from the tokenized corpus store
     python run.py --predict "I need help with my bill"  # Make a prediction
+    python run.py --predict "I need help with my bill" --classify-only  # Category only, no LLM calls
+    python run.py --serve --port 8000  # Serve predictions over HTTP with micro-batching
+    python run.py --predict "I need help with my bill" --triage  # Skip the LLM for confident, routine tickets
+    python run.py --enrich --workers 16  # Summarize every ticket in the dataset; resumes after a crash
+    python run.py --predict-file tickets.csv --output predictions.csv  # Classify every row on all cores
+    python run.py --predict "I need help with my bill" --profile profile.folded  # Write flame-graph stacks
 """
 
 import os
@@ -16,8 +27,13 @@ import sys
 import argparse
 import subprocess
 
-def check_environment():
-    """Check if the environment is correctly set up."""
+def check_environment(full=True):
+    """
+    Check if the environment is correctly set up.
+
+    With full=False only NumPy is checked, which is all classification from the
+    exported linear artifact needs; importing the rest would add seconds to startup.
+    """
     try:
         import numpy as np
         numpy_version = np.__version__
@@ -28,9 +44,10 @@ def check_environment():
             print("Please follow the instructions in ENVIRONMENT_SETUP.md to fix this")
             return False
         
-        import pandas
-        import sklearn
-        import dill
+        if full:
+            import pandas
+            import sklearn
+            import dill
         print("✅ Environment looks good!")
         return True
     except ImportError as e:
@@ -38,19 +55,38 @@ def check_environment():
         print("Please follow the instructions in ENVIRONMENT_SETUP.md to fix this")
         return False
 
-def train_model():
+def train_model(search=False, incremental=False, calibrate_triage=False, dedup=None, token_store=False):
     """Train the customer support agent model."""
     if not check_environment():
         return
     
     print("\n🔄 Training model...")
     script_path = os.path.join("src", "pipelines", "train_pipeline.py")
-    subprocess.run([sys.executable, script_path])
+    command = [sys.executable, script_path]
+    if search:
+        command.append("--search")
+    if incremental:
+        command.append("--incremental")
+    if calibrate_triage:
+        command.append("--calibrate-triage")
+    if dedup is not None:
+        command += ["--dedup", str(dedup)]
+    if token_store:
+        command.append("--token-store")
+    subprocess.run(command)
     print("✅ Training complete!")
 
-def make_prediction(text):
-    """Make a prediction using the trained model."""
-    if not check_environment():
+def load_triage_policy():
+    """The calibrated triage policy from saved_models/, or the default thresholds."""
+    from src.components.triage_policy import TriagePolicy
+    return TriagePolicy.load()
+
+def make_prediction(text, enrich=True, triage=False):
+    """
+    Make a prediction using the trained model; enrich=False skips the LLM summary and
+    entities, triage=True skips them only for confident, non-urgent tickets.
+    """
+    if not check_environment(full=enrich):
         return
     
     try:
@@ -58,30 +94,135 @@ def make_prediction(text):
         sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
         from src.pipelines.prediction_pipeline import PredictionPipeline
         
-        pipeline = PredictionPipeline()
+        pipeline = PredictionPipeline(triage_policy=load_triage_policy() if triage else None)
+        if not enrich:
+            result = pipeline.predict_batch([text])[0]
+            print("\n✨ Prediction Result:")
+            print(f"Category: {result['category']}")
+            if result['confidence'] is not None:
+                print(f"Confidence: {result['confidence']:.3f}")
+            return
+
         result = pipeline.predict(text)
         
         print("\n✨ Prediction Result:")
         print(f"Category: {result['category']}")
+        print(f"Tier: {result['tier']}")
         print(f"Summary: {result['summary']}")
         print(f"Entities: {result['entities']}")
     except Exception as e:
         print(f"❌ Prediction failed: {e}")
 
+def serve(host, port, max_batch_size, max_wait_ms, triage=False):
+    """Run the micro-batching inference server until interrupted."""
+    if not check_environment(full=False):
+        return
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ The server needs uvicorn: pip install uvicorn")
+        return
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from src.pipelines.inference_server import InferenceServer, InferenceServerConfig
+    from src.pipelines.prediction_pipeline import PredictionPipeline
+
+    config = InferenceServerConfig(max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    pipeline = PredictionPipeline(triage_policy=load_triage_policy() if triage else None)
+    print(f"\n🚀 Serving on http://{host}:{port} (POST /predict, GET /healthz, /readyz, /stats)")
+    uvicorn.run(InferenceServer(pipeline, config), host=host, port=port, log_level="warning")
+
+def enrich_dataset(workers, limit=None):
+    """Enrich the processed dataset with LLM summaries and entities, resuming from the last checkpoint."""
+    if not check_environment():
+        return
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from src.pipelines.enrichment_job import EnrichmentJob, EnrichmentJobConfig
+
+    config = EnrichmentJobConfig(workers=workers, limit=limit)
+    print(f"\n🔄 Enriching {config.data_path} into {config.output_path}...")
+    try:
+        result = EnrichmentJob(config).run_enrichment()
+    except Exception as e:
+        print(f"❌ Enrichment failed: {e}")
+        return
+    print(f"✅ Enriched {result['completed']} tickets ({result['failed']} failed, "
+          f"{result['total_completed']} done in total)")
+
+def predict_file(input_path, output_path=None, workers=None, chunk_size=10_000):
+    """Classify every row of a CSV or Parquet file with a pool of worker processes."""
+    if not check_environment(full=False):
+        return
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from src.pipelines.file_prediction import FilePredictionJob, FilePredictionConfig
+
+    config = FilePredictionConfig(input_path=input_path, output_path=output_path, workers=workers,
+                                  chunk_size=chunk_size)
+    print(f"\n🔄 Classifying {input_path}...")
+    try:
+        result = FilePredictionJob(config).run()
+    except Exception as e:
+        print(f"❌ File prediction failed: {e}")
+        return
+    print(f"✅ Classified {result['rows']} rows in {result['elapsed_seconds']:.1f} s "
+          f"({result['rows_per_second']:.0f} rows/s, {result['workers']} workers) into {result['output_path']}")
+
 def main():
     """Main function to parse arguments and run the appropriate function."""
     parser = argparse.ArgumentParser(description="Customer Support Agent CLI")
     parser.add_argument("--train", action="store_true", help="Train the model")
+    parser.add_argument("--search", action="store_true", help="With --train, run a hyperparameter search")
+    parser.add_argument("--incremental", action="store_true", help="With --train, train out of core and resume from the last checkpoint")
+    parser.add_argument("--calibrate-triage", action="store_true", help="With --train, tune the LLM triage threshold")
+    parser.add_argument("--dedup", type=float, nargs="?", const=0.8, metavar="THRESHOLD",
+                        help="With --train, drop near-duplicate tickets (MinHash Jaccard >= THRESHOLD, default 0.8)")
+    parser.add_argument("--token-store", action="store_true",
+                        help="With --train, build the TF-IDF features from data/token_store (tokenized once per dataset)")
     parser.add_argument("--predict", type=str, help="Text to predict")
+    parser.add_argument("--classify-only", action="store_true", help="With --predict, only classify (no LLM calls)")
+    parser.add_argument("--triage", action="store_true", help="With --predict/--serve, skip the LLM for confident, routine tickets")
+    parser.add_argument("--serve", action="store_true", help="Run the HTTP inference server")
+    parser.add_argument("--host", default="127.0.0.1", help="With --serve, address to bind")
+    parser.add_argument("--port", type=int, default=8000, help="With --serve, port to bind")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="With --serve, largest micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="With --serve, longest wait to fill a micro-batch")
+    parser.add_argument("--enrich", action="store_true", help="Enrich the whole dataset with LLM summaries and entities")
+    parser.add_argument("--predict-file", metavar="PATH", help="Classify every row of a CSV or Parquet file (no LLM calls)")
+    parser.add_argument("--output", help="With --predict-file, output .csv or .parquet (default: <input>.predictions.csv)")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="With --predict-file, rows per worker task")
+    parser.add_argument("--workers", type=int, help="With --enrich, tickets enriched concurrently (default 16); "
+                                                    "with --predict-file, worker processes (default: one per core)")
+    parser.add_argument("--limit", type=int, help="With --enrich, stop after this many tickets")
+    parser.add_argument("--profile", metavar="PATH", help="Sample the command's stacks and write them to PATH as folded stacks (for flame graphs)")
     
     args = parser.parse_args()
-    
-    if args.train:
-        train_model()
-    elif args.predict:
-        make_prediction(args.predict)
-    else:
-        parser.print_help()
+
+    profiler = None
+    if args.profile:
+        from metrics import SamplingProfiler
+        profiler = SamplingProfiler(args.profile).start()
+
+    try:
+        if args.train:
+            train_model(search=args.search, incremental=args.incremental, calibrate_triage=args.calibrate_triage,
+                        dedup=args.dedup, token_store=args.token_store)
+        elif args.predict:
+            make_prediction(args.predict, enrich=not args.classify_only, triage=args.triage)
+        elif args.serve:
+            serve(args.host, args.port, args.max_batch_size, args.max_wait_ms, triage=args.triage)
+        elif args.enrich:
+            enrich_dataset(args.workers or 16, limit=args.limit)
+        elif args.predict_file:
+            predict_file(args.predict_file, args.output, workers=args.workers, chunk_size=args.chunk_size)
+        else:
+            parser.print_help()
+    finally:
+        if profiler is not None:
+            print(f"📈 Profile written to {profiler.stop()} ({sum(profiler.samples.values())} samples); "
+                  "render it with flamegraph.pl or speedscope")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
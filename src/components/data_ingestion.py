@@ -0,0 +1,118 @@
+import os
+import sys
+from dataclasses import dataclass
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+from src.components.keyword_labeler import KeywordLabeler
+
+
+@dataclass
+class DataIngestionConfig:
+    """Configuration class for data ingestion."""
+    raw_data_path: str = os.path.join('data', 'twcs', 'twcs.csv')
+    processed_data_path: str = os.path.join('data', 'processed_tickets.parquet')
+    chunksize: int = 100_000
+    label_categories: bool = True
+
+
+class DataIngestion:
+    """
+    Streams the raw TWCS CSV into the processed tickets dataset.
+
+    The CSV is read in chunks with only the needed columns and explicit dtypes.
+    Each chunk is filtered to inbound (customer) tweets, cleaned, weak-labeled with
+    a KeywordLabeler (unless disabled in the config) and appended to a Parquet file
+    as its own row group, so memory use depends on the chunk size and not on the
+    size of the input.
+    """
+
+    RAW_DTYPES = {
+        'tweet_id': 'int64',
+        'author_id': 'string',
+        'inbound': 'boolean',
+        'text': 'string',
+    }
+
+    def __init__(self, config: DataIngestionConfig = None, labeler: KeywordLabeler = None):
+        self.ingestion_config = config or DataIngestionConfig()
+        self.labeler = None
+        if self.ingestion_config.label_categories:
+            self.labeler = labeler or KeywordLabeler()
+
+    def output_schema(self) -> pa.Schema:
+        fields = [
+            ('tweet_id', pa.int64()),
+            ('author_id', pa.string()),
+            ('text', pa.string()),
+        ]
+        if self.labeler is not None:
+            fields.append(('category', pa.string()))
+        return pa.schema(fields)
+
+    def clean_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Keep inbound tweets with non-empty text, with the text whitespace-normalized."""
+        chunk = chunk[chunk['inbound'].fillna(False)]
+        text = chunk['text'].str.replace(r'\s+', ' ', regex=True).str.strip()
+        keep = text.notna() & (text.str.len() > 0)
+        return pd.DataFrame({
+            'tweet_id': chunk['tweet_id'][keep],
+            'author_id': chunk['author_id'][keep],
+            'text': text[keep],
+        })
+
+    def initiate_data_ingestion(self):
+        """
+        Run the ingestion.
+
+        Returns:
+            str: Path to the processed Parquet dataset.
+        """
+        try:
+            config = self.ingestion_config
+            logger.info(f"Starting data ingestion from {config.raw_data_path} (chunksize={config.chunksize})")
+
+            os.makedirs(os.path.dirname(config.processed_data_path) or '.', exist_ok=True)
+            # Write next to the target and swap it in at the end, so a failed run
+            # never leaves a half-written dataset behind.
+            tmp_path = config.processed_data_path + '.tmp'
+            schema = self.output_schema()
+
+            rows_read = 0
+            rows_written = 0
+            reader = pd.read_csv(
+                config.raw_data_path,
+                usecols=list(self.RAW_DTYPES),
+                dtype=self.RAW_DTYPES,
+                chunksize=config.chunksize,
+            )
+            with pq.ParquetWriter(tmp_path, schema) as writer:
+                for chunk in reader:
+                    rows_read += len(chunk)
+                    cleaned = self.clean_chunk(chunk)
+                    if self.labeler is not None:
+                        cleaned['category'] = self.labeler.label(cleaned['text'])
+                    if len(cleaned):
+                        writer.write_table(pa.Table.from_pandas(cleaned, schema=schema, preserve_index=False))
+                        rows_written += len(cleaned)
+                    logger.info(f"Ingested {rows_read} rows, kept {rows_written} inbound tickets")
+
+            os.replace(tmp_path, config.processed_data_path)
+            logger.info(f"Data ingestion completed: {config.processed_data_path} ({rows_written} tickets)")
+            return config.processed_data_path
+
+        except Exception as e:
+            logger.error(f"Error in data ingestion: {e}")
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    DataIngestion().initiate_data_ingestion()
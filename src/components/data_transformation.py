@@ -2,7 +2,7 @@ import sys
 import os
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, TfidfTransformer
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 
@@ -13,10 +13,17 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from logger import logger
 from exception import CustomException
 from utils import save_object
+from src.components.near_duplicates import NearDuplicateDetector
+from src.components.token_store import TokenStore, TOKEN_PATTERN
 
 class DataTransformation:
-    def __init__(self):
+    def __init__(self, near_duplicates: NearDuplicateDetector = None, token_store: TokenStore = None):
         self.preprocessor_obj_file_path = os.path.join('saved_models', 'preprocessor.pkl')
+        # When set, near-duplicate tickets are collapsed in the training split.
+        self.near_duplicates = near_duplicates
+        # When set (and holding the dataframe's text row for row), the TF-IDF matrices are
+        # built from its token ids instead of tokenizing the text again.
+        self.token_store = token_store
 
     def get_data_transformer_object(self):
         """
@@ -32,11 +39,14 @@ class DataTransformation:
             ])
 
            
+            # Keep the output sparse regardless of density, and drop any other columns so
+            # nothing non-numeric gets mixed into the feature matrix.
             preprocessor = ColumnTransformer(
                 transformers=[
                     ('text_processing', text_pipeline, 'text')
                 ],
-                remainder='passthrough'  )
+                remainder='drop',
+                sparse_threshold=1.0)
             
             logger.info("Data transformer object created successfully")
             return preprocessor
@@ -45,6 +55,101 @@ class DataTransformation:
             logger.error("Failed to create data transformer object")
             raise CustomException(e, sys)
 
+    def split_data(self, df, target_column_name):
+        """
+        Split the raw dataframe into train and test sets without transforming it.
+
+        Returns:
+            tuple: (X_train, X_test, y_train, y_test) with the X as DataFrames of the
+                   raw feature columns and the y as 1-D NumPy label arrays.
+        """
+        try:
+            X = df.drop(columns=[target_column_name])
+            y = df[target_column_name]
+
+            logger.info("Performing train-test split")
+            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+            assert X_train.shape[0] == y_train.shape[0], "Mismatch in training data samples after split!"
+            assert X_test.shape[0] == y_test.shape[0], "Mismatch in testing data samples after split!"
+            logger.info("Train-test split completed and shapes verified.")
+
+            return X_train, X_test, y_train.to_numpy(), y_test.to_numpy()
+
+        except Exception as e:
+            logger.error(f"Error while splitting data: {e}")
+            raise CustomException(e, sys)
+
+    def drop_near_duplicates(self, X_train, y_train):
+        """
+        Keep only the first ticket of every near-duplicate cluster in the training split.
+        The test split is left as it is, so scores stay comparable with and without it.
+        """
+        if self.near_duplicates is None:
+            return X_train, y_train
+        try:
+            keep = self.near_duplicates.first_of_cluster(X_train['text'])
+            logger.info(f"Dropped {int((~keep).sum())} near-duplicate training tickets, {int(keep.sum())} left")
+            return X_train[keep], y_train[keep]
+
+        except Exception as e:
+            logger.error(f"Error while dropping near-duplicates: {e}")
+            raise CustomException(e, sys)
+
+    def _can_use_token_store(self, df, vectorizer):
+        if self.token_store is None:
+            return False
+        # Store row i must be dataframe row i, so split indices are store rows.
+        aligned = (isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1
+                   and len(df) == self.token_store.rows)
+        supported = (vectorizer.analyzer == 'word' and vectorizer.tokenizer is None and vectorizer.preprocessor is None
+                     and vectorizer.strip_accents is None and vectorizer.lowercase and vectorizer.vocabulary is None
+                     and vectorizer.token_pattern == TOKEN_PATTERN)
+        if not (aligned and supported):
+            logger.info("Token store not used: it does not match the data or the vectorizer settings")
+        return aligned and supported
+
+    def transform_from_token_store(self, preprocessing_obj, X_train, X_test):
+        """
+        Build the train/test TF-IDF matrices from the token store, which holds the text
+        already tokenized, and fit `preprocessing_obj` to match them.
+
+        The terms are selected and counted from the store's token ids and weighted with
+        a TfidfTransformer, so no text is tokenized. The preprocessor still has to turn
+        raw text into the same features when serving: its vectorizer is given the
+        selected terms as a fixed vocabulary, fitted on a single row, and then given the
+        idf weights learned from the store's counts.
+
+        Returns:
+            tuple: (X_train, X_test) as CSR matrices.
+        """
+        try:
+            tfidf = preprocessing_obj.transformers[0][1].named_steps['tfidf']
+            train_counts, features = self.token_store.count_matrix(
+                X_train.index.to_numpy(), ngram_range=tfidf.ngram_range, stop_words=tfidf.stop_words,
+                min_df=tfidf.min_df, max_df=tfidf.max_df, max_features=tfidf.max_features, binary=tfidf.binary
+            )
+            test_counts, _ = self.token_store.count_matrix(
+                X_test.index.to_numpy(), ngram_range=tfidf.ngram_range, stop_words=tfidf.stop_words,
+                binary=tfidf.binary, features=features
+            )
+            logger.info(f"Selected {len(features)} terms from the token store")
+
+            weighting = TfidfTransformer(norm=tfidf.norm, use_idf=tfidf.use_idf, smooth_idf=tfidf.smooth_idf,
+                                         sublinear_tf=tfidf.sublinear_tf)
+            X_train_processed = weighting.fit_transform(train_counts.astype(tfidf.dtype)).tocsr()
+            X_test_processed = weighting.transform(test_counts.astype(tfidf.dtype)).tocsr()
+
+            tfidf.set_params(vocabulary=features.vocabulary())
+            preprocessing_obj.fit(X_train.iloc[:1])
+            if tfidf.use_idf:
+                preprocessing_obj.named_transformers_['text_processing'].named_steps['tfidf'].idf_ = weighting.idf_
+            return X_train_processed, X_test_processed
+
+        except Exception as e:
+            logger.error(f"Error while building features from the token store: {e}")
+            raise CustomException(e, sys)
+
     def initiate_data_transformation(self, df, target_column_name):
         """
         This method handles the data transformation, including splitting the data,
@@ -55,30 +160,26 @@ class DataTransformation:
             target_column_name (str): The name of the target variable column.
         
         Returns:
-            tuple: A tuple containing processed train/test feature arrays (X),
-                   train/test target arrays (y), and the path to the saved preprocessor.
+            tuple: (X_train, y_train, X_test, y_test, preprocessor_path) where the X are
+                   scipy CSR matrices and the y are 1-D NumPy label arrays.
         """
         try:
             logger.info("Data transformation initiated")
-            
-          
-            X = df.drop(columns=[target_column_name], axis=1)
-            y = df[target_column_name]
 
-            logger.info("Performing train-test split")
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-       
-            assert X_train.shape[0] == y_train.shape[0], "Mismatch in training data samples after split!"
-            assert X_test.shape[0] == y_test.shape[0], "Mismatch in testing data samples after split!"
-            logger.info("Train-test split completed and shapes verified.")
+            X_train, X_test, y_train, y_test = self.split_data(df, target_column_name)
+            X_train, y_train = self.drop_near_duplicates(X_train, y_train)
 
             preprocessing_obj = self.get_data_transformer_object()
 
-            logger.info("Fitting preprocessing object on training data")
-            X_train_processed = preprocessing_obj.fit_transform(X_train)
-            
-            logger.info("Transforming test data")
-            X_test_processed = preprocessing_obj.transform(X_test)
+            if self._can_use_token_store(df, preprocessing_obj.transformers[0][1].named_steps['tfidf']):
+                logger.info("Fitting preprocessing object on the token store")
+                X_train_processed, X_test_processed = self.transform_from_token_store(preprocessing_obj, X_train, X_test)
+            else:
+                logger.info("Fitting preprocessing object on training data")
+                X_train_processed = preprocessing_obj.fit_transform(X_train).tocsr()
+
+                logger.info("Transforming test data")
+                X_test_processed = preprocessing_obj.transform(X_test).tocsr()
 
             save_object(
                 file_path=self.preprocessor_obj_file_path,
@@ -0,0 +1,326 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+import mlflow
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import PassiveAggressiveClassifier, SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+from utils import save_object, load_object, file_sha256
+from src.components.data_ingestion import DataIngestionConfig
+
+# Estimators that support partial_fit, keyed by the name used in the config.
+INCREMENTAL_CLASSIFIERS = {
+    "sgd": lambda: SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42),
+    "nb": lambda: MultinomialNB(alpha=0.1),
+    "pa": lambda: PassiveAggressiveClassifier(C=0.1, random_state=42),
+}
+
+# Rows before the resume offset that are hashed to recognize the dataset a checkpoint was trained on.
+FINGERPRINT_ROWS = 1000
+
+
+@dataclass
+class IncrementalTrainerConfig:
+    """Configuration class for incremental (out-of-core) training."""
+    data_path: str = DataIngestionConfig().processed_data_path
+    # The serving pickles, replaced only when a run finishes.
+    trained_model_file_path: str = os.path.join("saved_models", "model.pkl")
+    preprocessor_file_path: str = os.path.join("saved_models", "preprocessor.pkl")
+    # Model, preprocessor and progress marker written at every checkpoint, and resumed from.
+    checkpoint_dir: str = os.path.join("saved_models", "incremental")
+    classifier: str = "sgd"
+    batch_size: int = 50_000
+    # Batches between checkpoints; the final state is always saved.
+    checkpoint_every: int = 10
+    n_features: int = 2 ** 18
+    # Labels the model can predict. None reads them from the dataset (or the saved model on resume).
+    classes: Optional[List[str]] = field(default=None)
+    resume: bool = True
+
+
+class IncrementalTrainer:
+    """
+    Trains the ticket classifier out of core, one Parquet batch at a time.
+
+    Features come from a HashingVectorizer, which has no vocabulary to fit, so the
+    preprocessor never has to see the whole corpus and stays valid as new tickets
+    arrive. Batches are read from disk and fed to the classifier's `partial_fit`,
+    so memory depends on the batch size and not on the size of the dataset.
+
+    Every `checkpoint_every` batches the model, the preprocessor and the number of
+    dataset rows consumed so far are written to `checkpoint_dir`; the serving
+    pickles are replaced by the checkpoint only once the run finishes, so a crash
+    never leaves a half-trained model in production. A later run resumes from the
+    checkpoint and only trains on rows past its offset, which assumes the dataset
+    only grows by appending (as re-ingesting a growing TWCS export does). The
+    state records a hash of the rows just before the offset, and the run starts
+    from scratch if the dataset no longer begins with them, as well as the sha256
+    of both pickles.
+
+    Quality is tracked by progressive validation: each batch is scored by the
+    current model before it is trained on.
+    """
+
+    def __init__(self, config: IncrementalTrainerConfig = None):
+        self.config = config or IncrementalTrainerConfig()
+        if self.config.classifier not in INCREMENTAL_CLASSIFIERS:
+            raise CustomException(
+                f"Unknown classifier {self.config.classifier!r}; "
+                f"choose one of {sorted(INCREMENTAL_CLASSIFIERS)}", sys
+            )
+
+    def get_data_transformer_object(self) -> ColumnTransformer:
+        """Stateless text features; non-negative so MultinomialNB can use them too."""
+        return ColumnTransformer(
+            transformers=[
+                ('text_processing', HashingVectorizer(
+                    n_features=self.config.n_features,
+                    stop_words='english',
+                    alternate_sign=False,
+                    norm='l2',
+                ), 'text')
+            ],
+            remainder='drop',
+            sparse_threshold=1.0)
+
+    def _checkpoint_path(self, name: str) -> str:
+        return os.path.join(self.config.checkpoint_dir, name)
+
+    def load_state(self) -> Optional[dict]:
+        """The last checkpoint, or None when there is nothing compatible to resume from."""
+        config = self.config
+        paths = [self._checkpoint_path(name) for name in ("state.json", "model.pkl", "preprocessor.pkl")]
+        if not config.resume or not all(os.path.exists(path) for path in paths):
+            return None
+        with open(self._checkpoint_path("state.json")) as file_obj:
+            state = json.load(file_obj)
+        if state.get("classifier") != config.classifier or state.get("n_features") != config.n_features:
+            logger.info(
+                f"Checkpoint was trained with {state.get('classifier')}/{state.get('n_features')} features, "
+                f"not {config.classifier}/{config.n_features}; starting from scratch"
+            )
+            return None
+        # The state only describes the pickles it was saved with.
+        if (state.get("model_sha256") != file_sha256(self._checkpoint_path("model.pkl"))
+                or state.get("preprocessor_sha256") != file_sha256(self._checkpoint_path("preprocessor.pkl"))):
+            logger.info("Checkpointed model or preprocessor does not match its state; starting from scratch")
+            return None
+        # The offset only means something if the dataset still starts with the rows it covers.
+        if state.get("data_fingerprint") != self.dataset_fingerprint(state["rows_consumed"]):
+            logger.info(f"Dataset does not start with the {state['rows_consumed']} rows checkpointed; "
+                        "starting from scratch")
+            return None
+        return state
+
+    def dataset_fingerprint(self, end_row: int) -> Optional[str]:
+        """sha256 of the text of the FINGERPRINT_ROWS rows before `end_row`, or None if the dataset is shorter."""
+        remaining = min(end_row, FINGERPRINT_ROWS)
+        digest = hashlib.sha256()
+        for batch in self._record_batches(end_row - remaining, ['text']):
+            for text in batch.column(0).to_pylist()[:remaining]:
+                digest.update((text or "").encode("utf-8") + b"\x00")
+            remaining -= min(remaining, batch.num_rows)
+            if remaining == 0:
+                break
+        return digest.hexdigest() if remaining == 0 else None
+
+    def dataset_classes(self) -> List[str]:
+        """All labels in the dataset, read one column batch at a time."""
+        parquet_file = pq.ParquetFile(self.config.data_path)
+        classes = set()
+        for batch in parquet_file.iter_batches(batch_size=self.config.batch_size, columns=['category']):
+            classes.update(batch.column('category').unique().to_pylist())
+        classes.discard(None)
+        return sorted(classes)
+
+    def _record_batches(self, start_row: int, columns: List[str]):
+        """Stream `columns` of the dataset from row `start_row` on, as pyarrow record batches."""
+        parquet_file = pq.ParquetFile(self.config.data_path)
+        metadata = parquet_file.metadata
+
+        # Skip whole row groups before the offset without reading them.
+        first_group, skip = 0, start_row
+        while first_group < metadata.num_row_groups and skip >= metadata.row_group(first_group).num_rows:
+            skip -= metadata.row_group(first_group).num_rows
+            first_group += 1
+        if first_group == metadata.num_row_groups:
+            return
+
+        batches = parquet_file.iter_batches(
+            batch_size=self.config.batch_size,
+            row_groups=list(range(first_group, metadata.num_row_groups)),
+            columns=columns,
+        )
+        for batch in batches:
+            if skip:
+                dropped = min(skip, batch.num_rows)
+                batch, skip = batch.slice(dropped), skip - dropped
+            if batch.num_rows:
+                yield batch
+
+    def iter_batches(self, start_row: int = 0):
+        """
+        Stream the dataset from row `start_row` on.
+
+        Yields:
+            tuple: (rows read, DataFrame with the 'text' column, label array); rows
+                   with missing text or label are read but not yielded for training.
+        """
+        for batch in self._record_batches(start_row, ['text', 'category']):
+            frame = batch.to_pandas()
+            keep = frame['text'].notna() & frame['category'].notna()
+            yield batch.num_rows, frame.loc[keep, ['text']], frame.loc[keep, 'category'].to_numpy()
+
+    def save_checkpoint(self, model, preprocessor, state: dict):
+        """Write model, preprocessor and state to the checkpoint directory, each swapped in atomically."""
+        model_path, preprocessor_path = self._checkpoint_path("model.pkl"), self._checkpoint_path("preprocessor.pkl")
+        for path, obj in ((preprocessor_path, preprocessor), (model_path, model)):
+            save_object(path + '.tmp', obj)
+            os.replace(path + '.tmp', path)
+        # The state goes last: if a run dies before this, the next run repeats the rows
+        # since the previous checkpoint rather than skipping any.
+        state = dict(state, model_sha256=file_sha256(model_path), preprocessor_sha256=file_sha256(preprocessor_path),
+                     data_fingerprint=self.dataset_fingerprint(state["rows_consumed"]))
+        state_path = self._checkpoint_path("state.json")
+        with open(state_path + '.tmp', 'w') as file_obj:
+            json.dump(state, file_obj, indent=2)
+        os.replace(state_path + '.tmp', state_path)
+        logger.info(f"Checkpoint saved at {state['rows_consumed']} rows")
+
+    def promote_checkpoint(self):
+        """Copy the checkpointed preprocessor and model over the serving ones, each swapped in atomically."""
+        config = self.config
+        for name, path in (("preprocessor.pkl", config.preprocessor_file_path), ("model.pkl", config.trained_model_file_path)):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            shutil.copyfile(self._checkpoint_path(name), path + '.tmp')
+            os.replace(path + '.tmp', path)
+        logger.info(f"Checkpoint promoted to {config.trained_model_file_path}")
+
+    @staticmethod
+    def weighted_f1(confusion: np.ndarray) -> float:
+        """Support-weighted F1 from a confusion matrix (rows = true, columns = predicted)."""
+        true_positives = np.diag(confusion).astype(float)
+        support = confusion.sum(axis=1)
+        predicted = confusion.sum(axis=0)
+        denominator = support + predicted
+        f1 = np.divide(2 * true_positives, denominator, out=np.zeros_like(true_positives), where=denominator > 0)
+        return float((f1 * support).sum() / support.sum()) if support.sum() else 0.0
+
+    def initiate_incremental_training(self):
+        """
+        Train on every dataset row not covered by the last checkpoint.
+
+        Returns:
+            dict: Rows consumed and trained in this run, progressive-validation
+                  accuracy/F1 over this run, elapsed time and the saved paths.
+        """
+        try:
+            config = self.config
+            state = self.load_state()
+            if state is not None:
+                model = load_object(self._checkpoint_path("model.pkl"))
+                preprocessor = load_object(self._checkpoint_path("preprocessor.pkl"))
+                classes = np.asarray(state["classes"], dtype=object)
+                start_row = state["rows_consumed"]
+                logger.info(f"Resuming incremental training from row {start_row}")
+            else:
+                model = INCREMENTAL_CLASSIFIERS[config.classifier]()
+                preprocessor = self.get_data_transformer_object()
+                # Fitting a HashingVectorizer learns nothing; this only lets the ColumnTransformer transform.
+                preprocessor.fit(pd.DataFrame({'text': ['']}))
+                classes = np.asarray(config.classes or self.dataset_classes(), dtype=object)
+                start_row = 0
+                logger.info(f"Starting incremental training of {config.classifier} over classes {list(classes)}")
+
+            confusion = np.zeros((len(classes), len(classes)), dtype=np.int64)
+            rows_consumed, rows_trained, batches = start_row, 0, 0
+            start = time.perf_counter()
+
+            for rows_read, X_batch, y_batch in self.iter_batches(start_row):
+                if len(y_batch):
+                    y_codes = pd.Categorical(y_batch, categories=classes).codes
+                    if (y_codes < 0).any():
+                        unknown = sorted(set(y_batch[y_codes < 0]))
+                        raise ValueError(
+                            f"Labels {unknown} are not among the model's classes; "
+                            "retrain from scratch with resume=False to add categories"
+                        )
+                    X_transformed = preprocessor.transform(X_batch)
+                    if hasattr(model, "classes_"):
+                        predicted_codes = pd.Categorical(model.predict(X_transformed), categories=classes).codes
+                        np.add.at(confusion, (y_codes, predicted_codes), 1)
+                    model.partial_fit(X_transformed, y_batch, classes=classes)
+                    rows_trained += len(y_batch)
+
+                rows_consumed += rows_read
+                batches += 1
+                logger.info(f"Trained on {rows_trained} rows ({rows_consumed} consumed)")
+                if batches % config.checkpoint_every == 0:
+                    self.save_checkpoint(model, preprocessor, self._state(classes, rows_consumed))
+
+            elapsed = time.perf_counter() - start
+            if rows_trained == 0 and state is not None:
+                logger.info("No new rows since the last checkpoint")
+            elif hasattr(model, "classes_"):
+                self.save_checkpoint(model, preprocessor, self._state(classes, rows_consumed))
+            if hasattr(model, "classes_"):
+                self.promote_checkpoint()
+
+            scored = int(confusion.sum())
+            result = {
+                "classifier": config.classifier,
+                "rows_consumed": rows_consumed,
+                "rows_trained": rows_trained,
+                "progressive_accuracy": float(np.trace(confusion) / scored) if scored else None,
+                "progressive_f1_score": self.weighted_f1(confusion) if scored else None,
+                "train_seconds": elapsed,
+                "preprocessor_path": config.preprocessor_file_path,
+                "model_path": config.trained_model_file_path,
+            }
+
+            with mlflow.start_run(run_name="incremental_training"):
+                mlflow.log_params({
+                    "classifier": config.classifier,
+                    "n_features": config.n_features,
+                    "batch_size": config.batch_size,
+                    "start_row": start_row,
+                })
+                mlflow.log_metric("rows_trained", rows_trained)
+                mlflow.log_metric("train_seconds", elapsed)
+                if scored:
+                    mlflow.log_metric("progressive_accuracy", result["progressive_accuracy"])
+                    mlflow.log_metric("progressive_f1_score", result["progressive_f1_score"])
+
+            logger.info(f"Incremental training finished: {result}")
+            return result
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _state(self, classes, rows_consumed: int) -> dict:
+        return {
+            "classifier": self.config.classifier,
+            "n_features": self.config.n_features,
+            "classes": [str(label) for label in classes],
+            "rows_consumed": rows_consumed,
+            "data_path": self.config.data_path,
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
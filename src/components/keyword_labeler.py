@@ -0,0 +1,98 @@
+import os
+import re
+import sys
+import json
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+
+# Weak-labeling keywords from the exploration notebook. Dict order is the
+# priority order: a ticket matching several categories gets the first one.
+DEFAULT_KEYWORDS = {
+    'Technical Issue': ['fail', 'error', 'broken', 'not working', 'issue', 'bug', 'slow', 'down', 'crash'],
+    'Billing/Order': ['payment', 'charge', 'order', 'bill', 'refund', 'invoice', 'delivery', 'purchase'],
+    'General Inquiry': ['question', 'how to', 'help', 'info', 'does this', 'support'],
+}
+
+
+class KeywordLabeler:
+    """
+    Assigns a category to each ticket by case-insensitive keyword (substring) matching.
+
+    Each category's keywords are compiled into a single alternation regex and
+    matched against a whole Series at once; categories are then resolved by
+    priority with np.select. The result is identical to the notebook's per-row
+    `assign_category`, but no Python code runs per row.
+
+    There is one pass per category rather than one alternation of every keyword
+    with a named group per category: a single search only reports the leftmost
+    match, which is not the highest-priority category when both match, and
+    lookaheads that would fix that are not supported by pyarrow's regex engine.
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]] = None, priority: List[str] = None,
+                 default_label: str = 'General Inquiry', missing_label: str = 'Uncategorized'):
+        """
+        Args:
+            keywords: Category -> keywords. Defaults to DEFAULT_KEYWORDS.
+            priority: Categories in the order they win ties. Defaults to the dict order.
+            default_label: Label for text that matches no keyword.
+            missing_label: Label for missing or non-string values.
+        """
+        self.keywords = keywords if keywords is not None else DEFAULT_KEYWORDS
+        self.priority = priority if priority is not None else list(self.keywords)
+        unknown = set(self.priority) - set(self.keywords)
+        if unknown:
+            raise ValueError(f"Priority lists categories without keywords: {sorted(unknown)}")
+        self.default_label = default_label
+        self.missing_label = missing_label
+        # Longest keywords first so the alternation never stops at a shorter prefix.
+        self.patterns = {
+            category: '|'.join(re.escape(kw.lower()) for kw in sorted(kws, key=len, reverse=True))
+            for category, kws in self.keywords.items()
+        }
+
+    @classmethod
+    def from_json(cls, file_path: str, **kwargs) -> "KeywordLabeler":
+        """Load a keyword set from a JSON object of category -> keyword list."""
+        try:
+            with open(file_path) as file_obj:
+                keywords = json.load(file_obj)
+            return cls(keywords=keywords, **kwargs)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def label(self, texts: pd.Series) -> pd.Series:
+        """
+        Label a Series (or chunk) of ticket texts.
+
+        Returns:
+            pd.Series: Category per row, aligned with the input index.
+        """
+        try:
+            is_text = texts.notna()
+            if texts.dtype == object and pd.api.types.infer_dtype(texts, skipna=True) != 'string':
+                # Mixed object column: only real strings get labeled, like the notebook did.
+                is_text = texts.map(lambda value: isinstance(value, str)).astype(bool)
+            # Arrow-backed strings run the regex in pyarrow's compute kernels.
+            strings = texts.where(is_text).astype('string[pyarrow]')
+
+            conditions = [
+                strings.str.contains(self.patterns[category], case=False, regex=True).fillna(False).to_numpy(dtype=bool)
+                for category in self.priority
+            ]
+            labels = np.select(conditions, self.priority, default=self.default_label)
+            labels = np.where(is_text.to_numpy(), labels, self.missing_label)
+            return pd.Series(labels, index=texts.index, name='category')
+
+        except Exception as e:
+            logger.error(f"Error while labeling tickets: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,328 @@
+import os
+import re
+import sys
+import json
+import time
+import platform
+from typing import List, Sequence
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+from utils import file_sha256
+
+FORMAT_NAME = "linear-text-classifier"
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+def _unwrap_vectorizer(preprocessor):
+    """Find the CountVectorizer/TfidfVectorizer inside the preprocessor built by DataTransformation."""
+    from sklearn.compose import ColumnTransformer
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.pipeline import Pipeline
+
+    vectorizer = preprocessor
+    if isinstance(vectorizer, ColumnTransformer):
+        fitted = [t for t in vectorizer.transformers_ if t[1] not in ("drop", "passthrough")]
+        if len(fitted) != 1 or fitted[0][2] not in ("text", ["text"]):
+            raise ValueError("Only a ColumnTransformer with a single vectorizer on 'text' can be exported")
+        vectorizer = fitted[0][1]
+    if isinstance(vectorizer, Pipeline):
+        if len(vectorizer.steps) != 1:
+            raise ValueError("Only a single-step text pipeline can be exported")
+        vectorizer = vectorizer.steps[0][1]
+    if not isinstance(vectorizer, CountVectorizer):
+        raise ValueError(f"Unsupported vectorizer: {type(vectorizer).__name__}")
+
+    if vectorizer.analyzer != "word" or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+        raise ValueError("Only the built-in word analyzer can be exported")
+    if vectorizer.strip_accents is not None:
+        raise ValueError("strip_accents is not supported")
+    return vectorizer
+
+
+def _linear_parameters(model):
+    """Coefficients, intercepts and probability mode of a fitted linear classifier."""
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.naive_bayes import MultinomialNB
+
+    if isinstance(model, MultinomialNB):
+        # The joint log-likelihood is linear in the counts; predict_proba is its softmax.
+        return model.feature_log_prob_, model.class_log_prior_, "softmax"
+    if not hasattr(model, "coef_") or not hasattr(model, "intercept_"):
+        raise ValueError(f"Unsupported model: {type(model).__name__}")
+
+    probability = None
+    if isinstance(model, LogisticRegression):
+        multi_class = getattr(model, "multi_class", "auto")
+        # "deprecated" is the newer sklearn default and behaves like "auto".
+        if multi_class in ("auto", "deprecated"):
+            multi_class = "ovr" if model.solver == "liblinear" or len(model.classes_) == 2 else "multinomial"
+        probability = "softmax" if multi_class == "multinomial" and len(model.classes_) > 2 else "ovr"
+    elif isinstance(model, SGDClassifier) and model.loss == "log_loss":
+        probability = "ovr"
+    return model.coef_, model.intercept_, probability
+
+
+def export_linear_artifact(preprocessor, model, out_dir: str, model_path: str = None) -> str:
+    """
+    Write a fitted text vectorizer and linear classifier as a linear artifact directory.
+
+    Supported: a CountVectorizer/TfidfVectorizer with the word analyzer (optionally
+    wrapped in DataTransformation's ColumnTransformer) and LogisticRegression,
+    SGDClassifier, other classifiers with coef_/intercept_, or MultinomialNB.
+    Anything else raises ValueError, and the dill pickles remain the only artifact.
+
+    Each array is swapped in with os.replace and the manifest is written last, so
+    processes that already mapped the previous files keep reading them unchanged.
+
+    `model_path` is the pickle `model` was saved to; its sha256 goes into the
+    manifest so PredictionPipeline uses the artifact only while that pickle is current.
+
+    Returns:
+        str: The artifact directory.
+    """
+    try:
+        from sklearn import __version__ as sklearn_version
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = _unwrap_vectorizer(preprocessor)
+        coef, intercept, probability = _linear_parameters(model)
+
+        # Sorted UTF-8 terms with their column numbers: a binary search replaces the dict.
+        terms = np.array([term.encode("utf-8") for term in vectorizer.vocabulary_], dtype=np.bytes_)
+        columns = np.fromiter(vectorizer.vocabulary_.values(), dtype=np.int32, count=len(terms))
+        order = np.argsort(terms, kind="stable")
+        n_features = len(terms)
+
+        use_idf = isinstance(vectorizer, TfidfVectorizer) and vectorizer.use_idf
+        stop_words = sorted(vectorizer.get_stop_words() or [])
+        arrays = {
+            "vocabulary": terms[order],
+            "columns": columns[order],
+            # Stored feature-major so scoring gathers one contiguous row per token.
+            "coef": np.ascontiguousarray(np.asarray(coef, dtype=np.float64).T),
+            "intercept": np.asarray(intercept, dtype=np.float64).ravel(),
+            "classes": np.asarray(model.classes_),
+            "stop_words": np.array([word.encode("utf-8") for word in stop_words], dtype=np.bytes_),
+        }
+        if use_idf:
+            arrays["idf"] = np.asarray(vectorizer.idf_, dtype=np.float64)
+        if arrays["classes"].dtype == object:
+            arrays["classes"] = arrays["classes"].astype(str)
+        if arrays["coef"].shape[0] != n_features:
+            raise ValueError(f"Model has {arrays['coef'].shape[0]} features, vectorizer has {n_features}")
+
+        os.makedirs(out_dir, exist_ok=True)
+        files = {}
+        for name, array in arrays.items():
+            path = os.path.join(out_dir, f"{name}.npy")
+            with open(path + ".tmp", "wb") as file_obj:
+                np.save(file_obj, array, allow_pickle=False)
+            os.replace(path + ".tmp", path)
+            files[name] = {
+                "file": f"{name}.npy",
+                "sha256": file_sha256(path),
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+            }
+
+        manifest = {
+            "format": FORMAT_NAME,
+            "format_version": FORMAT_VERSION,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "versions": {
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "sklearn": sklearn_version,
+            },
+            "source": {
+                "vectorizer": type(vectorizer).__name__,
+                "model": type(model).__name__,
+                "model_sha256": file_sha256(model_path) if model_path else None,
+            },
+            "vectorizer": {
+                "lowercase": bool(vectorizer.lowercase),
+                "token_pattern": vectorizer.token_pattern,
+                "ngram_range": list(vectorizer.ngram_range),
+                "binary": bool(vectorizer.binary),
+                "sublinear_tf": bool(getattr(vectorizer, "sublinear_tf", False)),
+                "use_idf": bool(use_idf),
+                "norm": getattr(vectorizer, "norm", None),
+            },
+            "model": {"probability": probability, "n_features": n_features, "n_classes": len(arrays["classes"])},
+            "files": files,
+        }
+        manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+        with open(manifest_path + ".tmp", "w") as file_obj:
+            json.dump(manifest, file_obj, indent=2)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+        logger.info(f"Exported linear artifact to {out_dir} ({n_features} features, {len(arrays['classes'])} classes)")
+        return out_dir
+
+    except ValueError:
+        raise
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+class LinearTextClassifier:
+    """
+    A TF-IDF + linear classifier scored with NumPy alone, loaded from a linear artifact.
+
+    The arrays are opened with np.load(mmap_mode='r'), so loading only parses the
+    manifest and maps the files; pages are read on first use and, being clean
+    file-backed pages, are shared by every process on the host that maps the same
+    artifact. Tokenization, n-grams, stop words, TF-IDF weighting and the
+    probability functions reproduce what sklearn does for the exported settings.
+
+    Methods take raw ticket texts, not a feature matrix.
+    """
+
+    def __init__(self, path: str, manifest: dict, arrays: dict):
+        self.path = path
+        self.manifest = manifest
+        settings = manifest["vectorizer"]
+        self.lowercase = settings["lowercase"]
+        self.min_n, self.max_n = settings["ngram_range"]
+        self.binary = settings["binary"]
+        self.sublinear_tf = settings["sublinear_tf"]
+        self.norm = settings["norm"]
+        self.probability = manifest["model"]["probability"]
+        self._token_re = re.compile(settings["token_pattern"])
+
+        self.vocabulary = arrays["vocabulary"]
+        self.columns = arrays["columns"]
+        self.coef = arrays["coef"]
+        self.intercept = arrays["intercept"]
+        self.idf = arrays.get("idf")
+        self.classes_ = np.asarray(arrays["classes"])
+        self.stop_words = frozenset(word.decode("utf-8") for word in arrays["stop_words"])
+
+    @classmethod
+    def load(cls, path: str, verify: bool = True, mmap: bool = True) -> "LinearTextClassifier":
+        """
+        Open a linear artifact directory.
+
+        Args:
+            path (str): Directory written by `export_linear_artifact`.
+            verify (bool): Check every file against the sha256 in the manifest.
+            mmap (bool): Memory-map the arrays instead of reading them into private memory.
+        """
+        try:
+            with open(os.path.join(path, MANIFEST_FILE)) as file_obj:
+                manifest = json.load(file_obj)
+            if manifest.get("format") != FORMAT_NAME or manifest.get("format_version") != FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported artifact format {manifest.get('format')} v{manifest.get('format_version')}"
+                )
+
+            arrays = {}
+            for name, entry in manifest["files"].items():
+                file_path = os.path.join(path, entry["file"])
+                if verify and file_sha256(file_path) != entry["sha256"]:
+                    raise ValueError(f"Checksum mismatch for {file_path}")
+                arrays[name] = np.load(file_path, mmap_mode="r" if mmap else None, allow_pickle=False)
+            return cls(path, manifest, arrays)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def analyze(self, text: str) -> List[str]:
+        """Terms of one document, as the exported vectorizer's analyzer produces them."""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._token_re.findall(text)
+        if self.stop_words:
+            tokens = [token for token in tokens if token not in self.stop_words]
+        if self.max_n == 1:
+            return tokens
+
+        terms = list(tokens) if self.min_n == 1 else []
+        for n in range(max(self.min_n, 2), min(self.max_n, len(tokens)) + 1):
+            terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def transform(self, texts: Sequence[str]):
+        """
+        Sparse TF-IDF rows in coordinate form.
+
+        Returns:
+            tuple: (row, column, value) arrays, sorted by row then column.
+        """
+        terms, lengths = [], np.empty(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            analyzed = self.analyze(text)
+            terms.extend(analyzed)
+            lengths[i] = len(analyzed)
+        if not terms or len(self.vocabulary) == 0:
+            return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float64)
+
+        encoded = np.array([term.encode("utf-8") for term in terms], dtype=np.bytes_)
+        positions = np.searchsorted(self.vocabulary, encoded)
+        positions[positions == len(self.vocabulary)] = 0
+        found = self.vocabulary[positions] == encoded
+
+        n_features = len(self.vocabulary)
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)[found]
+        keys = rows * n_features + self.columns[positions[found]]
+        keys, counts = np.unique(keys, return_counts=True)
+        rows, columns = keys // n_features, keys % n_features
+
+        values = counts.astype(np.float64)
+        if self.binary:
+            values[:] = 1.0
+        elif self.sublinear_tf:
+            values = np.log(values) + 1.0
+        if self.idf is not None:
+            values *= self.idf[columns]
+        if self.norm in ("l1", "l2"):
+            weights = np.abs(values) if self.norm == "l1" else values ** 2
+            norms = np.bincount(rows, weights=weights, minlength=len(texts))
+            if self.norm == "l2":
+                norms = np.sqrt(norms)
+            values /= norms[rows]
+        return rows, columns, values
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        """Per-class scores (a single column for binary models), as sklearn computes them."""
+        rows, columns, values = self.transform(texts)
+        contributions = self.coef[columns] * values[:, None]
+        scores = np.empty((len(texts), self.coef.shape[1]), dtype=np.float64)
+        for k in range(self.coef.shape[1]):
+            scores[:, k] = np.bincount(rows, weights=contributions[:, k], minlength=len(texts))
+        return scores + self.intercept
+
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        scores = self.decision_function(texts)
+        if scores.shape[1] == 1:
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+    @property
+    def predict_proba(self):
+        # Like sklearn's estimators, only expose predict_proba when the model has one,
+        # so hasattr(model, "predict_proba") checks keep working.
+        if self.probability is None:
+            raise AttributeError("The exported model has no predict_proba")
+        return self._predict_proba
+
+    def _predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        scores = self.decision_function(texts)
+        if self.probability == "softmax":
+            scores = scores - scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+            return scores / scores.sum(axis=1, keepdims=True)
+
+        probabilities = 1.0 / (1.0 + np.exp(-scores))
+        if probabilities.shape[1] == 1:
+            return np.hstack([1.0 - probabilities, probabilities])
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
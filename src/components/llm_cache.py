@@ -0,0 +1,233 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+
+_URL_RE = re.compile(r"https?://\S+")
+_USER_MENTION_RE = re.compile(r"@\d+")
+_RETWEET_RE = re.compile(r"^rt\s+@\w+:?\s*")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_ticket_text(text: str) -> str:
+    """
+    Normalize ticket text for cache lookups.
+
+    Lower-cases, drops a leading retweet marker, replaces links and anonymized
+    customer handles (TWCS uses numeric ids such as @105835) with placeholders and
+    collapses whitespace, so retweets and copy-pasted complaints share a key.
+    Brand handles such as @AppleSupport are kept.
+    """
+    text = str(text).lower().strip()
+    text = _RETWEET_RE.sub("", text)
+    text = _URL_RE.sub("<url>", text)
+    text = _USER_MENTION_RE.sub("@user", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def make_cache_key(method: str, text: str, prompt_version: str, model_name: str) -> str:
+    """Cache key for one LLM call: the normalized text plus everything that shapes the answer."""
+    raw = "\x1f".join([method, prompt_version, model_name, normalize_ticket_text(text)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Interface for LLM response caches. Values must be JSON-serializable.
+
+    Subclasses implement `_get` and `_set`; hit and miss counting lives here.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        self._set(key, value)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: Any):
+        raise NotImplementedError
+
+
+class InMemoryLRUCache(LLMCache):
+    """
+    Bounded in-process cache that evicts the least recently used entry.
+
+    Values are stored serialized so callers can't mutate a cached answer in place.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            value = self._entries[key]
+        return json.loads(value)
+
+    def _set(self, key, value):
+        value = json.dumps(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(LLMCache):
+    """
+    On-disk cache in a single SQLite file, shared across runs and processes.
+
+    Entries older than `ttl_seconds` are treated as misses and removed. When the
+    table grows past `max_entries`, the least recently used tenth is evicted.
+    """
+
+    def __init__(self, path: str = os.path.join("cache", "llm_cache.sqlite"),
+                 ttl_seconds: Optional[float] = 7 * 24 * 3600, max_entries: int = 1_000_000):
+        super().__init__()
+        try:
+            self.path = path
+            self.ttl_seconds = ttl_seconds
+            self.max_entries = max_entries
+            dir_path = os.path.dirname(path)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
+
+            self._lock = threading.Lock()
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+            self._conn.commit()
+            self._size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            logger.info(f"Opened LLM cache at {path} with {self._size} entries")
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._size -= 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(value)
+
+    def _set(self, key, value):
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            if cursor.rowcount:
+                self._size += 1
+            else:
+                self._conn.execute(
+                    "UPDATE llm_cache SET value = ?, created_at = ?, accessed_at = ? WHERE key = ?",
+                    (json.dumps(value), now, now, key),
+                )
+            if self._size > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        target = int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN "
+            "(SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+            (self._size - target,),
+        )
+        self._size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache(LLMCache):
+    """An in-memory LRU in front of a persistent cache; disk hits are promoted to memory."""
+
+    def __init__(self, memory: LLMCache, disk: LLMCache):
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    def _get(self, key):
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def _set(self, key, value):
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["memory"] = self.memory.stats()
+        stats["disk"] = self.disk.stats()
+        return stats
+
+
+def build_default_llm_cache() -> TieredCache:
+    """The cache PredictionPipeline uses unless told otherwise: LRU in memory, SQLite on disk."""
+    return TieredCache(InMemoryLRUCache(), SQLiteCache())
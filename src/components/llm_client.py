@@ -0,0 +1,334 @@
+import os
+import sys
+import math
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, asdict
+from typing import Optional, Tuple
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from logger import logger
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors.
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+# Client errors without a status code (no response at all); matched by class name so
+# this module works with any provider SDK without importing it.
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "RateLimitError", "ServiceUnavailableError"}
+
+
+@dataclass
+class LLMClientConfig:
+    """Configuration class for the rate-limited LLM client."""
+    # Provider quotas; None disables that limiter. The defaults are Groq's free-tier
+    # limits for llama-3.3-70b-versatile.
+    requests_per_minute: Optional[float] = 30
+    tokens_per_minute: Optional[float] = 12_000
+    # How much unused quota may pile up, in seconds of quota. Providers enforce their
+    # per-minute limits over short windows, so by default calls are paced evenly.
+    burst_seconds: float = 0.0
+    # Output tokens assumed per call on top of the prompt; the estimate is then
+    # corrected by the usage the responses report.
+    expected_output_tokens: int = 200
+    max_retries: int = 5
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    # Seconds per attempt; None waits as long as the model does.
+    timeout: Optional[float] = 30.0
+    # Share one in-flight call between identical prompts.
+    coalesce: bool = True
+
+
+@dataclass
+class LLMClientStats:
+    """Counters of one LLMClient."""
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    coalesced: int = 0
+    throttled_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate_per_minute`.
+
+    It holds at most `burst_seconds` worth of quota. A call larger than that is
+    let through once the bucket is full and drives the level negative, so later
+    calls wait until the debt is paid back.
+    """
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 0.0):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = self.rate * burst_seconds
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (0 if it can be taken now)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level -= amount
+
+    def adjust(self, amount: float):
+        """Give back (positive) or take (negative) quota after the fact, e.g. once real usage is known."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level = min(self.capacity, self.level + amount)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed call is worth retrying (rate limits, timeouts, connection and server errors)."""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, FutureTimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait (Retry-After header), if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt size in tokens (about four characters per token)."""
+    return math.ceil(len(text) / 4)
+
+
+class LLMClient:
+    """
+    Calls a LangChain chat model within provider rate limits.
+
+    Every call first waits until the requests/min and tokens/min buckets cover one
+    request and its estimated tokens, then takes them; once the response reports
+    its real token usage the estimate is corrected. Retryable errors (429,
+    timeouts, 5xx, dropped connections) are retried with full-jitter exponential
+    backoff, honouring Retry-After. A 429 also pauses every caller of
+    this client until the provider's wait is over, so a burst of rejections does
+    not turn into a storm of retries. Identical prompts already in flight share
+    one call.
+
+    The same instance serves threads (`invoke`) and coroutines (`ainvoke`).
+    """
+
+    # Worker threads that enforce timeouts on synchronous calls.
+    _timeout_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-call")
+
+    def __init__(self, model, config: LLMClientConfig = None):
+        self.model = model
+        self.config = config or LLMClientConfig()
+        self.stats = LLMClientStats()
+        self.request_bucket = None
+        self.token_bucket = None
+        if self.config.requests_per_minute:
+            self.request_bucket = TokenBucket(self.config.requests_per_minute, self.config.burst_seconds)
+        if self.config.tokens_per_minute:
+            self.token_bucket = TokenBucket(self.config.tokens_per_minute, self.config.burst_seconds)
+        self._token_ratio = 1.0
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+        self._gate = threading.Lock()
+        self._agates = {}
+        self._inflight = {}
+        self._ainflight = {}
+
+    def _wait_time(self, estimate: int) -> float:
+        wait = self._cooldown_until - time.monotonic()
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.wait_time(1))
+        if self.token_bucket is not None:
+            wait = max(wait, self.token_bucket.wait_time(estimate))
+        return wait
+
+    def _take(self, estimate: int):
+        if self.request_bucket is not None:
+            self.request_bucket.take(1)
+        if self.token_bucket is not None:
+            self.token_bucket.take(estimate)
+
+    def _throttle(self, estimate: int):
+        """Block until the quotas allow one more call, then take it."""
+        start = time.monotonic()
+        # One caller at a time, re-checking after every sleep: quota given back by
+        # finished calls is used in order and calls can't bunch up behind a wait.
+        with self._gate:
+            while True:
+                wait = self._wait_time(estimate)
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+            self._take(estimate)
+        self.stats.throttled_seconds += time.monotonic() - start
+
+    async def _athrottle(self, estimate: int):
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        # asyncio locks belong to one event loop.
+        gate = self._agates.setdefault(id(loop), asyncio.Lock())
+        async with gate:
+            while True:
+                wait = self._wait_time(estimate)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            self._take(estimate)
+        self.stats.throttled_seconds += time.monotonic() - start
+
+    def _settle(self, message, raw: int, estimate: int):
+        usage = getattr(message, "usage_metadata", None) or {}
+        total = usage.get("total_tokens")
+        if not total:
+            return
+        self._token_ratio = 0.8 * self._token_ratio + 0.2 * total / raw
+        if self.token_bucket is not None:
+            self.token_bucket.adjust(estimate - total)
+
+    def _backoff(self, attempt: int, error: BaseException) -> Optional[float]:
+        """Seconds to sleep before the next attempt, or None to give up and raise."""
+        if isinstance(error, (TimeoutError, asyncio.TimeoutError, FutureTimeoutError)):
+            self.stats.timeouts += 1
+        delay = random.uniform(0, min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt))
+        if getattr(error, "status_code", None) == 429:
+            self.stats.rate_limited += 1
+            wait = retry_after(error)
+            if wait is not None:
+                delay = max(delay, wait)
+                with self._lock:
+                    self._cooldown_until = max(self._cooldown_until, time.monotonic() + wait)
+        if attempt >= self.config.max_retries or not is_retryable(error):
+            return None
+        self.stats.retries += 1
+        logger.warning(f"LLM call failed ({type(error).__name__}: {error}); retry {attempt + 1} in {delay:.2f}s")
+        return delay
+
+    def _call(self, prompt):
+        raw = estimate_tokens(prompt.to_string()) + self.config.expected_output_tokens
+        attempt = 0
+        while True:
+            # Scaled by how far off past estimates were (tokenizer, reply length), so the
+            # quota handed back after the call is small and pacing stays accurate.
+            estimate = math.ceil(raw * self._token_ratio)
+            self._throttle(estimate)
+            self.stats.attempts += 1
+            try:
+                if self.config.timeout is None:
+                    message = self.model.invoke(prompt)
+                else:
+                    # The thread of a timed-out call runs on until the model gives up; give
+                    # the model its own timeout too (ChatGroq's `timeout`) so it does.
+                    message = self._timeout_pool.submit(self.model.invoke, prompt).result(self.config.timeout)
+                self._settle(message, raw, estimate)
+                return message
+            except Exception as e:
+                delay = self._backoff(attempt, e)
+                if delay is None:
+                    self.stats.failures += 1
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    async def _acall(self, prompt):
+        raw = estimate_tokens(prompt.to_string()) + self.config.expected_output_tokens
+        attempt = 0
+        while True:
+            # Scaled by how far off past estimates were (tokenizer, reply length), so the
+            # quota handed back after the call is small and pacing stays accurate.
+            estimate = math.ceil(raw * self._token_ratio)
+            await self._athrottle(estimate)
+            self.stats.attempts += 1
+            try:
+                message = await asyncio.wait_for(self.model.ainvoke(prompt), self.config.timeout)
+                self._settle(message, raw, estimate)
+                return message
+            except Exception as e:
+                delay = self._backoff(attempt, e)
+                if delay is None:
+                    self.stats.failures += 1
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def invoke(self, prompt) -> Tuple[object, bool]:
+        """
+        Call the model with a formatted prompt (a LangChain PromptValue).
+
+        Returns:
+            tuple: (message, coalesced) where coalesced is True when the message came
+                   from an identical call that was already in flight.
+        """
+        self.stats.requests += 1
+        if not self.config.coalesce:
+            return self._call(prompt), False
+
+        key = prompt.to_string()
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            self.stats.coalesced += 1
+            return future.result(), True
+
+        try:
+            future.set_result(self._call(prompt))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return future.result(), False
+
+    async def ainvoke(self, prompt) -> Tuple[object, bool]:
+        """Async variant of `invoke`."""
+        self.stats.requests += 1
+        if not self.config.coalesce:
+            return await self._acall(prompt), False
+
+        # Keyed by loop too: a task can only be awaited from the loop that runs it.
+        key = (id(asyncio.get_running_loop()), prompt.to_string())
+        task = self._ainflight.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.stats.coalesced += 1
+        else:
+            task = self._ainflight[key] = asyncio.ensure_future(self._acall(prompt))
+            task.add_done_callback(lambda done: self._finish(key, done))
+        # Shielded so one cancelled caller doesn't cancel the call for everyone sharing it.
+        return await asyncio.shield(task), coalesced
+
+    def _finish(self, key, task: asyncio.Task):
+        self._ainflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller was cancelled.
+            task.exception()
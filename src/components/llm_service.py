@@ -1,9 +1,18 @@
 import os
 import sys
+import json
+import time
+import asyncio
+import hashlib
+from dataclasses import dataclass, asdict
+from typing import Literal, Optional
 from dotenv import load_dotenv
 from langchain_core.prompts import PromptTemplate, ChatMessagePromptTemplate, ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
+from langchain_core.output_parsers import JsonOutputParser, PydanticOutputParser
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import message_to_dict, messages_from_dict
 from langchain_groq import ChatGroq
+from pydantic import BaseModel, Field
 
 # Add the project root directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
@@ -11,44 +20,337 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 # Import from root directory
 from exception import CustomException
 from logger import logger
+from metrics import metrics
+from src.components.llm_cache import LLMCache, make_cache_key
+from src.components.semantic_cache import SemanticCache
+from src.components.llm_client import LLMClient, LLMClientConfig
+
+metrics.describe("llm_call_seconds", "Seconds per LLM call, including rate-limit waits and retries.")
+metrics.describe("llm_calls_total", "LLM calls made (shared calls counted once, by the caller that made them).")
+metrics.describe("llm_tokens_total", "LLM tokens reported by the provider.")
+metrics.describe("llm_cache_requests_total", "LLM response cache lookups by cache and result.")
+
+SUMMARY_PROMPT = '''you are a customer support assistant. Summarize the following customer support ticket in one sentence:
+            Ticket: {ticket_text}
+            summary:'''
+
+EXTRACT_PROMPT = '''you are a customer support assistant. Extract the following information from the customer support ticket:
+            1. Customer Name
+            2. Issue Type (e.g., billing, technical, account, feedback)
+            3. Urgency Level (low, medium, high)
+            4. Preferred Contact Method (email, phone, chat)
+            Ticket: {ticket_text}
+            Provide the information in JSON format with keys: 'customer_name', 'product_name', 'order_id'.
+            JSON:{format_instructions} '''
+
+ANALYZE_PROMPT = '''you are a customer support assistant. Summarize the following customer support ticket in one sentence and extract its details.
+            Ticket: {ticket_text}
+            Reply with only a JSON object of this shape (use null when a value is not mentioned):
+            {{"summary": "<one sentence>", "entities": {{"customer_name": "<name or null>", "issue_type": "billing|technical|account|feedback", "urgency": "low|medium|high", "contact_method": "email|phone|chat|null"}}}}
+            JSON:'''
+
+# The entities half of ANALYZE_PROMPT, for when its combined answer cannot be parsed.
+ENTITIES_PROMPT = '''you are a customer support assistant. Extract the details of the following customer support ticket.
+            Ticket: {ticket_text}
+            Reply with only a JSON object of this shape (use null when a value is not mentioned):
+            {{"customer_name": "<name or null>", "issue_type": "billing|technical|account|feedback", "urgency": "low|medium|high", "contact_method": "email|phone|chat|null"}}
+            JSON:'''
+
+class TicketEntities(BaseModel):
+    customer_name: Optional[str] = Field(default=None, description="Customer name, if mentioned")
+    issue_type: Literal["billing", "technical", "account", "feedback"] = Field(description="Issue type")
+    urgency: Literal["low", "medium", "high"] = Field(description="Urgency level")
+    contact_method: Optional[Literal["email", "phone", "chat"]] = Field(
+        default=None, description="Preferred contact method, if mentioned"
+    )
+
+
+class TicketAnalysis(BaseModel):
+    summary: str = Field(description="One-sentence summary of the ticket")
+    entities: TicketEntities
+
+
+# Cache keys include a hash of the prompt, so editing a prompt invalidates its entries.
+# The analyze entries also hash the fallback's prompt and the TicketAnalysis schema.
+PROMPT_VERSIONS = {
+    name: hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+    for name, prompt in (
+        ("summary", SUMMARY_PROMPT),
+        ("extract", EXTRACT_PROMPT),
+        ("analyze", ANALYZE_PROMPT + ENTITIES_PROMPT + json.dumps(TicketAnalysis.model_json_schema(), sort_keys=True)),
+    )
+}
+
+@dataclass
+class LLMUsage:
+    """Token and latency counters for one or more LLM calls."""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_seconds: float = 0.0
+
+    def record(self, message, latency_seconds: float):
+        usage = getattr(message, "usage_metadata", None) or {}
+        self.calls += 1
+        self.input_tokens += usage.get("input_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+        self.latency_seconds += latency_seconds
+
+    def add(self, other: "LLMUsage"):
+        self.calls += other.calls
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.latency_seconds += other.latency_seconds
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
 class LLMService:
-    def __init__(self):
+    def __init__(self, model=None, cache: LLMCache = None, semantic_cache: SemanticCache = None,
+                 client_config: LLMClientConfig = None):
+        """
+        Args:
+            model: Any LangChain chat model. Defaults to ChatGroq; pass a local or fake
+                   chat model to run without network access.
+            cache (LLMCache): Optional response cache consulted before every LLM call.
+            semantic_cache (SemanticCache): Optional near-duplicate cache for `analyze_ticket`;
+                                            consulted after an exact-cache miss.
+            client_config (LLMClientConfig): Rate limits, retries, timeouts and request
+                                             coalescing applied to every model call. The
+                                             default rate limits are Groq's, so they only
+                                             apply when `model` is omitted.
+        """
         load_dotenv()
-        self.model  =ChatGroq(api_key=os.getenv("GROQ_API_KEY"),model = "llama-3.3-70b-versatile", max_tokens=1000)
+        if client_config is None:
+            client_config = LLMClientConfig()
+            if model is not None:
+                client_config.requests_per_minute = client_config.tokens_per_minute = None
+        if model is None:
+            # Retries and timeouts are handled by LLMClient; the SDK's own retries would
+            # fire without regard to the shared rate limits.
+            model = ChatGroq(api_key=os.getenv("GROQ_API_KEY"),model = "llama-3.3-70b-versatile", max_tokens=1000,
+                             max_retries=0, timeout=client_config.timeout)
+        self.model = model
+        self.model_name = getattr(model, "model_name", None) or type(model).__name__
+        self.client = LLMClient(model, client_config)
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+        # Running totals across every analyze_ticket call made by this service.
+        self.usage = LLMUsage()
+
+        # Prompts and parsers are built once; each call only formats its ticket.
+        self.summary_prompt = ChatPromptTemplate.from_template(SUMMARY_PROMPT)
+        self.extract_parser = JsonOutputParser()
+        self.extract_prompt = ChatPromptTemplate.from_template(
+            template  =EXTRACT_PROMPT,partial_variables={"format_instructions":self.extract_parser.get_format_instructions()}
+        )
+        # The prompt spells out a compact JSON shape instead of the parser's full JSON
+        # schema, which would cost more input tokens than the second call it replaces.
+        self.analyze_prompt = ChatPromptTemplate.from_template(ANALYZE_PROMPT)
+        self.analyze_parser = PydanticOutputParser(pydantic_object=TicketAnalysis)
+        self.entities_prompt = ChatPromptTemplate.from_template(ENTITIES_PROMPT)
+        self.entities_parser = PydanticOutputParser(pydantic_object=TicketEntities)
+        self.prompts = {"summary": self.summary_prompt, "extract": self.extract_prompt, "analyze": self.analyze_prompt,
+                        "entities": self.entities_prompt}
+
+    def _observe(self, method: str, message, elapsed: float, coalesced: bool, usage: LLMUsage = None):
+        metrics.observe("llm_call_seconds", elapsed, method=method)
+        if coalesced:
+            return
+        tokens = getattr(message, "usage_metadata", None) or {}
+        metrics.inc("llm_calls_total", method=method)
+        metrics.inc("llm_tokens_total", tokens.get("input_tokens", 0), direction="input")
+        metrics.inc("llm_tokens_total", tokens.get("output_tokens", 0), direction="output")
+        if usage is not None:
+            usage.record(message, elapsed)
+
+    def _invoke(self, method: str, ticket_text: str, usage: LLMUsage = None):
+        """Run one prompt ("summary", "extract", "analyze" or "entities") through the client, recording
+        usage and metrics unless the call was shared."""
+        start = time.perf_counter()
+        message, coalesced = self.client.invoke(self.prompts[method].invoke({"ticket_text": ticket_text}))
+        self._observe(method, message, time.perf_counter() - start, coalesced, usage)
+        return message
+
+    async def _ainvoke(self, method: str, ticket_text: str, usage: LLMUsage = None):
+        start = time.perf_counter()
+        message, coalesced = await self.client.ainvoke(self.prompts[method].invoke({"ticket_text": ticket_text}))
+        self._observe(method, message, time.perf_counter() - start, coalesced, usage)
+        return message
+
+    def client_stats(self) -> dict:
+        """Request, retry, rate-limit and coalescing counters of the LLM client."""
+        return self.client.stats.to_dict()
+
+    def _cache_lookup(self, method: str, ticket_text: str):
+        if self.cache is None:
+            return None, None
+        key = make_cache_key(method, ticket_text, PROMPT_VERSIONS[method], self.model_name)
+        cached = self.cache.get(key)
+        metrics.inc("llm_cache_requests_total", cache="exact", result="miss" if cached is None else "hit")
+        return key, cached
+
+    def _cache_store(self, key, value):
+        if key is not None:
+            self.cache.set(key, value)
+
+    def _semantic_lookup(self, ticket_text: str):
+        if self.semantic_cache is None:
+            return None, None
+        vector = self.semantic_cache.embed(ticket_text)
+        payload, _ = self.semantic_cache.search(vector)
+        metrics.inc("llm_cache_requests_total", cache="semantic", result="miss" if payload is None else "hit")
+        if payload is None:
+            return vector, None
+        # Only what a paraphrase shares is reused; who is asking and how to reach them
+        # belong to this ticket.
+        entities = {**payload["entities"], "customer_name": None, "contact_method": None}
+        return vector, {"summary": payload["summary"], "entities": entities}
+
+    def _semantic_store(self, vector, result: dict):
+        if vector is not None:
+            self.semantic_cache.add(vector, {"summary": result["summary"], "entities": dict(result["entities"])})
 
     def get_ticket_summary(self, ticket_text: str):
         try:
-            prompt_template = '''you are a customer support assistant. Summarize the following customer support ticket in one sentence:
-            Ticket: {ticket_text}
-            summary:'''
-            prompt = ChatPromptTemplate.from_template(prompt_template)
-            chain = prompt | self.model
-            response = chain.invoke({"ticket_text": ticket_text})
+            key, cached = self._cache_lookup("summary", ticket_text)
+            if cached is not None:
+                return messages_from_dict([cached])[0]
+            response = self._invoke("summary", ticket_text)
+            self._cache_store(key, message_to_dict(response))
             return response
         except Exception as e:
             logger.error(f"Error occurred while getting ticket summary: {e}")
             raise CustomException(e, sys)
-        
+
     def extract_ticket_info(self, ticket_text:str)->dict:
         try:
-            prompt_template = '''you are a customer support assistant. Extract the following information from the customer support ticket:
-            1. Customer Name
-            2. Issue Type (e.g., billing, technical, account, feedback)
-            3. Urgency Level (low, medium, high)
-            4. Preferred Contact Method (email, phone, chat)
-            Ticket: {ticket_text}
-            Provide the information in JSON format with keys: 'customer_name', 'product_name', 'order_id'.
-            JSON:{format_instructions} '''
-            output_parser = JsonOutputParser()
-            prompt = ChatPromptTemplate.from_template(
-                template  =prompt_template,partial_variables={"format_instructions":output_parser.get_format_instructions()}
-            )
-            chain = prompt|self.model|output_parser
-            response = chain.invoke({
-                "ticket_text": ticket_text
-            })
+            key, cached = self._cache_lookup("extract", ticket_text)
+            if cached is not None:
+                return cached
+            response = self.extract_parser.invoke(self._invoke("extract", ticket_text))
+            self._cache_store(key, response)
+            return response
+        except Exception as e:
+            logger.error(f"Error occurred while extracting ticket info: {e}")
+            raise CustomException(e, sys)
+
+    async def aget_ticket_summary(self, ticket_text: str):
+        """Async variant of `get_ticket_summary`."""
+        try:
+            key, cached = self._cache_lookup("summary", ticket_text)
+            if cached is not None:
+                return messages_from_dict([cached])[0]
+            response = await self._ainvoke("summary", ticket_text)
+            self._cache_store(key, message_to_dict(response))
+            return response
+        except Exception as e:
+            logger.error(f"Error occurred while getting ticket summary: {e}")
+            raise CustomException(e, sys)
+
+    async def aextract_ticket_info(self, ticket_text: str) -> dict:
+        """Async variant of `extract_ticket_info`."""
+        try:
+            key, cached = self._cache_lookup("extract", ticket_text)
+            if cached is not None:
+                return cached
+            response = self.extract_parser.invoke(await self._ainvoke("extract", ticket_text))
+            self._cache_store(key, response)
             return response
         except Exception as e:
             logger.error(f"Error occurred while extracting ticket info: {e}")
             raise CustomException(e, sys)
-        
\ No newline at end of file
+
+    def _analysis_lookup(self, ticket_text: str):
+        """Cache key, semantic-cache vector and, on a hit, the finished result."""
+        usage = {**LLMUsage().to_dict(), "fallback": False}
+        key, cached = self._cache_lookup("analyze", ticket_text)
+        if cached is not None:
+            return key, None, {**cached, "usage": {**usage, "cached": True}}
+        vector, reused = self._semantic_lookup(ticket_text)
+        if reused is not None:
+            return key, vector, {**reused, "usage": {**usage, "cached": "semantic"}}
+        return key, vector, None
+
+    def _parse_analysis(self, message) -> Optional[dict]:
+        try:
+            analysis = self.analyze_parser.parse(message.content)
+            return {"summary": analysis.summary, "entities": analysis.entities.model_dump()}
+        except OutputParserException as e:
+            logger.warning(f"Structured ticket analysis failed to parse, using two-call path: {e}")
+            return None
+
+    def _separate_analysis(self, summary, entities) -> dict:
+        """The two-call path's result; entities is None when its answer does not fit TicketEntities."""
+        try:
+            entities = self.entities_parser.parse(entities.content).model_dump()
+        except OutputParserException as e:
+            logger.warning(f"Extracted entities do not fit TicketEntities: {e}")
+            entities = None
+        return {"summary": summary.content, "entities": entities}
+
+    def _analysis_result(self, key, vector, result: dict, usage: LLMUsage, fallback: bool) -> dict:
+        if result["entities"] is not None:
+            self._cache_store(key, result)
+            self._semantic_store(vector, result)
+        self.usage.add(usage)
+        result["usage"] = {**usage.to_dict(), "fallback": fallback, "cached": False}
+        return result
+
+    def analyze_ticket(self, ticket_text: str) -> dict:
+        """
+        Summarize the ticket and extract its entities with a single structured LLM call.
+
+        The response is validated against `TicketAnalysis`. Only when it cannot be
+        parsed does this fall back to two calls: the summary prompt and a prompt asking
+        for the TicketEntities fields alone.
+
+        Returns:
+            dict: {"summary": str, "entities": dict, "usage": dict} where entities has
+                  the TicketEntities fields (None if the fallback's answer does not fit
+                  them; such results are not cached) and usage holds the calls, tokens
+                  and latency spent on this ticket, whether it fell back and whether it
+                  was served from the cache (True for an exact hit, "semantic" for a
+                  near-duplicate hit).
+        """
+        try:
+            key, vector, hit = self._analysis_lookup(ticket_text)
+            if hit is not None:
+                return hit
+            usage = LLMUsage()
+            result = self._parse_analysis(self._invoke("analyze", ticket_text, usage))
+            fallback = result is None
+            if fallback:
+                result = self._analyze_separately(ticket_text, usage)
+            return self._analysis_result(key, vector, result, usage, fallback)
+        except Exception as e:
+            logger.error(f"Error occurred while analyzing ticket: {e}")
+            raise CustomException(e, sys)
+
+    async def aanalyze_ticket(self, ticket_text: str) -> dict:
+        """Async variant of `analyze_ticket`."""
+        try:
+            key, vector, hit = self._analysis_lookup(ticket_text)
+            if hit is not None:
+                return hit
+            usage = LLMUsage()
+            result = self._parse_analysis(await self._ainvoke("analyze", ticket_text, usage))
+            fallback = result is None
+            if fallback:
+                result = await self._aanalyze_separately(ticket_text, usage)
+            return self._analysis_result(key, vector, result, usage, fallback)
+        except Exception as e:
+            logger.error(f"Error occurred while analyzing ticket: {e}")
+            raise CustomException(e, sys)
+
+    def _analyze_separately(self, ticket_text: str, usage: LLMUsage) -> dict:
+        summary = self._invoke("summary", ticket_text, usage)
+        return self._separate_analysis(summary, self._invoke("entities", ticket_text, usage))
+
+    async def _aanalyze_separately(self, ticket_text: str, usage: LLMUsage) -> dict:
+        summary, entities = await asyncio.gather(
+            self._ainvoke("summary", ticket_text, usage),
+            self._ainvoke("entities", ticket_text, usage),
+        )
+        return self._separate_analysis(summary, entities)
@@ -0,0 +1,184 @@
+import os
+import sys
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from logger import logger
+from exception import CustomException
+from utils import file_sha256
+from src.components.linear_artifact import MANIFEST_FILE, LinearTextClassifier
+
+
+@dataclass
+class LoadedArtifact:
+    """An artifact held in memory together with the file state it was loaded from."""
+    path: str
+    obj: Any
+    mtime: float
+    checksum: str
+    load_seconds: float
+    memory_bytes: int
+    last_checked: float = field(default=0.0)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded model artifacts.
+
+    A path is either a dill pickle or a linear artifact directory (see
+    linear_artifact.py), which is opened memory-mapped. For a directory, its
+    manifest stands in for the file below.
+
+    Artifacts are loaded lazily on first use and kept in memory. On later calls the
+    file's mtime is checked (at most once every `check_interval` seconds); if it moved
+    and the content hash differs, the artifact is reloaded and swapped in atomically.
+    Callers that already hold a reference keep using the old object until they finish.
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._artifacts: Dict[str, LoadedArtifact] = {}
+        self._checksums: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Any:
+        """Return the in-memory object for `path`, loading or reloading it if needed."""
+        try:
+            key = os.path.abspath(path)
+            artifact = self._artifacts.get(key)
+            if artifact is not None and not self._is_stale(artifact):
+                return artifact.obj
+
+            with self._lock:
+                # Another thread may have (re)loaded it while we waited for the lock. The
+                # staleness check is not repeated: it restarts the check interval.
+                current = self._artifacts.get(key)
+                if current is None or current is artifact:
+                    current = self._load(key, previous=artifact)
+                    self._artifacts[key] = current
+                return current.obj
+
+        except Exception as e:
+            logger.error(f"Failed to get artifact from registry: {path}")
+            raise CustomException(e, sys)
+
+    def file_checksum(self, path: str) -> str:
+        """sha256 of the file at `path`, hashed again only when its mtime or size changes."""
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._checksums.get(key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, file_sha256(key))
+            self._checksums[key] = cached
+        return cached[1]
+
+    def stats(self) -> Dict[str, dict]:
+        """Load time and approximate memory footprint of every loaded artifact."""
+        return {
+            path: {
+                "checksum": artifact.checksum,
+                "mtime": artifact.mtime,
+                "load_seconds": artifact.load_seconds,
+                "memory_bytes": artifact.memory_bytes,
+            }
+            for path, artifact in self._artifacts.items()
+        }
+
+    def clear(self):
+        """Drop every cached artifact so the next `get` reloads from disk."""
+        with self._lock:
+            self._artifacts.clear()
+            self._checksums.clear()
+
+    def _is_stale(self, artifact: LoadedArtifact) -> bool:
+        now = time.monotonic()
+        if now - artifact.last_checked < self.check_interval:
+            return False
+        artifact.last_checked = now
+        return os.stat(_state_file(artifact.path)).st_mtime != artifact.mtime
+
+    def _load(self, path: str, previous: Optional[LoadedArtifact] = None) -> LoadedArtifact:
+        state_file = _state_file(path)
+        mtime = os.stat(state_file).st_mtime
+        with open(state_file, "rb") as file_obj:
+            payload = file_obj.read()
+        # The manifest lists the sha256 of every array, so its hash covers the whole directory.
+        checksum = hashlib.sha256(payload).hexdigest()
+
+        if previous is not None and previous.checksum == checksum:
+            # Touched but not changed: keep the object we already have.
+            previous.mtime = mtime
+            return previous
+
+        start = time.perf_counter()
+        if state_file != path:
+            obj = LinearTextClassifier.load(path)
+        else:
+            # dill (and the sklearn modules it unpickles) load on first use only.
+            import dill
+            obj = dill.loads(payload)
+        load_seconds = time.perf_counter() - start
+
+        artifact = LoadedArtifact(
+            path=path,
+            obj=obj,
+            mtime=mtime,
+            checksum=checksum,
+            load_seconds=load_seconds,
+            memory_bytes=_deep_sizeof(obj),
+            last_checked=time.monotonic(),
+        )
+        action = "Reloaded" if previous is not None else "Loaded"
+        logger.info(
+            f"{action} artifact {path} in {load_seconds * 1000:.1f} ms "
+            f"(~{artifact.memory_bytes / 1024:.1f} KiB, sha256={checksum[:12]})"
+        )
+        return artifact
+
+
+def _state_file(path: str) -> str:
+    """The file whose mtime and hash identify the artifact at `path`."""
+    return os.path.join(path, MANIFEST_FILE) if os.path.isdir(path) else path
+
+
+def _deep_sizeof(obj, seen=None) -> int:
+    """
+    Approximate in-memory size of an object graph (numpy buffers counted by nbytes).
+
+    Memory-mapped arrays are counted at their full size even though they are
+    file-backed and shared with other processes.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, type):
+        return size
+    if isinstance(getattr(obj, "nbytes", None), int):
+        return size + obj.nbytes
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_sizeof(vars(obj), seen)
+    return size
+
+
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry."""
+    return _registry
@@ -1,14 +1,23 @@
 
 import os
 import sys
-import pandas as pd
+import time
+import shutil
+import tempfile
+import multiprocessing.connection
+from collections import deque
 import dill
+import joblib
 from dataclasses import dataclass
+from typing import Optional
 
 import mlflow
 import mlflow.sklearn
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV
 from sklearn.metrics import f1_score, accuracy_score, precision_score, recall_score
 
 # Add the project root directory to the Python path
@@ -17,50 +26,209 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 # Now we can import modules from the root directory
 from exception import CustomException
 from logger import logger
+from utils import save_object, load_object
+from src.components.data_transformation import DataTransformation
+from src.components.linear_artifact import export_linear_artifact
+
+_TFIDF = "preprocessor__text_processing__tfidf__"
+
+# Search space for `initiate_hyperparameter_search`: the TF-IDF settings from
+# DataTransformation.get_data_transformer_object crossed with each model's own knobs.
+DEFAULT_SEARCH_SPACE = [
+    {
+        _TFIDF + "max_features": [5000, 20000, None],
+        _TFIDF + "ngram_range": [(1, 1), (1, 2)],
+        _TFIDF + "sublinear_tf": [False, True],
+        "model": [LogisticRegression(multi_class='ovr', solver='liblinear')],
+        "model__C": [0.1, 1.0, 10.0],
+    },
+    {
+        _TFIDF + "max_features": [5000, 20000, None],
+        _TFIDF + "ngram_range": [(1, 1), (1, 2)],
+        _TFIDF + "sublinear_tf": [False, True],
+        # Early stopping ends each SGD fit once the held-out score stops improving.
+        "model": [SGDClassifier(loss='log_loss', early_stopping=True, n_iter_no_change=3, random_state=42)],
+        "model__alpha": [1e-5, 1e-4, 1e-3],
+    },
+]
 
 @dataclass
 class ModelTrainerConfig:
     """Configuration class for the model trainer."""
     trained_model_file_path: str = os.path.join("saved_models", "model.pkl")
+    preprocessor_file_path: str = os.path.join("saved_models", "preprocessor.pkl")
+    # Memory-mappable copy of the preprocessor + model, written when the best model is linear.
+    linear_artifact_dir: str = os.path.join("saved_models", "linear_model")
+    # Worker processes used to evaluate candidates; -1 uses every core, 1 stays in-process.
+    n_jobs: int = -1
+    # Seconds a candidate may take to fit and score before it is dropped (None = no limit).
+    model_time_budget: Optional[float] = None
+
+
+def _fit_and_score(model, X_train, y_train, X_test, y_test):
+    """Fit one candidate, score it on the test split and time the fit."""
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    y_test_pred = model.predict(X_test)
+    test_model_f1_score = f1_score(y_test, y_test_pred, average='weighted')
+    return model, test_model_f1_score, fit_seconds
+
+
+def _fit_and_score_shared(model, data_dir):
+    """Worker entry point: memory-map the shared train/test data, then fit and score."""
+    data = [
+        joblib.load(os.path.join(data_dir, f"{name}.joblib"), mmap_mode="r")
+        for name in ("X_train", "y_train", "X_test", "y_test")
+    ]
+    return _fit_and_score(model, *data)
+
+
+def _fit_and_score_worker(conn, model, data_dir):
+    """Process entry point: send ("ok", result) or ("error", exception) back through `conn`."""
+    try:
+        conn.send(("ok", _fit_and_score_shared(model, data_dir)))
+    except Exception as e:
+        conn.send(("error", e))
+    finally:
+        conn.close()
+
 
 class ModelTrainer:
     """This class handles the model training and evaluation process."""
-    def __init__(self):
-        self.model_trainer_config = ModelTrainerConfig()
+    def __init__(self, config: ModelTrainerConfig = None):
+        self.model_trainer_config = config or ModelTrainerConfig()
 
     def evaluate_models(self, X_train, y_train, X_test, y_test, models):
         """
         Trains and evaluates a dictionary of models, returning a report.
+
+        Candidates are fitted in parallel worker processes (`n_jobs` in the config).
+        The train/test matrices are dumped once to a temporary directory and
+        memory-mapped read-only by every worker, so they are shared through the page
+        cache instead of being pickled into each process. Fitted models replace the
+        unfitted ones in `models`.
+
+        Returns:
+            dict: model name -> {"f1_score", "fit_seconds", "status"} where status is
+                  "ok" or "timeout" (the candidate exceeded `model_time_budget`).
         """
         try:
+            n_jobs = self.model_trainer_config.n_jobs
+            if n_jobs < 0:
+                n_jobs = os.cpu_count() or 1
+            n_jobs = min(n_jobs, len(models))
+
+            if n_jobs <= 1 and self.model_trainer_config.model_time_budget is None:
+                results = {
+                    name: _fit_and_score(model, X_train, y_train, X_test, y_test)
+                    for name, model in models.items()
+                }
+            else:
+                data_dir = tempfile.mkdtemp(prefix="model_trainer_")
+                try:
+                    for name, array in (("X_train", X_train), ("y_train", y_train),
+                                        ("X_test", X_test), ("y_test", y_test)):
+                        joblib.dump(array, os.path.join(data_dir, f"{name}.joblib"))
+                    results = self._evaluate_in_pool(models, data_dir, max(n_jobs, 1))
+                finally:
+                    shutil.rmtree(data_dir, ignore_errors=True)
+
             report = {}
-            for model_name, model in models.items():
-                
-                model.fit(X_train, y_train)
-                
-                
-                y_test_pred = model.predict(X_test)
-                
-               
-                test_model_f1_score = f1_score(y_test, y_test_pred)
-                
-                report[model_name] = test_model_f1_score
-            
+            for model_name in models:
+                if model_name not in results:
+                    report[model_name] = {"f1_score": None, "fit_seconds": None, "status": "timeout"}
+                    logger.warning(f"{model_name} exceeded the time budget and was dropped")
+                    continue
+                fitted_model, test_model_f1_score, fit_seconds = results[model_name]
+                models[model_name] = fitted_model
+                report[model_name] = {"f1_score": test_model_f1_score, "fit_seconds": fit_seconds, "status": "ok"}
+                logger.info(f"{model_name}: F1 {test_model_f1_score:.4f}, fit in {fit_seconds:.2f} s")
+
             return report
 
         except Exception as e:
             raise CustomException(e, sys)
 
-    def initiate_model_training(self, train_array, test_array):
+    def _evaluate_in_pool(self, models, data_dir, n_jobs):
+        """
+        Fit and score each candidate in its own worker process, at most `n_jobs` at once.
+
+        A candidate still running when its budget runs out is terminated right away
+        and the next one takes its slot, so a slow model never delays the others.
+        """
+        budget = self.model_trainer_config.model_time_budget
+        queued = deque(models.items())
+        running = {}  # result pipe -> (model name, process, deadline)
+        results = {}
+        try:
+            while queued or running:
+                while queued and len(running) < n_jobs:
+                    model_name, model = queued.popleft()
+                    receiver, sender = multiprocessing.Pipe(duplex=False)
+                    process = multiprocessing.Process(target=_fit_and_score_worker,
+                                                      args=(sender, model, data_dir), daemon=True)
+                    process.start()
+                    sender.close()
+                    deadline = None if budget is None else time.monotonic() + budget
+                    running[receiver] = (model_name, process, deadline)
+
+                deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+                timeout = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+                for receiver in multiprocessing.connection.wait(list(running), timeout=timeout):
+                    model_name, process, _ = running.pop(receiver)
+                    try:
+                        status, payload = receiver.recv()
+                    except EOFError:
+                        status, payload = "error", None
+                    receiver.close()
+                    process.join()
+                    if status == "error":
+                        raise payload or RuntimeError(
+                            f"Worker fitting {model_name} exited with code {process.exitcode}")
+                    results[model_name] = payload
+
+                now = time.monotonic()
+                for receiver, (model_name, process, deadline) in list(running.items()):
+                    if deadline is not None and now >= deadline:
+                        process.terminate()
+                        process.join()
+                        receiver.close()
+                        del running[receiver]
+        finally:
+            for receiver, (_, process, _) in running.items():
+                process.terminate()
+                process.join()
+                receiver.close()
+        return results
+
+    def export_linear_artifact(self, preprocessor, model):
+        """
+        Write the linear artifact next to the pickles when the pair is exportable.
+
+        Returns:
+            str: The artifact directory, or None if the model or vectorizer isn't supported.
+        """
+        try:
+            return export_linear_artifact(preprocessor, model, self.model_trainer_config.linear_artifact_dir,
+                                          model_path=self.model_trainer_config.trained_model_file_path)
+        except ValueError as e:
+            # PredictionPipeline ignores an artifact exported from another model.pkl, so the pickles take over.
+            logger.info(f"Skipping linear artifact export: {e}")
+            return None
+
+    def initiate_model_training(self, X_train, y_train, X_test, y_test):
         """
         Orchestrates the model training, evaluation, and logging process.
+
+        Args:
+            X_train, X_test: Feature matrices; scipy sparse (CSR) matrices are used as-is.
+            y_train, y_test: 1-D label arrays.
         """
         try:
             logger.info("Starting model training process")
-            
-        
-            X_train, y_train = train_array[:, :-1], train_array[:, -1]
-            X_test, y_test = test_array[:, :-1], test_array[:, -1]
+            assert X_train.shape[0] == len(y_train), "Mismatch between training features and labels!"
+            assert X_test.shape[0] == len(y_test), "Mismatch between test features and labels!"
             
           
             models = {
@@ -72,8 +240,11 @@ class ModelTrainer:
             model_report = self.evaluate_models(X_train, y_train, X_test, y_test, models)
             
             
-            best_model_score = max(sorted(model_report.values()))
-            best_model_name = list(model_report.keys())[list(model_report.values()).index(best_model_score)]
+            finished = {name: entry for name, entry in model_report.items() if entry["status"] == "ok"}
+            if not finished:
+                raise ValueError("No candidate model finished within the time budget")
+            best_model_name = max(finished, key=lambda name: finished[name]["f1_score"])
+            best_model_score = finished[best_model_name]["f1_score"]
             best_model = models[best_model_name]
             
             logger.info(f"Best model found: {best_model_name} with F1 Score: {best_model_score}")
@@ -85,6 +256,8 @@ class ModelTrainer:
                 
                 mlflow.log_param("best_model_name", best_model_name)
                 mlflow.log_metric("f1_score_weighted", best_model_score)
+                for model_name, entry in finished.items():
+                    mlflow.log_metric(f"fit_seconds/{model_name}", entry["fit_seconds"])
 
 
                 mlflow.sklearn.log_model(best_model, "model")
@@ -96,8 +269,95 @@ class ModelTrainer:
          
             with open(self.model_trainer_config.trained_model_file_path, "wb") as file_obj:
                 dill.dump(best_model, file_obj)
+            self.export_linear_artifact(load_object(self.model_trainer_config.preprocessor_file_path), best_model)
 
             return self.model_trainer_config.trained_model_file_path
 
         except Exception as e:
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
+
+    def initiate_hyperparameter_search(self, X_train, y_train, X_test, y_test, search_space=None, factor: int = 3):
+        """
+        Tune the TF-IDF preprocessor and classifier together with successive halving.
+
+        Every configuration is first scored with cross-validation on a small subsample;
+        only the best 1/`factor` move on to the next round, which uses `factor` times
+        more rows, until the survivors see the full training set. Each trial is logged
+        to MLflow as a nested run, and the best pipeline is saved as the usual
+        preprocessor/model pair in saved_models/.
+
+        Args:
+            X_train, X_test: DataFrames with the raw 'text' column.
+            y_train, y_test: 1-D label arrays.
+            search_space: A param grid (or list of grids) over the "preprocessor" and
+                          "model" steps. Defaults to DEFAULT_SEARCH_SPACE.
+            factor (int): Halving rate between rounds.
+
+        Returns:
+            dict: Best parameters, CV score, test F1, search time and saved paths.
+        """
+        try:
+            search_space = search_space if search_space is not None else DEFAULT_SEARCH_SPACE
+            pipeline = Pipeline(steps=[
+                ("preprocessor", DataTransformation().get_data_transformer_object()),
+                ("model", LogisticRegression(multi_class='ovr', solver='liblinear')),
+            ])
+            search = HalvingGridSearchCV(
+                pipeline,
+                search_space,
+                factor=factor,
+                resource="n_samples",
+                scoring="f1_weighted",
+                cv=3,
+                n_jobs=self.model_trainer_config.n_jobs,
+                random_state=42,
+                error_score=0.0,
+            )
+
+            logger.info("Starting successive halving hyperparameter search")
+            start = time.perf_counter()
+            search.fit(X_train, y_train)
+            search_seconds = time.perf_counter() - start
+
+            best_pipeline = search.best_estimator_
+            test_f1_score = f1_score(y_test, best_pipeline.predict(X_test), average='weighted')
+            best_params = {name: repr(value) for name, value in search.best_params_.items()}
+            logger.info(
+                f"Search finished in {search_seconds:.1f} s over {len(search.cv_results_['params'])} trials; "
+                f"best CV F1 {search.best_score_:.4f}, test F1 {test_f1_score:.4f}, params {best_params}"
+            )
+
+            with mlflow.start_run(run_name="hyperparameter_search"):
+                mlflow.log_params({"search": "successive_halving", "factor": factor})
+                mlflow.log_metric("search_seconds", search_seconds)
+                results = search.cv_results_
+                for trial, params in enumerate(results["params"]):
+                    with mlflow.start_run(run_name=f"trial_{trial}", nested=True):
+                        mlflow.log_params({name: repr(value) for name, value in params.items()})
+                        mlflow.log_param("iter", int(results["iter"][trial]))
+                        mlflow.log_metric("n_resources", int(results["n_resources"][trial]))
+                        mlflow.log_metric("mean_cv_f1_weighted", float(results["mean_test_score"][trial]))
+                        mlflow.log_metric("mean_fit_seconds", float(results["mean_fit_time"][trial]))
+                mlflow.log_params({f"best/{name}": value for name, value in best_params.items()})
+                mlflow.log_metric("f1_score_weighted", test_f1_score)
+                # The pipeline holds a ColumnTransformer, which the skops format rejects as untrusted.
+                mlflow.sklearn.log_model(
+                    best_pipeline, "model", serialization_format=mlflow.sklearn.SERIALIZATION_FORMAT_CLOUDPICKLE
+                )
+
+            save_object(self.model_trainer_config.preprocessor_file_path, best_pipeline.named_steps["preprocessor"])
+            save_object(self.model_trainer_config.trained_model_file_path, best_pipeline.named_steps["model"])
+            logger.info("Saved the best preprocessor and model to saved_models/")
+            self.export_linear_artifact(best_pipeline.named_steps["preprocessor"], best_pipeline.named_steps["model"])
+
+            return {
+                "best_params": best_params,
+                "cv_f1_score": search.best_score_,
+                "test_f1_score": test_f1_score,
+                "search_seconds": search_seconds,
+                "preprocessor_path": self.model_trainer_config.preprocessor_file_path,
+                "model_path": self.model_trainer_config.trained_model_file_path,
+            }
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,242 @@
+import os
+import re
+import sys
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+
+# Words, and the separator between tickets when a chunk is tokenized in one pass.
+# @mentions, links and "rt" are matched too but then skipped: they say nothing about
+# the ticket and are exactly what differs between copies of the same tweet.
+_TOKEN = re.compile(r"@\w+|https?://[^\s\x00]+|[a-z0-9']+|\x00")
+_SEPARATOR_HASH = 2**32
+_SKIPPED_HASH = 2**32 + 1
+# FNV prime, to combine token hashes into shingle hashes.
+_SHINGLE_PRIME = np.uint32(0x01000193)
+# np.trapz is deprecated from NumPy 2.0 in favor of np.trapezoid, which 1.x lacks.
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+@dataclass
+class NearDuplicateConfig:
+    """Configuration class for near-duplicate detection."""
+    # Estimated Jaccard similarity of word shingles from which two tickets count as duplicates.
+    threshold: float = 0.8
+    # MinHash permutations per ticket; more gives a sharper threshold at a linear cost.
+    num_perm: int = 128
+    # Words per shingle (tickets shorter than this are compared word by word).
+    shingle_size: int = 2
+    # Tickets hashed at a time; bounds the temporary (shingles x num_perm) array.
+    chunk_size: int = 2000
+    seed: int = 1
+
+
+class NearDuplicateDetector:
+    """
+    Groups near-identical tickets with MinHash signatures and LSH banding.
+
+    Each ticket is lowercased, stripped of @mentions, links and "RT", and split into
+    word shingles. Its MinHash signature holds, for each of `num_perm` hash
+    functions, the smallest hash of its shingles; two signatures agree at a
+    position with probability equal to the Jaccard similarity of the shingle sets.
+    Signatures are cut into bands of `rows` positions and tickets whose band
+    hashes are equal in any band are candidates; bands and rows are chosen so
+    that pairs above `threshold` are almost always candidates and pairs well
+    below it almost never are. A candidate pair only counts once its signatures
+    agree on at least `threshold` of their positions.
+
+    Tickets are then taken in order: each one joins the cluster of the first
+    earlier representative it is a verified duplicate of, or becomes the
+    representative of a new cluster. Members are compared with the
+    representative, not with each other, so a chain of tickets each slightly
+    different from the last is not merged into one cluster.
+
+    Everything after tokenization is vectorized over a chunk of tickets. Per
+    ticket, the first row of its bucket in every band and the low 16 bits of
+    every signature position are kept (about 330 MB per million tickets at the
+    default settings); 16-bit values agree by accident once in 65536.
+    """
+
+    def __init__(self, config: NearDuplicateConfig = None):
+        self.config = config or NearDuplicateConfig()
+        if not 0.0 < self.config.threshold < 1.0:
+            raise ValueError(f"threshold must be between 0 and 1, got {self.config.threshold}")
+        rng = np.random.default_rng(self.config.seed)
+        # Shingles are already hashes, so h(x) = a * x + b mod 2**32 with odd a (a
+        # permutation of the uint32 values) is random enough, and 32-bit math is twice as fast.
+        self.a = (rng.integers(0, 2**31, size=(self.config.num_perm, 1), dtype=np.uint32) << np.uint32(1)) | np.uint32(1)
+        self.b = rng.integers(0, 2**32, size=(self.config.num_perm, 1), dtype=np.uint32)
+        self.bands, self.rows = self.choose_bands(self.config.threshold, self.config.num_perm)
+        self.band_multipliers = rng.integers(1, 2**63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self._token_hashes = {}
+
+    @staticmethod
+    def choose_bands(threshold: float, num_perm: int):
+        """
+        Bands and rows per band (bands * rows <= num_perm) whose S-curve
+        1 - (1 - s**rows)**bands best separates similarities above and below
+        `threshold`: the sum of the false-positive and false-negative areas is smallest.
+        """
+        similarity = np.linspace(0.0, 1.0, 1001)
+        best = None
+        for rows in range(1, num_perm + 1):
+            bands = num_perm // rows
+            linked = 1.0 - (1.0 - similarity ** rows) ** bands
+            error = _trapezoid(np.where(similarity < threshold, linked, 1.0 - linked), similarity)
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+        return best[1], best[2]
+
+    @staticmethod
+    def _token_hash(token: str) -> int:
+        if token == "\x00":
+            return _SEPARATOR_HASH
+        if token[0] == "@" or token.startswith("http") and "://" in token or token == "rt":
+            return _SKIPPED_HASH
+        return zlib.crc32(token.encode())
+
+    def _shingles(self, texts):
+        """Shingle hashes of a chunk (uint32), the offset of each ticket's first shingle and their counts."""
+        k = self.config.shingle_size
+        # The whole chunk is lowercased, cleaned and tokenized as one string, with a
+        # separator token after each ticket.
+        joined = "\x00".join(text if isinstance(text, str) else "" for text in texts) + "\x00"
+        # Each distinct token is hashed once (and cached across chunks).
+        codes, distinct = pd.factorize(np.array(_TOKEN.findall(joined.lower()), dtype=object))
+        cache = self._token_hashes
+        for token in set(distinct).difference(cache):
+            cache[token] = self._token_hash(token)
+        hashed = np.fromiter(map(cache.__getitem__, distinct), dtype=np.uint64, count=len(distinct))[codes]
+        hashed = hashed[hashed != _SKIPPED_HASH]
+        separators = hashed == _SEPARATOR_HASH
+        tokens = hashed[~separators].astype(np.uint32)
+        # Tokens before each separator, minus the separators before it.
+        ends = np.flatnonzero(separators)
+        lengths = np.diff(np.r_[-1, ends]) - 1
+        starts = np.cumsum(lengths) - lengths
+
+        # A shingle starts at every token with k - 1 more tokens after it in the same
+        # ticket; a ticket with fewer than k tokens keeps its single words instead.
+        position = np.arange(len(tokens)) - np.repeat(starts, lengths)
+        remaining = np.repeat(lengths, lengths) - position
+        short = np.repeat(lengths < k, lengths)
+        keep = short | (remaining >= k)
+        hashes = tokens
+        with np.errstate(over="ignore"):
+            for j in range(1, k):
+                shifted = np.zeros_like(tokens)
+                shifted[:len(tokens) - j] = tokens[j:]
+                hashes = np.where(short, hashes, (hashes * _SHINGLE_PRIME) ^ shifted)
+        counts = np.where(lengths < k, lengths, np.maximum(lengths - k + 1, 0))
+        return hashes[keep], np.cumsum(counts) - counts, counts
+
+    def signatures(self, texts) -> np.ndarray:
+        """
+        MinHash signatures of a list of texts.
+
+        Returns:
+            np.ndarray: (len(texts), num_perm) uint32; rows of tickets with no words are all 0xFFFFFFFF.
+        """
+        shingles, offsets, counts = self._shingles(texts)
+        # Built as (num_perm, tickets): every hash function runs over contiguous memory.
+        signatures = np.full((self.config.num_perm, len(texts)), np.iinfo(np.uint32).max, dtype=np.uint32)
+        present = counts > 0
+        if present.any():
+            with np.errstate(over="ignore"):
+                hashed = self.a * shingles
+                hashed += self.b
+            signatures[:, present] = np.minimum.reduceat(hashed, offsets[present], axis=1)
+        return signatures.T
+
+    def band_hashes(self, signatures: np.ndarray) -> np.ndarray:
+        """One uint64 hash per band: (n, bands)."""
+        used = signatures[:, :self.bands * self.rows].reshape(len(signatures), self.bands, self.rows)
+        with np.errstate(over="ignore"):
+            return (used.astype(np.uint64) * self.band_multipliers).sum(axis=2, dtype=np.uint64)
+
+    def cluster_ids(self, texts) -> np.ndarray:
+        """
+        Cluster id of each text: the position of its cluster's representative, the
+        first text of the cluster, so a row whose id is its own position is the
+        first (or only) copy.
+
+        Returns:
+            np.ndarray: int64 array aligned with `texts`.
+        """
+        try:
+            texts = list(texts)
+            n = len(texts)
+            band_hashes = np.empty((n, self.bands), dtype=np.uint64)
+            signatures = np.empty((n, self.config.num_perm), dtype=np.uint16)
+            empty = np.zeros(n, dtype=bool)
+            for start in range(0, n, self.config.chunk_size):
+                chunk = self.signatures(texts[start:start + self.config.chunk_size])
+                band_hashes[start:start + len(chunk)] = self.band_hashes(chunk)
+                signatures[start:start + len(chunk)] = chunk
+                empty[start:start + len(chunk)] = chunk[:, 0] == np.iinfo(np.uint32).max
+
+            # In each band, the first row with the same band hash names the bucket.
+            rows = np.arange(n)
+            buckets = np.empty((n, self.bands), dtype=np.int64)
+            for band in range(self.bands):
+                order = np.argsort(band_hashes[:, band], kind="stable")
+                keys = band_hashes[order, band]
+                group_start = np.r_[True, keys[1:] != keys[:-1]]
+                buckets[order, band] = order[np.maximum.accumulate(np.where(group_start, rows, 0))]
+            del band_hashes
+
+            # Rows first in all their buckets have nothing earlier to be a duplicate of.
+            cluster_ids = rows.copy()
+            candidates = np.flatnonzero((buckets != rows[:, None]).any(axis=1) & ~empty)
+            min_agreement = int(np.ceil(self.config.threshold * self.config.num_perm))
+            representatives = {}
+            for row in candidates.tolist():
+                seen = set()
+                for band, bucket in enumerate(buckets[row].tolist()):
+                    if bucket == row:
+                        continue
+                    key = (band, bucket)
+                    if key not in representatives:
+                        # The bucket's first row was settled before any other member.
+                        representatives[key] = [bucket] if cluster_ids[bucket] == bucket else []
+                    seen.update(representatives[key])
+                if seen:
+                    earlier = np.array(sorted(seen))
+                    agreement = (signatures[earlier] == signatures[row]).sum(axis=1)
+                    verified = earlier[agreement >= min_agreement]
+                    if len(verified):
+                        cluster_ids[row] = verified[0]
+                        continue
+                for band, bucket in enumerate(buckets[row].tolist()):
+                    if bucket != row:
+                        representatives[(band, bucket)].append(row)
+
+            duplicates = int((cluster_ids != rows).sum())
+            logger.info(f"Near-duplicate detection: {n} tickets, {duplicates} duplicates in "
+                        f"{len(np.unique(cluster_ids[cluster_ids != rows]))} clusters "
+                        f"(threshold {self.config.threshold}, {self.bands} bands of {self.rows})")
+            return cluster_ids
+
+        except Exception as e:
+            logger.error(f"Error in near-duplicate detection: {e}")
+            raise CustomException(e, sys)
+
+    def first_of_cluster(self, texts) -> np.ndarray:
+        """Boolean mask keeping the first text of every cluster."""
+        cluster_ids = self.cluster_ids(texts)
+        return cluster_ids == np.arange(len(cluster_ids))
+
+    @staticmethod
+    def cluster_weights(cluster_ids: np.ndarray) -> np.ndarray:
+        """Sample weights of 1 / cluster size, so every cluster counts once in total."""
+        _, inverse, sizes = np.unique(cluster_ids, return_inverse=True, return_counts=True)
+        return 1.0 / sizes[inverse]
@@ -0,0 +1,128 @@
+import os
+import sys
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+from src.components.llm_cache import normalize_ticket_text
+
+DEFAULT_EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+
+
+def fastembed_embedder(model_name: str = DEFAULT_EMBEDDING_MODEL) -> Callable[[List[str]], np.ndarray]:
+    """
+    Build an embedding function backed by fastembed. The model runs locally on
+    ONNX Runtime, so once it is downloaded no network access is needed.
+    """
+    try:
+        from fastembed import TextEmbedding
+    except ImportError as e:
+        raise CustomException(
+            "fastembed is required for the default semantic cache embedder; "
+            "install it or pass embed_fn", sys
+        ) from e
+
+    model = TextEmbedding(model_name=model_name)
+
+    def embed(texts: List[str]) -> np.ndarray:
+        return np.asarray(list(model.embed(texts)), dtype=np.float32)
+
+    return embed
+
+
+class SemanticCache:
+    """
+    Near-duplicate cache for LLM enrichment results.
+
+    Tickets are embedded and kept in an in-process matrix of unit vectors. `search`
+    returns the payload of the most similar stored ticket if its cosine similarity
+    is at least `threshold`. Once `max_entries` is reached the oldest entries are
+    overwritten.
+    """
+
+    def __init__(self, embed_fn: Callable[[List[str]], np.ndarray] = None,
+                 threshold: float = 0.9, max_entries: int = 100000):
+        """
+        Args:
+            embed_fn: Maps a list of texts to a 2-D array of embeddings. Defaults to fastembed.
+            threshold (float): Minimum cosine similarity for a hit.
+            max_entries (int): Capacity of the index.
+        """
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._payloads: list = []
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> np.ndarray:
+        """Unit-length embedding of the normalized ticket text."""
+        if self.embed_fn is None:
+            logger.info(f"Loading embedding model {DEFAULT_EMBEDDING_MODEL} for the semantic cache")
+            self.embed_fn = fastembed_embedder()
+        vector = np.asarray(self.embed_fn([normalize_ticket_text(text)])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(self, vector: np.ndarray):
+        """
+        Find the closest stored ticket to an embedding from `embed`.
+
+        Returns:
+            tuple: (payload, similarity) on a hit, (None, best_similarity) on a miss.
+        """
+        with self._lock:
+            if self._size == 0:
+                self.misses += 1
+                return None, 0.0
+            similarities = self._vectors[:self._size] @ vector
+            best = int(similarities.argmax())
+            similarity = float(similarities[best])
+            if similarity >= self.threshold:
+                self.hits += 1
+                return self._payloads[best], similarity
+            self.misses += 1
+            return None, similarity
+
+    def add(self, vector: np.ndarray, payload):
+        """Store an enrichment result under the embedding it was looked up with."""
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.empty((min(1024, self.max_entries), vector.shape[0]), dtype=np.float32)
+            elif self._next == len(self._vectors) and len(self._vectors) < self.max_entries:
+                grown = np.empty((min(2 * len(self._vectors), self.max_entries), vector.shape[0]), dtype=np.float32)
+                grown[:len(self._vectors)] = self._vectors
+                self._vectors = grown
+
+            slot = self._next
+            self._vectors[slot] = vector
+            if slot < len(self._payloads):
+                self._payloads[slot] = payload
+            else:
+                self._payloads.append(payload)
+            self._size = max(self._size, slot + 1)
+            self._next = (slot + 1) % self.max_entries
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,230 @@
+import os
+import sys
+from typing import Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+
+TWCS_TIME_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+class ThreadIndex:
+    """
+    Conversation threads of a TWCS-style dataset, held in flat NumPy arrays.
+
+    Rows are stored sorted by tweet id, so a tweet is found with a binary search.
+    Each row keeps the position of the tweet it replies to (-1 for thread starts
+    and for replies to tweets missing from the data), and every row's thread root
+    is found by pointer jumping over those parent pointers. Rows are then grouped
+    by thread in CSR form: `order[starts[t]:starts[t + 1]]` are the rows of
+    thread t in time order, so a whole conversation is assembled in O(thread
+    length) after an O(log n) lookup.
+
+    Only integer arrays are kept per row (about 30 bytes), plus the texts as one
+    Arrow string array in thread order when they are loaded; there are no per-row Python objects,
+    so millions of tweets fit in a few hundred MB.
+    """
+
+    def __init__(self, tweet_ids, parent_ids, created_at=None, inbound=None, texts: pa.Array = None):
+        """
+        Args:
+            tweet_ids: Unique tweet ids.
+            parent_ids: Id each tweet replies to, -1 if none.
+            created_at: Optional timestamps (any integer unit) used to order each thread;
+                        tweet ids are used without them.
+            inbound: Optional flags, True for customer tweets.
+            texts: Optional Arrow string array (or chunked array) of tweet texts, aligned
+                   with `tweet_ids`.
+        """
+        try:
+            tweet_ids = np.asarray(tweet_ids, dtype=np.int64)
+            sort = np.argsort(tweet_ids, kind="stable")
+            self.ids = tweet_ids[sort]
+            if len(self.ids) > 1 and not (self.ids[1:] > self.ids[:-1]).all():
+                raise ValueError("tweet ids must be unique")
+            if len(self.ids) >= np.iinfo(np.int32).max:
+                raise ValueError("too many tweets for 32-bit row positions")
+            n = len(self.ids)
+
+            self.parent = self.positions(np.asarray(parent_ids, dtype=np.int64)[sort])
+            self.created_at = None if created_at is None else np.asarray(created_at, dtype=np.int64)[sort]
+            self.inbound = None if inbound is None else np.asarray(inbound, dtype=bool)[sort]
+
+            root = self._find_roots(self.parent)
+            # Thread numbers follow the order of the roots' tweet ids.
+            roots, self.thread = np.unique(root, return_inverse=True)
+            self.thread = self.thread.astype(np.int32)
+            self.root_ids = self.ids[roots]
+            time_key = self.created_at if self.created_at is not None else self.ids
+            self.order = np.lexsort((self.ids, time_key, self.thread)).astype(np.int32)
+            self.starts = np.zeros(len(roots) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.thread, minlength=len(roots)), out=self.starts[1:])
+            # Texts are laid out in thread order, so a conversation is one zero-copy slice.
+            self.texts = None if texts is None else texts.take(pa.array(sort[self.order]))
+            logger.info(f"Thread index built: {n} tweets in {len(roots)} threads")
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _find_roots(parent: np.ndarray) -> np.ndarray:
+        """Root position of every row by pointer jumping: O(n log depth)."""
+        n = len(parent)
+        root = np.where(parent < 0, np.arange(n, dtype=np.int32), parent)
+        # Each pass doubles the distance covered, so log2(n) passes reach any root.
+        for _ in range(max(1, int(np.ceil(np.log2(max(n, 2))))) + 1):
+            jumped = root[root]
+            if np.array_equal(jumped, root):
+                break
+            root = jumped
+        # A real root has no parent. Rows whose jumping ended elsewhere landed on a reply
+        # cycle (even cycles and self-replies settle there, odd ones keep rotating).
+        cyclic = parent[root] >= 0
+        if not cyclic.any():
+            return root
+        # Walk each cycle once from where the rows landed to mark all of its members.
+        on_cycle = np.zeros(n, dtype=bool)
+        position = np.unique(root[cyclic])
+        while len(position):
+            on_cycle[position] = True
+            position = parent[position]
+            position = position[~on_cycle[position]]
+        logger.warning(f"{int(on_cycle.sum())} tweets are in reply cycles; treating them as thread starts")
+        parent[on_cycle] = -1
+        return ThreadIndex._find_roots(parent)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, load_text: bool = True) -> "ThreadIndex":
+        """Build from a DataFrame with the TWCS columns (tweet_id, in_response_to_tweet_id, ...)."""
+        parents = pd.to_numeric(df["in_response_to_tweet_id"]).fillna(-1).astype(np.int64)
+        created_at = None
+        if "created_at" in df:
+            created_at = pd.to_datetime(df["created_at"], format=TWCS_TIME_FORMAT, utc=True).astype(np.int64)
+        inbound = df["inbound"].fillna(False).to_numpy(dtype=bool) if "inbound" in df else None
+        texts = pa.array(df["text"].astype(object), type=pa.large_string()) if load_text and "text" in df else None
+        return cls(df["tweet_id"].to_numpy(), parents.to_numpy(), created_at, inbound, texts)
+
+    @classmethod
+    def from_csv(cls, file_path: str, chunksize: int = 200_000, load_text: bool = True) -> "ThreadIndex":
+        """
+        Build from a TWCS CSV, reading it in chunks of only the needed columns.
+
+        Memory is the index itself plus one chunk: ids, times and flags are packed
+        into NumPy arrays and texts into Arrow buffers as each chunk is read.
+        """
+        try:
+            columns = {
+                "tweet_id": "int64",
+                "in_response_to_tweet_id": "Int64",
+                "created_at": "string",
+                "inbound": "boolean",
+            }
+            if load_text:
+                columns["text"] = "string"
+            ids, parents, created, inbound, texts = [], [], [], [], []
+            for chunk in pd.read_csv(file_path, usecols=list(columns), dtype=columns, chunksize=chunksize):
+                ids.append(chunk["tweet_id"].to_numpy())
+                parents.append(chunk["in_response_to_tweet_id"].fillna(-1).to_numpy(dtype=np.int64))
+                created.append(
+                    pd.to_datetime(chunk["created_at"], format=TWCS_TIME_FORMAT, utc=True).astype(np.int64).to_numpy()
+                )
+                inbound.append(chunk["inbound"].fillna(False).to_numpy(dtype=bool))
+                if load_text:
+                    texts.append(pa.array(chunk["text"], type=pa.large_string()))
+                logger.info(f"Read {sum(len(part) for part in ids)} tweets for the thread index")
+
+            # Chunks are merged one column at a time so only one column is ever held twice.
+            ids = np.concatenate(ids)
+            parents = np.concatenate(parents)
+            created = np.concatenate(created)
+            inbound = np.concatenate(inbound)
+            texts = pa.chunked_array(texts, type=pa.large_string()) if load_text else None
+            return cls(ids, parents, created, inbound, texts)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def n_threads(self) -> int:
+        return len(self.root_ids)
+
+    def positions(self, tweet_ids: np.ndarray) -> np.ndarray:
+        """Row positions of tweet ids, -1 for ids not in the index."""
+        tweet_ids = np.asarray(tweet_ids, dtype=np.int64)
+        if not len(self.ids):
+            return np.full(len(tweet_ids), -1, dtype=np.int32)
+        found = np.minimum(np.searchsorted(self.ids, tweet_ids), len(self.ids) - 1)
+        return np.where(self.ids[found] == tweet_ids, found, -1).astype(np.int32)
+
+    def position(self, tweet_id: int) -> int:
+        position = int(np.searchsorted(self.ids, tweet_id))
+        if position == len(self.ids) or self.ids[position] != tweet_id:
+            raise KeyError(f"tweet {tweet_id} is not in the index")
+        return position
+
+    def thread_rows(self, thread: int) -> np.ndarray:
+        """Row positions of one thread, in time order."""
+        return self.order[self.starts[thread]:self.starts[thread + 1]]
+
+    def thread_sizes(self) -> np.ndarray:
+        return np.diff(self.starts)
+
+    def conversation(self, tweet_id: int) -> np.ndarray:
+        """Tweet ids of the whole conversation containing `tweet_id`, in time order."""
+        return self.ids[self.thread_rows(self.thread[self.position(tweet_id)])]
+
+    def _join(self, thread: int, inbound_only: bool, sep: str) -> str:
+        if self.texts is None:
+            raise ValueError("the index was built without texts")
+        start, end = int(self.starts[thread]), int(self.starts[thread + 1])
+        texts = self.texts.slice(start, end - start).to_pylist()
+        if inbound_only and self.inbound is not None:
+            texts = [text for text, keep in zip(texts, self.inbound[self.order[start:end]]) if keep]
+        return sep.join(text or "" for text in texts)
+
+    def conversation_text(self, tweet_id: int, inbound_only: bool = True, sep: str = "\n") -> str:
+        """
+        The conversation containing `tweet_id` as one text, e.g. for classification.
+
+        Args:
+            inbound_only (bool): Keep only the customer's tweets.
+            sep (str): Joins the tweets.
+        """
+        return self._join(int(self.thread[self.position(tweet_id)]), inbound_only, sep)
+
+    def iter_conversations(self, inbound_only: bool = True, sep: str = "\n",
+                           min_size: int = 1) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (root tweet id, conversation text) for every thread, in O(total rows).
+
+        Threads with no customer tweet (when inbound_only) or fewer than `min_size`
+        tweets are skipped, so each yielded conversation is one ticket.
+        """
+        sizes = self.thread_sizes()
+        has_customer = None
+        if inbound_only and self.inbound is not None:
+            has_customer = np.bincount(self.thread, weights=self.inbound, minlength=self.n_threads) > 0
+        for thread in np.flatnonzero(sizes >= min_size):
+            if has_customer is not None and not has_customer[thread]:
+                continue
+            yield int(self.root_ids[thread]), self._join(int(thread), inbound_only, sep)
+
+    def nbytes(self, include_text: bool = True) -> int:
+        """Memory held by the index arrays."""
+        arrays = [self.ids, self.parent, self.thread, self.order, self.starts, self.root_ids,
+                  self.created_at, self.inbound]
+        total = sum(array.nbytes for array in arrays if array is not None)
+        if include_text and self.texts is not None:
+            total += self.texts.nbytes
+        return total
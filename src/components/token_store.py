@@ -0,0 +1,408 @@
+import os
+import re
+import sys
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from scipy.sparse import csr_matrix
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+
+FORMAT_NAME = "tokenized-corpus"
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+# CountVectorizer/TfidfVectorizer's default tokenization.
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+@dataclass
+class TokenStoreConfig:
+    """Configuration class for the tokenized corpus store."""
+    store_dir: str = os.path.join('data', 'token_store')
+    # Texts tokenized at a time when appending.
+    chunk_size: int = 50_000
+
+
+class TokenFeatures:
+    """
+    The n-gram columns of a matrix built by TokenStore.count_matrix.
+
+    An n-gram of token ids (t1, ..., tn) is keyed by the integer t1 * base**(n-1) +
+    ... + tn, where base is the dictionary size when the features were selected;
+    `keys[n]` holds the sorted keys of the selected n-grams and `columns[n]` their
+    columns. Columns are in alphabetical order of `names`, as in sklearn.
+    """
+
+    def __init__(self, base: int, keys: Dict[int, np.ndarray], columns: Dict[int, np.ndarray], names: List[str]):
+        self.base = base
+        self.keys = keys
+        self.columns = columns
+        self.names = names
+
+    def __len__(self):
+        return len(self.names)
+
+    def vocabulary(self) -> Dict[str, int]:
+        """Term -> column, like a fitted vectorizer's vocabulary_."""
+        return {name: column for column, name in enumerate(self.names)}
+
+
+class TokenStore:
+    """
+    A corpus tokenized once, stored as flat arrays that are memory-mapped on load.
+
+    Texts are lowercased and split with the vectorizers' default token pattern.
+    Every distinct token gets an id in a dictionary shared by the whole corpus
+    (vocabulary.txt, one token per line, id = line number), the tokens of all
+    rows are one int32 array (tokens.bin) and row i is
+    tokens[offsets[i]:offsets[i + 1]] (offsets.bin, int64). Stop words are
+    kept, so any stop word list can be applied when a matrix is built.
+
+    New rows are appended to the end of the files; the manifest, written last,
+    records how many rows, tokens and dictionary bytes are valid, so a failed
+    append leaves the store as it was. Count matrices for any n-gram range,
+    document-frequency limits and max_features are then built with NumPy
+    from the token ids, without touching a string.
+    """
+
+    def __init__(self, config: TokenStoreConfig = None):
+        self.config = config or TokenStoreConfig()
+        self.manifest = self._read_manifest()
+        self._ids = None
+        self._token_ranks = None
+        self._open()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.config.store_dir, name)
+
+    def _read_manifest(self) -> dict:
+        path = self._path(MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {"format": FORMAT_NAME, "format_version": FORMAT_VERSION, "token_pattern": TOKEN_PATTERN,
+                    "lowercase": True, "rows": 0, "tokens": 0, "vocabulary_size": 0, "vocabulary_bytes": 0,
+                    "source": None}
+        with open(path) as file_obj:
+            manifest = json.load(file_obj)
+        if manifest.get("format") != FORMAT_NAME or manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"{self.config.store_dir} is not a {FORMAT_NAME} v{FORMAT_VERSION} store")
+        return manifest
+
+    def _open(self):
+        """Map the valid part of the files (anything after it is left over from a failed append)."""
+        manifest = self.manifest
+        self.tokens = np.zeros(0, dtype=np.int32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        if manifest["tokens"]:
+            self.tokens = np.memmap(self._path("tokens.bin"), dtype=np.int32, mode="r", shape=(manifest["tokens"],))
+        if manifest["rows"]:
+            self.offsets = np.memmap(self._path("offsets.bin"), dtype=np.int64, mode="r",
+                                     shape=(manifest["rows"] + 1,))
+        self.vocabulary = []
+        if manifest["vocabulary_size"]:
+            with open(self._path("vocabulary.txt"), "rb") as file_obj:
+                data = file_obj.read(manifest["vocabulary_bytes"])
+            self.vocabulary = data.decode("utf-8").split("\n")[:-1]
+        self._token_ranks = None
+
+    @property
+    def rows(self) -> int:
+        return self.manifest["rows"]
+
+    def _tokenize(self, texts):
+        """Token ids (int32, new tokens added to the dictionary) and the number of tokens per text."""
+        if self._ids is None:
+            self._ids = {token: i for i, token in enumerate(self.vocabulary)}
+        # One regex pass over the chunk, with a separator token after each text.
+        joined = "\x00".join(
+            (text.replace("\x00", " ") if "\x00" in text else text) if isinstance(text, str) else ""
+            for text in texts
+        ) + "\x00"
+        tokens = re.findall(TOKEN_PATTERN + r"|\x00", joined.lower())
+        codes, distinct = pd.factorize(np.array(tokens, dtype=object))
+
+        ids = self._ids
+        for token in distinct:
+            if token not in ids and token != "\x00":
+                ids[token] = len(self.vocabulary)
+                self.vocabulary.append(token)
+        distinct_ids = np.fromiter((ids.get(token, -1) for token in distinct), dtype=np.int64, count=len(distinct))
+        token_ids = distinct_ids[codes]
+        separators = np.flatnonzero(token_ids < 0)
+        lengths = np.diff(np.r_[-1, separators]) - 1
+        return token_ids[token_ids >= 0].astype(np.int32), lengths
+
+    def append(self, texts, source: Optional[dict] = None):
+        """
+        Tokenize `texts` and add them as new rows.
+
+        Args:
+            texts: Iterable of strings (anything else becomes an empty row).
+            source: Recorded in the manifest; `sync` uses it to tell whether the store
+                    is up to date with its dataset.
+        """
+        try:
+            os.makedirs(self.config.store_dir, exist_ok=True)
+            manifest = dict(self.manifest)
+            vocabulary_start = manifest["vocabulary_size"]
+            texts = list(texts)
+            with open(self._path("tokens.bin"), "ab") as tokens_file, \
+                    open(self._path("offsets.bin"), "ab") as offsets_file:
+                # Drop whatever a failed append left after the valid part.
+                tokens_file.truncate(manifest["tokens"] * 4)
+                offsets_file.truncate(manifest["rows"] and (manifest["rows"] + 1) * 8)
+                if manifest["rows"] == 0:
+                    offsets_file.write(np.zeros(1, dtype=np.int64).tobytes())
+                for start in range(0, len(texts), self.config.chunk_size):
+                    tokens, lengths = self._tokenize(texts[start:start + self.config.chunk_size])
+                    tokens_file.write(tokens.tobytes())
+                    offsets_file.write((manifest["tokens"] + np.cumsum(lengths)).astype(np.int64).tobytes())
+                    manifest["tokens"] += len(tokens)
+                    manifest["rows"] += len(lengths)
+
+            new_tokens = "".join(token + "\n" for token in self.vocabulary[vocabulary_start:]).encode("utf-8")
+            with open(self._path("vocabulary.txt"), "ab") as vocabulary_file:
+                vocabulary_file.truncate(manifest["vocabulary_bytes"])
+                vocabulary_file.write(new_tokens)
+            manifest["vocabulary_size"] = len(self.vocabulary)
+            manifest["vocabulary_bytes"] += len(new_tokens)
+            manifest["source"] = source
+            manifest["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+            manifest_path = self._path(MANIFEST_FILE)
+            with open(manifest_path + ".tmp", "w") as file_obj:
+                json.dump(manifest, file_obj, indent=2)
+            os.replace(manifest_path + ".tmp", manifest_path)
+            self.manifest = manifest
+            self._open()
+            logger.info(f"Token store {self.config.store_dir}: {manifest['rows']} rows, {manifest['tokens']} tokens, "
+                        f"{manifest['vocabulary_size']} distinct")
+
+        except Exception as e:
+            # The in-memory dictionary may hold tokens the manifest does not; reload it.
+            self.manifest = self._read_manifest()
+            self._ids = None
+            self._open()
+            raise CustomException(e, sys)
+
+    def clear(self):
+        """Remove every row."""
+        for name in (MANIFEST_FILE, "tokens.bin", "offsets.bin", "vocabulary.txt"):
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+        self.manifest = self._read_manifest()
+        self._ids = None
+        self._open()
+
+    def sync(self, data_path: str, text_column: str = "text") -> "TokenStore":
+        """
+        Make the store hold the `text_column` of a Parquet dataset, row for row.
+
+        Nothing is done if the store was built from the file as it is now (same
+        size and modification time); if the file has changed, it is tokenized again.
+        """
+        try:
+            stat = os.stat(data_path)
+            source = {"path": os.path.abspath(data_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            if self.manifest["source"] == source:
+                return self
+
+            logger.info(f"Tokenizing {data_path} into {self.config.store_dir}")
+            self.clear()
+            parquet_file = pq.ParquetFile(data_path)
+            for batch in parquet_file.iter_batches(batch_size=self.config.chunk_size, columns=[text_column]):
+                self.append(batch.column(0).to_pylist())
+            # Recorded only once every row is in, so an interrupted build is redone.
+            self.append([], source=source)
+            return self
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _rows_tokens(self, rows):
+        """Token ids (int64) of the given rows, concatenated, and each row's number of tokens."""
+        if rows is None:
+            return np.asarray(self.tokens, dtype=np.int64), np.diff(self.offsets)
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        # Position of each gathered token in the flat array.
+        index = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        return self.tokens[index].astype(np.int64), lengths
+
+    def _stop_mask(self, stop_words) -> np.ndarray:
+        if stop_words is None:
+            return None
+        if stop_words == "english":
+            from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+            stop_words = ENGLISH_STOP_WORDS
+        if self._ids is None:
+            self._ids = {token: i for i, token in enumerate(self.vocabulary)}
+        mask = np.zeros(len(self.vocabulary), dtype=bool)
+        mask[[self._ids[word] for word in stop_words if word in self._ids]] = True
+        return mask
+
+    def _ranks(self) -> np.ndarray:
+        """Alphabetical rank of every token id."""
+        if self._token_ranks is None or len(self._token_ranks) != len(self.vocabulary):
+            order = np.argsort(np.array(self.vocabulary, dtype=object), kind="stable")
+            self._token_ranks = np.empty(len(order), dtype=np.int64)
+            self._token_ranks[order] = np.arange(len(order))
+        return self._token_ranks
+
+    @staticmethod
+    def _ngrams(tokens, docs, n, base, valid=None):
+        """Keys and rows of every n-gram that lies within one row (and, if given, only spans `valid` tokens)."""
+        if float(base) ** n >= 2**63:
+            raise ValueError(f"{n}-grams over {base} distinct tokens do not fit in 64-bit keys")
+        count = max(len(tokens) - n + 1, 0)
+        keys = tokens[:count].copy()
+        for j in range(1, n):
+            keys = keys * base + tokens[j:count + j]
+        # Tokens of a row are contiguous, so an n-gram is within one row if its ends are.
+        within = docs[:count] == docs[n - 1:]
+        if valid is not None:
+            invalid_before = np.r_[0, np.cumsum(~valid)]
+            within &= invalid_before[n:] == invalid_before[:count]
+        return keys[within], docs[:count][within]
+
+    def count_matrix(self, rows=None, ngram_range=(1, 1), stop_words=None, min_df=1, max_df=1.0,
+                     max_features: Optional[int] = None, binary: bool = False, features: TokenFeatures = None):
+        """
+        Term counts of the given rows, as CountVectorizer would compute them on the
+        original texts.
+
+        Without `features`, the columns are selected like CountVectorizer.fit does:
+        n-grams in `ngram_range` after removing `stop_words`, kept if their document
+        frequency is within [min_df, max_df] (ints are counts, floats proportions),
+        then the `max_features` most frequent, in alphabetical order. With `features`
+        (returned by an earlier call), the same columns are counted, as transform does.
+        With `binary`, counts are 1 and max_features ranks by document frequency.
+
+        Args:
+            rows: Row numbers to include, in order (default: all rows).
+
+        Returns:
+            tuple: (scipy CSR matrix of int64 counts, TokenFeatures).
+        """
+        try:
+            tokens, lengths = self._rows_tokens(rows)
+            n_docs = len(lengths)
+            docs = np.repeat(np.arange(n_docs), lengths)
+            stop = self._stop_mask(stop_words)
+            if stop is not None:
+                keep = ~stop[tokens]
+                tokens, docs = tokens[keep], docs[keep]
+            min_n, max_n = ngram_range
+
+            if features is not None:
+                # Tokens added to the dictionary since the features were selected match nothing.
+                known = tokens < features.base
+                doc_columns = []
+                for n in range(min_n, max_n + 1):
+                    keys, key_docs = self._ngrams(tokens, docs, n, features.base, valid=known)
+                    selected = features.keys.get(n, np.zeros(0, dtype=np.int64))
+                    if len(selected) == 0:
+                        continue
+                    position = np.minimum(np.searchsorted(selected, keys), len(selected) - 1)
+                    match = selected[position] == keys
+                    doc_columns.append((key_docs[match], features.columns[n][position[match]]))
+                matrix_docs = np.concatenate([d for d, _ in doc_columns] + [np.zeros(0, dtype=np.int64)])
+                matrix_columns = np.concatenate([c for _, c in doc_columns] + [np.zeros(0, dtype=np.int64)])
+                matrix = csr_matrix((np.ones(len(matrix_docs), dtype=np.int64), (matrix_docs, matrix_columns)),
+                                    shape=(n_docs, len(features)))
+                matrix.sum_duplicates()
+                if binary:
+                    matrix.data[:] = 1
+                return matrix, features
+
+            base = len(self.vocabulary)
+            # Dense feature ids: n-grams of each size numbered after those of the sizes before.
+            feature_keys, feature_sizes, occurrence_docs, occurrence_features = [], [], [], []
+            n_features = 0
+            for n in range(min_n, max_n + 1):
+                keys, key_docs = self._ngrams(tokens, docs, n, base)
+                if n == 1:
+                    distinct = np.flatnonzero(np.bincount(keys, minlength=base))
+                    lookup = np.empty(base, dtype=np.int64)
+                    lookup[distinct] = np.arange(len(distinct))
+                    inverse = lookup[keys]
+                else:
+                    distinct, inverse = np.unique(keys, return_inverse=True)
+                feature_keys.append(distinct)
+                feature_sizes.append(np.full(len(distinct), n))
+                occurrence_docs.append(key_docs)
+                occurrence_features.append(inverse + n_features)
+                n_features += len(distinct)
+            feature_keys = np.concatenate(feature_keys)
+            feature_sizes = np.concatenate(feature_sizes)
+            occurrence_features = np.concatenate(occurrence_features)
+            matrix = csr_matrix(
+                (np.ones(len(occurrence_features), dtype=np.int64), (np.concatenate(occurrence_docs), occurrence_features)),
+                shape=(n_docs, n_features),
+            )
+            matrix.sum_duplicates()
+
+            # Document frequency limits and max_features, as in CountVectorizer._limit_features.
+            document_frequency = np.bincount(matrix.indices, minlength=n_features)
+            max_count = max_df if isinstance(max_df, (int, np.integer)) else max_df * n_docs
+            min_count = min_df if isinstance(min_df, (int, np.integer)) else min_df * n_docs
+            if max_count < min_count:
+                raise ValueError("max_df corresponds to < documents than min_df")
+            # The tokens of each n-gram as alphabetical ranks (-1 past its end): sorting
+            # them is sorting the n-gram strings, since every word character sorts after " ".
+            ranks = self._ranks()
+            token_columns = []
+            for j in range(max_n):
+                power = np.maximum(feature_sizes - 1 - j, 0)
+                token = (feature_keys // base ** power) % base
+                token_columns.append(np.where(j < feature_sizes, ranks[token], -1))
+            alphabetical = np.lexsort(token_columns[::-1])
+
+            keep = (document_frequency >= min_count) & (document_frequency <= max_count)
+            keep = keep[alphabetical]
+            if max_features is not None and max_features < keep.sum():
+                term_frequency = (document_frequency if binary else
+                                  np.bincount(occurrence_features, minlength=n_features))[alphabetical]
+                candidates = np.flatnonzero(keep)
+                # The same (unstable) sort on the same array as sklearn, so ties are broken alike.
+                chosen = candidates[(-term_frequency[candidates]).argsort()[:max_features]]
+                keep = np.zeros(n_features, dtype=bool)
+                keep[chosen] = True
+            selected = alphabetical[keep]
+            if len(selected) == 0:
+                raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+
+            keys, columns = {}, {}
+            for n in range(min_n, max_n + 1):
+                of_size = np.flatnonzero(feature_sizes[selected] == n)
+                order = np.argsort(feature_keys[selected[of_size]], kind="stable")
+                keys[n] = feature_keys[selected[of_size]][order]
+                columns[n] = of_size[order]
+            vocabulary = np.array(self.vocabulary, dtype=object)
+            names = np.empty(len(selected), dtype=object)
+            for n in range(min_n, max_n + 1):
+                of_size = np.flatnonzero(feature_sizes[selected] == n)
+                key = feature_keys[selected[of_size]]
+                name = vocabulary[key // base ** (n - 1)]
+                for j in range(1, n):
+                    name = name + " " + vocabulary[(key // base ** (n - 1 - j)) % base]
+                names[of_size] = name
+            matrix = matrix[:, selected]
+            if binary:
+                matrix.data[:] = 1
+            return matrix, TokenFeatures(base, keys, columns, names.tolist())
+
+        except ValueError:
+            raise
+        except Exception as e:
+            raise CustomException(e, sys)
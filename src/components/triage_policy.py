@@ -0,0 +1,160 @@
+import os
+import re
+import sys
+import json
+from dataclasses import dataclass, asdict, field
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+
+TIER_LOCAL = "local"
+TIER_LLM = "llm"
+
+DEFAULT_URGENT_KEYWORDS = [
+    'urgent', 'asap', 'immediately', 'emergency', 'right now', 'fraud', 'scam', 'hacked',
+    'stolen', 'unauthorized', 'lawsuit', 'lawyer', 'cancel', 'outage', 'still waiting',
+    'again', 'worst', 'unacceptable',
+]
+
+
+@dataclass
+class TriagePolicy:
+    """
+    Decides per ticket whether the local classifier's answer is enough or the LLM
+    summary/entity calls are needed.
+
+    A ticket stays on the local tier when the classifier's top probability is at
+    least `confidence_threshold` and its urgency score is below `urgency_threshold`;
+    everything else (including models without predict_proba) goes to the LLM tier.
+    The urgency score is a cheap heuristic in [0, 1]: urgent keywords, repeated
+    exclamation marks and shouting (mostly upper-case words).
+    """
+    confidence_threshold: float = 0.8
+    urgency_threshold: float = 0.5
+    urgent_keywords: List[str] = field(default_factory=lambda: list(DEFAULT_URGENT_KEYWORDS))
+
+    def __post_init__(self):
+        self._urgent_re = None
+        if self.urgent_keywords:
+            alternation = "|".join(re.escape(kw) for kw in sorted(self.urgent_keywords, key=len, reverse=True))
+            self._urgent_re = re.compile(r"\b(?:" + alternation + r")\b", re.IGNORECASE)
+
+    def urgency(self, text: str) -> float:
+        """Heuristic urgency score of one ticket."""
+        score = 0.5 * min(len(self._urgent_re.findall(text)), 2) if self._urgent_re else 0.0
+        if "!!" in text:
+            score += 0.25
+        words = [word for word in text.split() if len(word) > 2 and word.isalpha()]
+        if len(words) >= 3 and sum(word.isupper() for word in words) / len(words) > 0.5:
+            score += 0.25
+        return min(score, 1.0)
+
+    def urgency_scores(self, texts: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.urgency(text) for text in texts), dtype=np.float64, count=len(texts))
+
+    def route(self, confidences: Sequence, urgency: np.ndarray) -> np.ndarray:
+        """Tier per ticket from classifier confidences (None when unknown) and urgency scores."""
+        confidences = np.array([np.nan if c is None else c for c in confidences], dtype=np.float64)
+        local = (confidences >= self.confidence_threshold) & (urgency < self.urgency_threshold)
+        return np.where(local, TIER_LOCAL, TIER_LLM)
+
+    def triage(self, texts: Sequence[str], confidences: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            tuple: (tiers, urgency scores), one per ticket.
+        """
+        urgency = self.urgency_scores(texts)
+        return self.route(confidences, urgency), urgency
+
+    @classmethod
+    def calibrate(cls, confidences: Sequence[float], urgency: np.ndarray, correct: Sequence[bool],
+                  max_llm_fraction: float = 0.3, min_local_accuracy: float = 0.95, **kwargs):
+        """
+        Pick the confidence threshold from labeled validation tickets.
+
+        Local-tier tickets only get the classifier's answer, so the threshold is the
+        lowest one at which those tickets are still categorized with at least
+        `min_local_accuracy`. If that sends more than `max_llm_fraction` of the
+        tickets to the LLM, the threshold is lowered until the budget is met and
+        the report says the accuracy target was missed.
+
+        Args:
+            confidences: Classifier top probability per ticket.
+            urgency: Urgency scores from `urgency_scores`.
+            correct: Whether the classifier's category matched the label.
+            max_llm_fraction (float): Budget, as the share of tickets allowed to reach the LLM.
+            min_local_accuracy (float): Accuracy the local tier has to keep.
+            **kwargs: Other TriagePolicy fields (urgency_threshold, urgent_keywords).
+
+        Returns:
+            tuple: (TriagePolicy, report dict).
+        """
+        try:
+            policy = cls(**kwargs)
+            confidences = np.asarray(confidences, dtype=np.float64)
+            correct = np.asarray(correct, dtype=bool)
+            n = len(confidences)
+
+            # Urgent tickets always go to the LLM; the rest are ranked by confidence and
+            # the k most confident go local. Accuracy of the top k is a prefix mean.
+            candidates = np.flatnonzero(np.asarray(urgency) < policy.urgency_threshold)
+            order = candidates[np.argsort(-confidences[candidates], kind="stable")]
+            ranked_conf = confidences[order]
+            prefix_accuracy = np.cumsum(correct[order]) / np.arange(1, len(order) + 1)
+            # A threshold can't split tied confidences, so only the last of each tie is a valid cut.
+            valid = np.append(ranked_conf[1:] < ranked_conf[:-1], True) if len(order) else np.array([], bool)
+
+            ok = np.flatnonzero(valid & (prefix_accuracy >= min_local_accuracy))
+            k = ok[-1] + 1 if len(ok) else 0
+            meets_accuracy = True
+            needed = int(np.ceil(n * (1 - max_llm_fraction)))
+            if n - k > n * max_llm_fraction:
+                meets_accuracy = False
+                cuts = np.flatnonzero(valid[max(needed, 1) - 1:]) + max(needed, 1)
+                k = int(cuts[0]) if len(cuts) else len(order)
+
+            policy.confidence_threshold = float(ranked_conf[k - 1]) if k else float("inf")
+            local_accuracy = float(prefix_accuracy[k - 1]) if k else None
+            llm_fraction = (n - k) / n if n else 0.0
+            report = {
+                "confidence_threshold": policy.confidence_threshold,
+                "urgency_threshold": policy.urgency_threshold,
+                "llm_fraction": llm_fraction,
+                "local_accuracy": local_accuracy,
+                "overall_accuracy": float(correct.mean()) if n else None,
+                "urgent_fraction": 1 - len(candidates) / n if n else 0.0,
+                "meets_accuracy": meets_accuracy,
+                "meets_budget": llm_fraction <= max_llm_fraction + 1e-12,
+            }
+            logger.info(f"Calibrated triage policy: {report}")
+            return policy, report
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def save(self, file_path: str = os.path.join("saved_models", "triage_policy.json")):
+        try:
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            with open(file_path, "w") as file_obj:
+                json.dump(asdict(self), file_obj, indent=2)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @classmethod
+    def load(cls, file_path: str = os.path.join("saved_models", "triage_policy.json")) -> "TriagePolicy":
+        """Load saved thresholds, or the defaults if nothing has been calibrated yet."""
+        try:
+            if not os.path.exists(file_path):
+                logger.info(f"No triage policy at {file_path}; using the default thresholds")
+                return cls()
+            with open(file_path) as file_obj:
+                return cls(**json.load(file_obj))
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,255 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pyarrow.parquet as pq
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+
+# Import from src directory
+from src.components.data_ingestion import DataIngestionConfig
+from src.pipelines.prediction_pipeline import PredictionPipeline
+
+
+@dataclass
+class EnrichmentJobConfig:
+    """Configuration class for the bulk enrichment job."""
+    data_path: str = DataIngestionConfig().processed_data_path
+    # Append-only JSON lines, one {"tweet_id", "summary", "entities"} record per ticket.
+    output_path: str = os.path.join("data", "enriched_tickets.jsonl")
+    # Completed tweet ids (raw int64) and the state that says how much of both files is durable.
+    ids_path: str = os.path.join("data", "enriched_tickets.ids")
+    state_path: str = os.path.join("data", "enriched_tickets.state.json")
+    llm_mode: str = "combined"
+    # Tickets talking to the LLM at once.
+    workers: int = 16
+    read_batch_size: int = 10_000
+    # Completed tickets between checkpoints; everything is checkpointed at the end.
+    checkpoint_every: int = 500
+    # Seconds between progress lines.
+    report_every: float = 10.0
+    # Stop after this many tickets in this run (None for all).
+    limit: Optional[int] = None
+
+
+class EnrichmentJob:
+    """
+    Enriches the processed tickets dataset with LLM summaries and entities.
+
+    Tickets are streamed from the Parquet dataset into a bounded queue served by
+    `workers` async workers, so memory stays flat and at most that many LLM calls
+    are in flight (LLMService's client adds the provider rate limits on top).
+    Results are appended to a JSON lines file and the tweet ids of completed
+    tickets to a binary ids file.
+
+    Every `checkpoint_every` tickets both files are fsynced and their lengths are
+    recorded in a small state file that is swapped in atomically. On start the job
+    truncates both files back to the last checkpoint (dropping records a crash
+    left half-written or unrecorded) and skips every id already completed, so an
+    interrupted run resumes where it stopped and the output never holds a ticket
+    twice. Failed tickets are logged and not checkpointed; the next run retries them.
+    """
+
+    def __init__(self, config: EnrichmentJobConfig = None, pipeline: PredictionPipeline = None):
+        self.config = config or EnrichmentJobConfig()
+        self.pipeline = pipeline or PredictionPipeline(llm_mode=self.config.llm_mode)
+        self.completed = 0
+        self.failed = 0
+        self._pending_ids = []
+        self._output = None
+        self._ids = None
+
+    def load_state(self) -> dict:
+        """The last checkpoint, or an empty one if the job has not run yet."""
+        if not os.path.exists(self.config.state_path):
+            return {"completed": 0, "output_bytes": 0}
+        with open(self.config.state_path) as file_obj:
+            return json.load(file_obj)
+
+    def completed_ids(self, state: dict) -> np.ndarray:
+        """Sorted tweet ids completed as of `state`."""
+        if not state["completed"]:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.fromfile(self.config.ids_path, dtype=np.int64, count=state["completed"]))
+
+    def repeated_ids(self) -> np.ndarray:
+        """Sorted tweet ids that appear on more than one row of the dataset."""
+        ids = pq.read_table(self.config.data_path, columns=['tweet_id']).column('tweet_id').to_numpy()
+        unique, counts = np.unique(ids, return_counts=True)
+        return unique[counts > 1]
+
+    def iter_tickets(self, done_ids: np.ndarray):
+        """
+        Yield (tweet_id, text) for every ticket with text whose id is not in `done_ids`.
+        A tweet_id can repeat in the dataset (e.g. re-ingested tickets); only its first
+        row with text is yielded. Only ids found by `repeated_ids` are remembered once
+        yielded, so memory grows with the duplicates rather than with the dataset.
+        """
+        parquet_file = pq.ParquetFile(self.config.data_path)
+        repeated = self.repeated_ids()
+        yielded = set()
+        for batch in parquet_file.iter_batches(batch_size=self.config.read_batch_size, columns=['tweet_id', 'text']):
+            ids = batch.column('tweet_id').to_numpy(zero_copy_only=False)
+            texts = batch.column('text').to_pylist()
+            todo = ~np.isin(ids, done_ids)
+            may_repeat = np.isin(ids[todo], repeated)
+            for tweet_id, text, check in zip(ids[todo].tolist(), np.asarray(texts, dtype=object)[todo],
+                                             may_repeat.tolist()):
+                if not text:
+                    continue
+                if check:
+                    if tweet_id in yielded:
+                        continue
+                    yielded.add(tweet_id)
+                yield tweet_id, text
+
+    def _open(self, state: dict):
+        os.makedirs(os.path.dirname(self.config.output_path) or ".", exist_ok=True)
+        # Anything past the checkpoint was never recorded as done; drop it so it is redone once.
+        config = self.config
+        for path, size in ((config.output_path, state["output_bytes"]), (config.ids_path, state["completed"] * 8)):
+            with open(path, "ab") as file_obj:
+                file_obj.truncate(size)
+        self._output = open(config.output_path, "ab")
+        self._ids = open(config.ids_path, "ab")
+
+    def _record(self, tweet_id: int, summary, entities):
+        record = {"tweet_id": tweet_id, "summary": getattr(summary, "content", summary), "entities": entities}
+        self._output.write(json.dumps(record).encode("utf-8") + b"\n")
+        self._pending_ids.append(tweet_id)
+        self.completed += 1
+        if len(self._pending_ids) >= self.config.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Make the records written so far durable, then record them as done."""
+        if not self._pending_ids:
+            return
+        # Records first: an id may only be marked done once its record is on disk.
+        self._output.flush()
+        os.fsync(self._output.fileno())
+        self._ids.write(np.asarray(self._pending_ids, dtype=np.int64).tobytes())
+        self._ids.flush()
+        os.fsync(self._ids.fileno())
+        self._pending_ids = []
+
+        state = {
+            "completed": self._ids.tell() // 8,
+            "output_bytes": self._output.tell(),
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(self.config.state_path + ".tmp", "w") as file_obj:
+            json.dump(state, file_obj, indent=2)
+        os.replace(self.config.state_path + ".tmp", self.config.state_path)
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            tweet_id, text = item
+            try:
+                summary, entities = await self.pipeline.aenrich(text)
+                self._record(tweet_id, summary, entities)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Enrichment of ticket {tweet_id} failed: {e}")
+
+    async def _report(self, remaining: int, start: float):
+        while True:
+            await asyncio.sleep(self.config.report_every)
+            self._log_progress(remaining, start)
+
+    def _log_progress(self, remaining: int, start: float):
+        elapsed = time.perf_counter() - start
+        done = self.completed + self.failed
+        rate = done / elapsed if elapsed else 0.0
+        eta = "unknown"
+        if rate:
+            seconds = int(max(remaining - done, 0) / rate)
+            eta = f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+        logger.info(
+            f"Enriched {self.completed}/{remaining} tickets ({self.failed} failed), {rate:.1f} tickets/s, ETA {eta}"
+        )
+
+    async def _run(self, tickets, remaining: int):
+        queue = asyncio.Queue(maxsize=self.config.workers * 2)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.config.workers)]
+        start = time.perf_counter()
+        reporter = asyncio.create_task(self._report(remaining, start))
+        try:
+            for ticket in tickets:
+                await queue.put(ticket)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            reporter.cancel()
+            for task in workers:
+                task.cancel()
+            self.checkpoint()
+            self._log_progress(remaining, start)
+
+    def run_enrichment(self):
+        """
+        Enrich every ticket not completed by an earlier run.
+
+        Returns:
+            dict: Tickets completed and failed in this run, total completed, elapsed
+                  time and the output path.
+        """
+        try:
+            config = self.config
+            state = self.load_state()
+            done_ids = self.completed_ids(state)
+            total = pq.ParquetFile(config.data_path).metadata.num_rows
+            remaining = total - len(done_ids)
+            if config.limit is not None:
+                remaining = min(remaining, config.limit)
+            logger.info(f"Enrichment job: {len(done_ids)} of {total} tickets done earlier, up to {remaining} to go")
+
+            tickets = self.iter_tickets(done_ids)
+            if config.limit is not None:
+                tickets = (ticket for _, ticket in zip(range(config.limit), tickets))
+
+            self._open(state)
+            start = time.perf_counter()
+            try:
+                asyncio.run(self._run(tickets, remaining))
+            finally:
+                self._output.close()
+                self._ids.close()
+
+            result = {
+                "completed": self.completed,
+                "failed": self.failed,
+                "total_completed": len(done_ids) + self.completed,
+                "elapsed_seconds": time.perf_counter() - start,
+                "output_path": config.output_path,
+            }
+            logger.info(f"Enrichment job finished: {result}")
+            return result
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Enrich the processed tickets with LLM summaries and entities")
+    parser.add_argument("--workers", type=int, default=16, help="Tickets enriched concurrently")
+    parser.add_argument("--limit", type=int, help="Stop after this many tickets")
+    parser.add_argument("--llm-mode", choices=["combined", "separate"], default="combined")
+    args = parser.parse_args()
+
+    EnrichmentJob(EnrichmentJobConfig(workers=args.workers, limit=args.limit, llm_mode=args.llm_mode)).run_enrichment()
@@ -0,0 +1,213 @@
+import os
+import sys
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from exception import CustomException
+from logger import logger
+
+# Import from src directory
+from src.pipelines.prediction_pipeline import PredictionPipeline
+
+
+@dataclass
+class FilePredictionConfig:
+    """Configuration class for bulk classification of a CSV or Parquet file."""
+    input_path: str = None
+    # .csv or .parquet; defaults to <input>.predictions.csv next to the input.
+    output_path: Optional[str] = None
+    text_column: str = "text"
+    # Copied to the output so predictions can be joined back (skipped if the input lacks it).
+    id_column: str = "tweet_id"
+    # Worker processes (None: one per core); 0 classifies in this process.
+    workers: Optional[int] = None
+    # Rows per task sent to a worker.
+    chunk_size: int = 10_000
+    # Seconds between progress lines.
+    report_every: float = 10.0
+
+
+# Set in each worker process by _init_worker.
+_pipeline = None
+
+
+def _init_worker():
+    """Load the model once per worker. The linear artifact is memory-mapped, so every
+    worker maps the same pages of the weight files instead of holding its own copy."""
+    global _pipeline
+    _pipeline = PredictionPipeline()
+    _pipeline.classify(["warm up"])
+
+
+def _classify_chunk(ids, texts, id_column: str, parquet: bool):
+    """
+    Classify one chunk and render it for the output file: CSV lines (no header) or an
+    Arrow table. Rendering here rather than in the parent keeps the parent's share of
+    the work, which does not parallelize, down to reading the input and writing bytes.
+    """
+    categories, confidences = _pipeline.classify(texts)
+    columns = {}
+    if ids is not None:
+        columns[id_column] = ids
+    columns["category"] = np.asarray(categories, dtype=object)
+    columns["confidence"] = np.asarray(confidences, dtype=float)
+    frame = pd.DataFrame(columns)
+    if parquet:
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    return frame.to_csv(index=False, header=False)
+
+
+class FilePredictionJob:
+    """
+    Classifies every row of a CSV or Parquet file with the saved model.
+
+    The input is streamed in chunks of `chunk_size` rows (only the text and id
+    columns are read) and the chunks are classified by a pool of worker processes,
+    each of which loads the model once. At most two chunks per worker are in
+    flight, so memory stays flat however large the file is, and results are
+    written in input order as they complete: the output has one row per input row
+    (id, category, confidence) in the same order.
+    """
+
+    OUTPUT_COLUMNS = ["category", "confidence"]
+
+    def __init__(self, config: FilePredictionConfig):
+        self.config = config
+        if self.config.output_path is None:
+            self.config.output_path = os.path.splitext(self.config.input_path)[0] + ".predictions.csv"
+        self.rows = 0
+        self._path = None
+        self._parquet = self.config.output_path.endswith(".parquet")
+        self._writer = None
+        self._file = None
+        self._has_ids = None
+
+    def iter_chunks(self):
+        """Yield (ids or None, texts) for each chunk of the input file."""
+        config = self.config
+        if config.input_path.endswith(".parquet"):
+            parquet_file = pq.ParquetFile(config.input_path)
+            columns = [config.text_column]
+            if config.id_column in parquet_file.schema_arrow.names:
+                columns.append(config.id_column)
+            self._has_ids = len(columns) > 1
+            for batch in parquet_file.iter_batches(batch_size=config.chunk_size, columns=columns):
+                ids = batch.column(config.id_column).to_numpy(zero_copy_only=False) if len(columns) > 1 else None
+                yield ids, batch.column(config.text_column).to_pylist()
+            return
+
+        header = pd.read_csv(config.input_path, nrows=0).columns
+        columns = [config.text_column] + ([config.id_column] if config.id_column in header else [])
+        self._has_ids = len(columns) > 1
+        dtypes = {config.text_column: "string"}
+        for chunk in pd.read_csv(config.input_path, usecols=columns, dtype=dtypes, chunksize=config.chunk_size):
+            ids = chunk[config.id_column].to_numpy() if len(columns) > 1 else None
+            yield ids, chunk[config.text_column].fillna("").tolist()
+
+    def _write(self, rows: int, rendered):
+        """Append one chunk rendered by _classify_chunk to the output file."""
+        if self._parquet:
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self._path, rendered.schema)
+            self._writer.write_table(rendered)
+        else:
+            if self._file is None:
+                self._file = open(self._path, "w", newline="")
+                header = ([self.config.id_column] if self._has_ids else []) + self.OUTPUT_COLUMNS
+                self._file.write(",".join(header) + "\n")
+            self._file.write(rendered)
+        self.rows += rows
+
+    def _log_progress(self, start: float):
+        elapsed = time.perf_counter() - start
+        logger.info(f"Classified {self.rows} rows, {self.rows / elapsed if elapsed else 0:.0f} rows/s")
+
+    def run(self):
+        """
+        Classify the whole file.
+
+        Returns:
+            dict: Rows classified, elapsed seconds, rows per second, workers and the output path.
+        """
+        try:
+            config = self.config
+            workers = (os.cpu_count() or 1) if config.workers is None else config.workers
+            logger.info(f"Classifying {config.input_path} into {config.output_path} "
+                        f"({workers} workers, chunks of {config.chunk_size})")
+            os.makedirs(os.path.dirname(config.output_path) or ".", exist_ok=True)
+            # Written next to the target and swapped in at the end, like the ingestion output.
+            root, extension = os.path.splitext(config.output_path)
+            self._path = root + ".tmp" + extension
+
+            start = time.perf_counter()
+            last_report = start
+            try:
+                if workers == 0:
+                    _init_worker()
+                    for ids, texts in self.iter_chunks():
+                        self._write(len(texts), _classify_chunk(ids, texts, config.id_column, self._parquet))
+                else:
+                    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                        # Submission order is output order; the window bounds memory and keeps every worker busy.
+                        pending = deque()
+                        for ids, texts in self.iter_chunks():
+                            future = pool.submit(_classify_chunk, ids, texts, config.id_column, self._parquet)
+                            pending.append((len(texts), future))
+                            if len(pending) >= 2 * workers:
+                                rows, future = pending.popleft()
+                                self._write(rows, future.result())
+                            if time.perf_counter() - last_report >= config.report_every:
+                                last_report = time.perf_counter()
+                                self._log_progress(start)
+                        while pending:
+                            rows, future = pending.popleft()
+                            self._write(rows, future.result())
+            finally:
+                if self._writer is not None:
+                    self._writer.close()
+                if self._file is not None:
+                    self._file.close()
+
+            if self.rows:
+                os.replace(self._path, config.output_path)
+            elapsed = time.perf_counter() - start
+            result = {
+                "rows": self.rows,
+                "elapsed_seconds": elapsed,
+                "rows_per_second": self.rows / elapsed if elapsed else 0.0,
+                "workers": workers,
+                "output_path": config.output_path,
+            }
+            logger.info(f"File classification finished: {result}")
+            return result
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classify every row of a CSV or Parquet file")
+    parser.add_argument("input_path")
+    parser.add_argument("--output", help="Output .csv or .parquet")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--text-column", default="text")
+    args = parser.parse_args()
+
+    FilePredictionJob(FilePredictionConfig(
+        input_path=args.input_path, output_path=args.output, text_column=args.text_column,
+        workers=args.workers, chunk_size=args.chunk_size,
+    )).run()
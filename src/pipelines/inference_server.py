@@ -0,0 +1,347 @@
+import os
+import sys
+import json
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import from root directory
+from logger import logger
+from metrics import metrics
+
+# Import from src directory
+from src.pipelines.prediction_pipeline import PredictionPipeline
+from src.components.triage_policy import TIER_LLM
+
+
+@dataclass
+class InferenceServerConfig:
+    """Configuration class for the inference server."""
+    # Micro-batching: a batch is classified once it is full or its first request has waited this long.
+    max_batch_size: int = 64
+    max_wait_ms: float = 5.0
+    # Requests waiting for classification before new ones are rejected with 503.
+    max_pending: int = 10000
+    # LLM enrichment runs on its own bounded queue with a fixed number of workers.
+    enrich_queue_size: int = 100
+    enrich_workers: int = 4
+    enrich_timeout: float = 60.0
+    max_body_bytes: int = 1 << 20
+
+
+class Overloaded(Exception):
+    """Raised when a queue is full; the server answers 503 so clients back off."""
+
+
+class MicroBatcher:
+    """
+    Collects concurrent classification requests into batches.
+
+    The first request of a batch starts a `max_wait_ms` window; the batch is
+    classified when the window closes or `max_batch_size` requests have arrived,
+    whichever comes first. The classify function runs in a worker thread so the
+    event loop keeps accepting requests meanwhile.
+    """
+
+    def __init__(self, classify_fn: Callable[[List[str]], list], max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, max_pending: int = 10000):
+        self.classify_fn = classify_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_pending = max_pending
+        self.batches = 0
+        self.items = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def submit(self, text: str) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((text, future))
+        except asyncio.QueueFull:
+            raise Overloaded("classification queue is full")
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                # Take what is already queued without paying for a timed wait.
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.classify_fn, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                # The client may have disconnected and cancelled its request.
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+class EnrichmentQueue:
+    """
+    Bounded queue of LLM enrichment jobs served by a fixed pool of async workers.
+
+    Classification never waits behind the LLM: tickets only land here after they
+    are classified, and when the queue is full new jobs are rejected right away
+    instead of piling up latency for everyone.
+    """
+
+    def __init__(self, pipeline: PredictionPipeline, max_size: int = 100, workers: int = 4):
+        self.pipeline = pipeline
+        self.max_size = max_size
+        self.workers = workers
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def submit(self, text: str):
+        """Enrich one ticket; returns (summary, entities)."""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((text, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise Overloaded("enrichment queue is full")
+        return await future
+
+    async def _worker(self):
+        while True:
+            text, future = await self._queue.get()
+            if future.done():
+                continue
+            try:
+                result = await self.pipeline.aenrich(text)
+                self.completed += 1
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Enrichment failed: {e}")
+                if not future.done():
+                    future.set_exception(e)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+class InferenceServer:
+    """
+    ASGI application serving PredictionPipeline with warm models.
+
+    Endpoints:
+        POST /predict   {"text": "...", "enrich": false} -> {"category", "confidence"[, "tier", "summary", "entities"]}
+        GET  /healthz   200 while the process is up
+        GET  /readyz    200 once the model is loaded and warmed up, 503 before
+        GET  /stats     Micro-batch, enrichment queue, LLM cache and LLM client counters, and
+                        p50/p95/p99 latencies of the pipeline stages and LLM calls
+        GET  /metrics   The same latencies and counters in the Prometheus text format
+
+    Run it with any ASGI server, e.g. `python run.py --serve`. Batches live in this
+    process, so run one server process per host (plus a load balancer in front
+    for more) rather than many ASGI workers each batching a trickle.
+    """
+
+    def __init__(self, pipeline: PredictionPipeline = None, config: InferenceServerConfig = None):
+        self.config = config or InferenceServerConfig()
+        self.pipeline = pipeline or PredictionPipeline()
+        self.batcher = MicroBatcher(
+            self._classify,
+            max_batch_size=self.config.max_batch_size,
+            max_wait_ms=self.config.max_wait_ms,
+            max_pending=self.config.max_pending,
+        )
+        self.enrichment = EnrichmentQueue(
+            self.pipeline, max_size=self.config.enrich_queue_size, workers=self.config.enrich_workers
+        )
+        self.ready = False
+        self.started_at = None
+
+    def _classify(self, texts: List[str]) -> list:
+        return self.pipeline.predict_batch(texts, chunk_size=len(texts))
+
+    async def startup(self):
+        self.batcher.start()
+        self.enrichment.start()
+        # Load the model (and the vectorizer's first pages) before taking traffic.
+        start = time.perf_counter()
+        await asyncio.get_running_loop().run_in_executor(None, self._classify, ["warm up"])
+        self.started_at = time.time()
+        self.ready = True
+        logger.info(f"Inference server ready; model warmed up in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    async def shutdown(self):
+        self.ready = False
+        await self.batcher.stop()
+        await self.enrichment.stop()
+        logger.info("Inference server stopped")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            status, payload = await self._handle(scope, receive)
+            if isinstance(payload, str):
+                body, content_type = payload.encode("utf-8"), b"text/plain; version=0.0.4; charset=utf-8"
+            else:
+                body, content_type = json.dumps(payload).encode("utf-8"), b"application/json"
+            await send({
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())],
+            })
+            await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                    await send({"type": "lifespan.startup.complete"})
+                except Exception as e:
+                    logger.error(f"Inference server failed to start: {e}")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle(self, scope, receive):
+        method, path = scope["method"], scope["path"]
+        if path == "/healthz":
+            return 200, {"status": "ok"}
+        if path == "/readyz":
+            return (200, {"status": "ready"}) if self.ready else (503, {"status": "starting"})
+        if path == "/stats":
+            return 200, {
+                "batching": self.batcher.stats(),
+                "enrichment": self.enrichment.stats(),
+                "llm_cache": self.pipeline.cache_stats(),
+                "llm_client": self.pipeline.llm_client_stats(),
+                "latency": metrics.snapshot(),
+                "uptime_seconds": time.time() - self.started_at if self.started_at else 0.0,
+            }
+        if path == "/metrics":
+            return 200, metrics.render_prometheus()
+        if path != "/predict":
+            return 404, {"error": "not found"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        if not self.ready:
+            return 503, {"error": "model is not loaded yet"}
+
+        try:
+            request = json.loads(await self._read_body(receive))
+            text = request["text"]
+            if not isinstance(text, str):
+                raise TypeError("text must be a string")
+        except ValueError as e:
+            return 400, {"error": f"invalid request: {e}"}
+        except (KeyError, TypeError) as e:
+            return 400, {"error": f"expected a JSON object with a 'text' string: {e}"}
+
+        try:
+            result = dict(await self.batcher.submit(text))
+            if request.get("enrich"):
+                result["tier"] = self.pipeline.triage([text], [result["confidence"]])[0]
+                result["summary"], result["entities"] = None, None
+                if result["tier"] == TIER_LLM:
+                    result["summary"], result["entities"] = await asyncio.wait_for(
+                        self.enrichment.submit(text), timeout=self.config.enrich_timeout
+                    )
+            return 200, _jsonable(result)
+        except Overloaded as e:
+            return 503, {"error": str(e)}
+        except asyncio.TimeoutError:
+            return 504, {"error": "enrichment timed out"}
+        except Exception as e:
+            logger.error(f"Error serving prediction: {e}")
+            return 500, {"error": "prediction failed"}
+
+    async def _read_body(self, receive) -> bytes:
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.config.max_body_bytes:
+                raise ValueError("request body too large")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+
+def _jsonable(value):
+    """Convert NumPy scalars and LangChain messages in a result to plain JSON values."""
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "content"):
+        return value.content
+    return value
+
+
+def create_app(config: InferenceServerConfig = None) -> InferenceServer:
+    """ASGI app factory, e.g. for `uvicorn --factory src.pipelines.inference_server:create_app`."""
+    return InferenceServer(config=config)
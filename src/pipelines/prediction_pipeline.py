@@ -1,8 +1,9 @@
 import os
 import sys
+import time
+import asyncio
+from typing import TYPE_CHECKING
 import numpy as np
-import dill
-import pandas as pd
 
 # Add the project root directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
@@ -10,42 +11,283 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 # Import from root directory
 from logger import logger
 from exception import CustomException
+from metrics import metrics
 
-# Import from src directory
-from src.components.llm_service import LLMService
+# Import from src directory. The LLM stack (langchain, Groq) and pandas/sklearn are
+# imported only when a prediction needs them, so classification with the linear
+# artifact starts with NumPy alone.
+from src.components.model_registry import get_model_registry
+from src.components.linear_artifact import MANIFEST_FILE
+from src.components.triage_policy import TIER_LLM, TriagePolicy
+
+if TYPE_CHECKING:
+    from src.components.llm_service import LLMService
+
+# Seconds per pipeline stage (load, dataframe, transform, predict, triage, enrich) and per
+# whole call (method = predict, apredict, predict_batch).
+STAGE_SECONDS = "prediction_stage_seconds"
+PREDICTION_SECONDS = "prediction_seconds"
+metrics.describe(STAGE_SECONDS, "Seconds spent in each prediction pipeline stage.")
+metrics.describe(PREDICTION_SECONDS, "Seconds per prediction call, end to end.")
 
 
 class PredictionPipeline:
-    def __init__(self):
+    def __init__(self, llm_service: "LLMService" = None, llm_mode: str = "separate", use_llm_cache: bool = True,
+                 semantic_cache_threshold: float = None, triage_policy: TriagePolicy = None):
+        """
+        Args:
+            llm_service (LLMService): Service used for enrichment; created on first use if omitted.
+            llm_mode (str): "separate" for one summary call plus one extraction call per ticket,
+                            "combined" for a single structured `analyze_ticket` call.
+            use_llm_cache (bool): Give the default LLMService the in-memory + SQLite response cache.
+            semantic_cache_threshold (float): If set, also give it a SemanticCache with this cosine
+                                              similarity threshold. Only the "combined" mode uses it.
+            triage_policy (TriagePolicy): If set, tickets the classifier is confident about and
+                                          that don't look urgent skip the LLM ("local" tier).
+                                          Without it every enriched ticket goes to the LLM.
+        """
+        if llm_mode not in ("separate", "combined"):
+            raise ValueError(f"Unknown llm_mode: {llm_mode}")
+        self.llm_mode = llm_mode
         self.preprocessor_path = os.path.join('saved_models', 'preprocessor.pkl')
         self.model_path = os.path.join('saved_models', 'model.pkl')
-        self.llm_Service = LLMService()
-    
+        self.linear_artifact_dir = os.path.join('saved_models', 'linear_model')
+        self._llm_service = llm_service
+        self.use_llm_cache = use_llm_cache
+        self.semantic_cache_threshold = semantic_cache_threshold
+        self.triage_policy = triage_policy
+        self.registry = get_model_registry()
+
+    @property
+    def llm_Service(self) -> "LLMService":
+        # Created on first use so classification-only runs don't need a Groq client.
+        if self._llm_service is None:
+            from src.components.llm_service import LLMService
+            from src.components.llm_cache import build_default_llm_cache
+            from src.components.semantic_cache import SemanticCache
+
+            cache = build_default_llm_cache() if self.use_llm_cache else None
+            semantic_cache = None
+            if self.semantic_cache_threshold is not None:
+                semantic_cache = SemanticCache(threshold=self.semantic_cache_threshold)
+            self._llm_service = LLMService(cache=cache, semantic_cache=semantic_cache)
+        return self._llm_service
+
+    def cache_stats(self) -> dict:
+        """Hit and miss counts of the LLM response caches (empty if there are none)."""
+        if self._llm_service is None:
+            return {}
+        stats = {}
+        if self._llm_service.cache is not None:
+            stats.update(self._llm_service.cache.stats())
+        if self._llm_service.semantic_cache is not None:
+            stats["semantic"] = self._llm_service.semantic_cache.stats()
+        return stats
+
+    def llm_client_stats(self) -> dict:
+        """Rate-limit, retry and coalescing counters of the LLM client (empty if not created yet)."""
+        if self._llm_service is None:
+            return {}
+        return self._llm_service.client_stats()
+
+    def _load_classifier(self):
+        """
+        The current model and a function that turns a list of texts into its input.
+
+        The memory-mapped linear artifact is used when it was exported from the
+        current model.pkl (its manifest records that file's sha256), or when there is
+        no model.pkl; otherwise, e.g. after incremental training, the dill
+        preprocessor and model are used.
+        """
+        with metrics.timer(STAGE_SECONDS, stage="load"):
+            if os.path.exists(os.path.join(self.linear_artifact_dir, MANIFEST_FILE)):
+                artifact = self.registry.get(self.linear_artifact_dir)
+                exported_from = artifact.manifest["source"].get("model_sha256")
+                if not os.path.exists(self.model_path) or (
+                        exported_from is not None and exported_from == self.registry.file_checksum(self.model_path)):
+                    return artifact, list
+
+            import pandas as pd
+
+            preprocessor = self.registry.get(self.preprocessor_path)
+            model = self.registry.get(self.model_path)
+
+        def transform(texts):
+            # Timed on its own: building the DataFrame is part of the "transform" stage.
+            with metrics.timer(STAGE_SECONDS, stage="dataframe"):
+                frame = pd.DataFrame({'text': texts})
+            return preprocessor.transform(frame)
+
+        return model, transform
+
+    def _classify(self, model, transform, texts):
+        """Categories and top-class probabilities (None if the model has no predict_proba)."""
+        with metrics.timer(STAGE_SECONDS, stage="transform"):
+            transformed = transform(texts)
+        with metrics.timer(STAGE_SECONDS, stage="predict"):
+            if hasattr(model, "predict_proba"):
+                probabilities = model.predict_proba(transformed)
+                best = probabilities.argmax(axis=1)
+                return model.classes_[best], [float(p) for p in probabilities[np.arange(len(texts)), best]]
+            return model.predict(transformed), [None] * len(texts)
+
+    def classify(self, texts):
+        """
+        Categories and top-class probabilities of `texts`, with no logging, triage or LLM
+        calls; the model is loaded on first use and cached by the registry.
+        """
+        model, transform = self._load_classifier()
+        return self._classify(model, transform, texts)
+
+    def triage(self, texts, confidences):
+        """The tier ("local" or "llm") each classified ticket should take."""
+        if self.triage_policy is None:
+            return [TIER_LLM] * len(texts)
+        with metrics.timer(STAGE_SECONDS, stage="triage"):
+            tiers, _ = self.triage_policy.triage(texts, confidences)
+        return tiers.tolist()
+
     def predict(self, text:str):
         try:
             logger.info("starting prediction pipeline")
+            started = time.perf_counter()
 
-            with open(self.preprocessor_path, "rb") as f:
-                preprocessor = dill.load(f)
-            with open(self.model_path, "rb") as f:
-                model = dill.load(f)
-
-            text_df  =pd.DataFrame([text], columns = ['text'])
-            text_transformed = preprocessor.transform(text_df)
-            category = model.predict(text_transformed)[0]
-            summary = self.llm_Service.get_ticket_summary(text)
-            entities  =self.llm_Service.extract_ticket_info(text)
-            logger.info("prediction pipeline completed successfully")
+            model, transform = self._load_classifier()
+            categories, confidences = self._classify(model, transform, [text])
+            tier = self.triage([text], confidences)[0]
+            summary, entities = self._enrich(text) if tier == TIER_LLM else (None, None)
+            elapsed = time.perf_counter() - started
+            metrics.observe(PREDICTION_SECONDS, elapsed, method="predict")
+            logger.info(f"prediction pipeline completed successfully ({tier} tier) in {elapsed * 1000:.1f} ms")
             return {
-                "category": category,
+                "category": categories[0],
+                "confidence": confidences[0],
+                "tier": tier,
                 "summary": summary,
                 "entities": entities
             }
-        
+
         except Exception as e:
             logger.error(f"Error in prediction pipeline: {e}")
             raise CustomException(e, sys)
-        
+
+    async def apredict(self, text: str, semaphore: asyncio.Semaphore = None):
+        """
+        Async variant of `predict` that runs the summary and entity extraction
+        LLM calls concurrently, so latency is roughly the slower of the two.
+
+        Args:
+            text (str): The ticket text.
+            semaphore (asyncio.Semaphore): Optional limit shared across tickets; the
+                                           LLM calls run while it is held.
+        """
+        try:
+            logger.info("starting async prediction pipeline")
+            started = time.perf_counter()
+
+            model, transform = self._load_classifier()
+            categories, confidences = self._classify(model, transform, [text])
+            tier = self.triage([text], confidences)[0]
+
+            summary, entities = None, None
+            if tier == TIER_LLM and semaphore is None:
+                summary, entities = await self.aenrich(text)
+            elif tier == TIER_LLM:
+                async with semaphore:
+                    summary, entities = await self.aenrich(text)
+
+            elapsed = time.perf_counter() - started
+            metrics.observe(PREDICTION_SECONDS, elapsed, method="apredict")
+            logger.info(f"async prediction pipeline completed successfully ({tier} tier) in {elapsed * 1000:.1f} ms")
+            return {
+                "category": categories[0],
+                "confidence": confidences[0],
+                "tier": tier,
+                "summary": summary,
+                "entities": entities
+            }
+
+        except Exception as e:
+            logger.error(f"Error in async prediction pipeline: {e}")
+            raise CustomException(e, sys)
+
+    def _enrich(self, text: str):
+        with metrics.timer(STAGE_SECONDS, stage="enrich"):
+            if self.llm_mode == "combined":
+                analysis = self.llm_Service.analyze_ticket(text)
+                return analysis["summary"], analysis["entities"]
+            summary = self.llm_Service.get_ticket_summary(text)
+            entities = self.llm_Service.extract_ticket_info(text)
+            return summary, entities
+
+    async def aenrich(self, text: str):
+        """LLM summary and entities for one ticket, without classifying it."""
+        with metrics.timer(STAGE_SECONDS, stage="enrich"):
+            if self.llm_mode == "combined":
+                analysis = await self.llm_Service.aanalyze_ticket(text)
+                return analysis["summary"], analysis["entities"]
+            return await asyncio.gather(
+                self.llm_Service.aget_ticket_summary(text),
+                self.llm_Service.aextract_ticket_info(text),
+            )
+
+    async def apredict_many(self, texts, max_concurrency: int = 8):
+        """
+        Run `apredict` over many tickets with at most `max_concurrency` tickets
+        talking to the LLM at once. Results are returned in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        return await asyncio.gather(*(self.apredict(text, semaphore) for text in texts))
+
+    def predict_batch(self, texts, chunk_size: int = 1000, enrich: bool = False):
+        """
+        Classify many tickets, vectorizing and predicting one chunk at a time.
+
+        Args:
+            texts (Iterable[str]): The ticket texts.
+            chunk_size (int): Number of tickets transformed and classified per call.
+            enrich (bool): Also run the LLM summary and entity extraction for the tickets
+                           the triage policy sends to the LLM tier.
+
+        Returns:
+            list[dict]: One result per input text, in input order. Each result has the
+                        predicted "category" and its "confidence" (None if the model has
+                        no predict_proba), plus "tier" and "summary"/"entities" (None on
+                        the local tier) when enriched.
+        """
+        try:
+            texts = list(texts)
+            logger.info(f"starting batch prediction for {len(texts)} tickets (chunk_size={chunk_size})")
+            started = time.perf_counter()
+
+            model, transform = self._load_classifier()
+
+            results = []
+            for start in range(0, len(texts), chunk_size):
+                chunk = texts[start:start + chunk_size]
+                categories, confidences = self._classify(model, transform, chunk)
+                tiers = self.triage(chunk, confidences) if enrich else [None] * len(chunk)
+
+                for text, category, confidence, tier in zip(chunk, categories, confidences, tiers):
+                    result = {"category": category, "confidence": confidence}
+                    if enrich:
+                        result["tier"] = tier
+                        result["summary"], result["entities"] = (
+                            self._enrich(text) if tier == TIER_LLM else (None, None)
+                        )
+                    results.append(result)
+
+            elapsed = time.perf_counter() - started
+            metrics.observe(PREDICTION_SECONDS, elapsed, method="predict_batch")
+            logger.info(
+                f"batch prediction completed successfully in {elapsed * 1000:.1f} ms; LLM cache: {self.cache_stats()}"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in batch prediction pipeline: {e}")
+            raise CustomException(e, sys)
+
 if __name__ == "__main__":
     sample_text = "I need help with my bill please"
     pipeline = PredictionPipeline()
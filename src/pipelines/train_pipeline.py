@@ -1,6 +1,7 @@
 import os
 import sys
-import numpy as np
+import argparse
+import pandas as pd
 
 # Add the project root directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
@@ -10,44 +11,57 @@ from exception import CustomException
 from logger import logger
 
 # Import from src directory
+from src.components.data_ingestion import DataIngestion, DataIngestionConfig
 from src.components.data_transformation import DataTransformation
+from src.components.near_duplicates import NearDuplicateDetector, NearDuplicateConfig
+from src.components.token_store import TokenStore
 from src.components.model_trainer import ModelTrainer
+from src.components.incremental_trainer import IncrementalTrainer, IncrementalTrainerConfig
+from src.components.triage_policy import TriagePolicy
 
-def run_training_pipeline():
+def ensure_processed_data():
+    """Path to the processed tickets dataset, running ingestion first if it doesn't exist yet."""
+    data_path = DataIngestionConfig().processed_data_path
+    if not os.path.exists(data_path):
+        logger.info("Processed dataset not found, running data ingestion")
+        data_path = DataIngestion().initiate_data_ingestion()
+    return data_path
+
+def load_training_data():
+    """Load the processed tickets dataset into memory."""
+    return pd.read_parquet(ensure_processed_data(), columns=['text', 'category'])
+
+def load_token_store():
+    """The processed dataset's text, tokenized on first use and again only when the dataset changes."""
+    return TokenStore().sync(ensure_processed_data())
+
+def near_duplicate_detector(threshold=None):
+    """A NearDuplicateDetector for the given Jaccard threshold, or None to keep every ticket."""
+    if threshold is None:
+        return None
+    return NearDuplicateDetector(NearDuplicateConfig(threshold=threshold))
+
+def run_training_pipeline(dedup_threshold=None, use_token_store=False):
     """Run the full training pipeline from data transformation to model training."""
     try:
-       
-        data_path = os.path.join('data', 'processed_tickets.csv')
-        
+        df = load_training_data()
+
         logger.info("Starting data transformation process")
-        data_transformation = DataTransformation()        
-        X_train_processed, X_test_processed, y_train, y_test, preprocessor_path = data_transformation.initiate_data_transformation(data_path)
-        
-    
-        logger.info("Preparing training and test arrays")
-    
-        if hasattr(X_train_processed, 'toarray'):
-            X_train_dense = X_train_processed.toarray()
-        else:
-            X_train_dense = np.array(X_train_processed)
-            
-        if hasattr(X_test_processed, 'toarray'):
-            X_test_dense = X_test_processed.toarray()
-        else:
-            X_test_dense = np.array(X_test_processed)
-        
-        
-        logger.info(f"X_train_dense shape: {X_train_dense.shape}")
-        logger.info(f"y_train shape: {np.array(y_train).shape}")
-        train_arr = np.column_stack((X_train_dense, y_train))
-        test_arr = np.column_stack((X_test_dense, y_test))
-    
-        logger.info(f"Final training array shape: {train_arr.shape}")
-        logger.info(f"Final test array shape: {test_arr.shape}")
-    
+        data_transformation = DataTransformation(
+            near_duplicates=near_duplicate_detector(dedup_threshold),
+            token_store=load_token_store() if use_token_store else None,
+        )
+        X_train, y_train, X_test, y_test, preprocessor_path = data_transformation.initiate_data_transformation(
+            df, target_column_name='category'
+        )
+
+        # Features stay sparse (CSR) and labels stay a separate vector.
+        logger.info(f"X_train shape: {X_train.shape} ({X_train.nnz} non-zeros)")
+        logger.info(f"y_train shape: {y_train.shape}")
+
         logger.info("Starting model training process")
         model_trainer = ModelTrainer()
-        model_trainer.initiate_model_training(train_arr, test_arr)
+        model_trainer.initiate_model_training(X_train, y_train, X_test, y_test)
         
         logger.info("Training pipeline completed successfully!")
         return True
@@ -55,5 +69,84 @@ def run_training_pipeline():
         logger.error(f"Error in training pipeline: {e}")
         raise CustomException(e, sys)
 
+def run_hyperparameter_search(dedup_threshold=None):
+    """Tune the TF-IDF settings and classifier with successive halving, then save the best pair."""
+    try:
+        df = load_training_data()
+        data_transformation = DataTransformation(near_duplicates=near_duplicate_detector(dedup_threshold))
+        X_train, X_test, y_train, y_test = data_transformation.split_data(df, target_column_name='category')
+        X_train, y_train = data_transformation.drop_near_duplicates(X_train, y_train)
+
+        model_trainer = ModelTrainer()
+        result = model_trainer.initiate_hyperparameter_search(X_train, y_train, X_test, y_test)
+
+        logger.info(f"Hyperparameter search completed: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Error in hyperparameter search: {e}")
+        raise CustomException(e, sys)
+
+def run_incremental_training(classifier="sgd", resume=True):
+    """Train the classifier batch by batch from the processed dataset, resuming from the last checkpoint."""
+    try:
+        config = IncrementalTrainerConfig(data_path=ensure_processed_data(), classifier=classifier, resume=resume)
+        result = IncrementalTrainer(config).initiate_incremental_training()
+
+        logger.info(f"Incremental training completed: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Error in incremental training: {e}")
+        raise CustomException(e, sys)
+
+def run_triage_calibration(max_llm_fraction=0.3, min_local_accuracy=0.95):
+    """Tune the triage confidence threshold on the held-out split and save it to saved_models/."""
+    try:
+        # Imported here: the prediction pipeline isn't needed for any other training mode.
+        from src.pipelines.prediction_pipeline import PredictionPipeline
+
+        df = load_training_data()
+        # Same split as training, so the trained model has not seen these tickets.
+        _, X_test, _, y_test = DataTransformation().split_data(df, target_column_name='category')
+        texts = X_test['text'].tolist()
+        results = PredictionPipeline().predict_batch(texts)
+
+        confidences = [result["confidence"] for result in results]
+        if any(confidence is None for confidence in confidences):
+            raise ValueError("The saved model has no predict_proba; triage needs class probabilities")
+        correct = [result["category"] == label for result, label in zip(results, y_test)]
+        urgency = TriagePolicy().urgency_scores(texts)
+
+        policy, report = TriagePolicy.calibrate(
+            confidences, urgency, correct,
+            max_llm_fraction=max_llm_fraction, min_local_accuracy=min_local_accuracy,
+        )
+        policy.save()
+        logger.info(f"Triage policy saved: {report}")
+        return report
+    except Exception as e:
+        logger.error(f"Error in triage calibration: {e}")
+        raise CustomException(e, sys)
+
 if __name__ == "__main__":
-    run_training_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the ticket classifier")
+    parser.add_argument("--search", action="store_true", help="Run the successive halving hyperparameter search")
+    parser.add_argument("--incremental", action="store_true", help="Train out of core with partial_fit, resuming from the last checkpoint")
+    parser.add_argument("--classifier", choices=["sgd", "nb", "pa"], default="sgd", help="Classifier for --incremental")
+    parser.add_argument("--from-scratch", action="store_true", help="With --incremental, ignore the saved checkpoint")
+    parser.add_argument("--dedup", type=float, nargs="?", const=0.8, metavar="THRESHOLD",
+                        help="Drop near-duplicate tickets (MinHash Jaccard >= THRESHOLD, default 0.8) from the training split")
+    parser.add_argument("--token-store", action="store_true",
+                        help="Build the TF-IDF features from data/token_store (built once per dataset) instead of the text")
+    parser.add_argument("--calibrate-triage", action="store_true", help="Tune the LLM triage threshold on held-out tickets")
+    parser.add_argument("--llm-budget", type=float, default=0.3, help="With --calibrate-triage, max share of tickets sent to the LLM")
+    parser.add_argument("--min-local-accuracy", type=float, default=0.95, help="With --calibrate-triage, accuracy the local tier must keep")
+    args = parser.parse_args()
+
+    if args.calibrate_triage:
+        run_triage_calibration(max_llm_fraction=args.llm_budget, min_local_accuracy=args.min_local_accuracy)
+    elif args.incremental:
+        run_incremental_training(classifier=args.classifier, resume=not args.from_scratch)
+    elif args.search:
+        run_hyperparameter_search(dedup_threshold=args.dedup)
+    else:
+        run_training_pipeline(dedup_threshold=args.dedup, use_token_store=args.token_store)
\ No newline at end of file
@@ -1,6 +1,5 @@
 import sys
 import os
-import numpy as np
 import pandas as pd
 
 # =================================================================
@@ -52,35 +51,15 @@ def run_training_pipeline():
             target_column_name=target_column
         )
 
-        # --- Prepare Arrays for Model Training ---
-        logger.info("Preparing training and test arrays")
-        
-        # Convert sparse matrix from TF-IDF to a dense array
-        X_train_dense = X_train.toarray()
-        X_test_dense = X_test.toarray()
-        
-        # Reshape the 1D target arrays (y_train, y_test) into 2D column vectors
-        y_train_reshaped = np.array(y_train).reshape(-1, 1)
-        y_test_reshaped = np.array(y_test).reshape(-1, 1)
-        
-        logger.info(f"Shape of X_train_dense: {X_train_dense.shape}")
-        logger.info(f"Shape of y_train_reshaped: {y_train_reshaped.shape}")
-        
-        # --- PREVENTATIVE MEASURE ---
-        # Assert shapes before concatenating to catch any final mismatches.
-        assert X_train_dense.shape[0] == y_train_reshaped.shape[0], "CRITICAL: Row count mismatch before combining train arrays!"
-        assert X_test_dense.shape[0] == y_test_reshaped.shape[0], "CRITICAL: Row count mismatch before combining test arrays!"
-
-        # Combine features and target into a single array for the model trainer
-        train_arr = np.hstack([X_train_dense, y_train_reshaped])
-        test_arr = np.hstack([X_test_dense, y_test_reshaped])
-        
-        logger.info(f"Successfully created combined train array with shape: {train_arr.shape}")
+        # The TF-IDF features stay a sparse CSR matrix and the labels a separate
+        # vector all the way into the trainer; nothing is densified or stacked.
+        logger.info(f"Shape of X_train: {X_train.shape} ({X_train.nnz} non-zeros)")
+        logger.info(f"Shape of y_train: {y_train.shape}")
 
         # --- Model Training ---
         logger.info("Starting model training")
         model_trainer = ModelTrainer()
-        model_trainer.initiate_model_training(train_array=train_arr, test_array=test_arr)
+        model_trainer.initiate_model_training(X_train, y_train, X_test, y_test)
         
         logger.info("="*50)
         logger.info("TRAINING PIPELINE COMPLETED SUCCESSFULLY")
@@ -0,0 +1,64 @@
+import os
+import sys
+import asyncio
+import threading
+
+import pytest
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fakes import FakeTicketChatModel, build_saved_models
+
+_count_lock = threading.Lock()
+
+
+class CountingChatModel(FakeTicketChatModel):
+    """FakeTicketChatModel that counts its calls and the most it had in flight at once."""
+    calls: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+    def _enter(self):
+        with _count_lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _exit(self):
+        with _count_lock:
+            self.in_flight -= 1
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self._enter()
+        try:
+            return super()._generate(messages, stop, run_manager, **kwargs)
+        finally:
+            self._exit()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self._enter()
+        try:
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+        finally:
+            self._exit()
+
+
+def run(coroutine):
+    """Run a coroutine to completion in a fresh event loop."""
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture(scope="session")
+def saved_models_dir(tmp_path_factory):
+    """A directory holding saved_models/ with a small TF-IDF + LogisticRegression model."""
+    work_dir = tmp_path_factory.mktemp("models")
+    build_saved_models(str(work_dir))
+    return work_dir
+
+
+@pytest.fixture
+def in_saved_models_dir(saved_models_dir, monkeypatch):
+    """Run the test from the directory whose saved_models/ PredictionPipeline loads."""
+    monkeypatch.chdir(saved_models_dir)
+    return saved_models_dir
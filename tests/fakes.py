@@ -0,0 +1,194 @@
+"""
+Test doubles, so the suite does not depend on the benchmark scripts.
+
+FakeTicketChatModel answers like the LLM would, in the shapes LLMService
+parses; FakeLLMEndpoint serves those answers over HTTP in the Groq wire format
+with a requests/min quota; build_saved_models trains a small TF-IDF +
+LogisticRegression model into saved_models/.
+"""
+
+import os
+import json
+import time
+import socket
+import asyncio
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+SUMMARY = "The customer reports a problem and asks for help."
+ENTITIES = {"customer_name": None, "issue_type": "technical", "urgency": "medium", "contact_method": None}
+
+
+def reply_content(prompt: str) -> str:
+    """The canned answer to one of LLMService's prompts."""
+    if '"summary"' in prompt:
+        return json.dumps({"summary": SUMMARY, "entities": ENTITIES})
+    if '"issue_type"' in prompt:
+        return json.dumps(ENTITIES)
+    if "JSON" in prompt:
+        return json.dumps({"customer_name": None, "product_name": None, "order_id": None})
+    return SUMMARY
+
+
+class FakeTicketChatModel(BaseChatModel):
+    latency: float = 0.1
+    """Seconds to wait before answering each call."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-ticket-chat-model"
+
+    def _respond(self, messages) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        content = reply_content(prompt)
+        message = AIMessage(content=content, usage_metadata={
+            "input_tokens": len(prompt.split()),
+            "output_tokens": len(content.split()),
+            "total_tokens": len(prompt.split()) + len(content.split()),
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._respond(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._respond(messages)
+
+
+class FakeLLMEndpoint:
+    """
+    ASGI app answering POST .../chat/completions with `reply_content`, after
+    `latency` seconds. Past `requests_per_minute` (over a sliding window of
+    `window_seconds`, scaled down from the minute) it answers 429 with a
+    Retry-After header, as Groq does.
+    """
+
+    def __init__(self, requests_per_minute: float, window_seconds: float = 1.0, latency: float = 0.01):
+        self.request_limit = requests_per_minute * window_seconds / 60
+        self.window = window_seconds
+        self.latency = latency
+        self.accepted = 0
+        self.rejected = 0
+        self._recent = deque()
+        self.url = None
+
+    def _retry_after(self):
+        """None if a call fits the quota now, else the seconds until one would."""
+        now = time.monotonic()
+        while self._recent and self._recent[0] <= now - self.window:
+            self._recent.popleft()
+        if len(self._recent) + 1 > self.request_limit:
+            return max(0.01, self._recent[0] + self.window - now) if self._recent else self.window
+        self._recent.append(now)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        request = json.loads(body)
+        prompt = "\n".join(str(message["content"]) for message in request["messages"])
+
+        wait = self._retry_after()
+        if wait is not None:
+            self.rejected += 1
+            return await self._send(send, 429, {"error": {"message": "Rate limit reached",
+                                                          "code": "rate_limit_exceeded"}},
+                                    headers=[(b"retry-after", f"{wait:.3f}".encode())])
+
+        self.accepted += 1
+        content = reply_content(prompt)
+        await asyncio.sleep(self.latency)
+        await self._send(send, 200, {
+            "id": f"chatcmpl-{self.accepted}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "stop", "logprobs": None}],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(content.split()),
+                      "total_tokens": len(prompt.split()) + len(content.split())},
+        })
+
+    @staticmethod
+    async def _send(send, status, payload, headers=()):
+        body = json.dumps(payload).encode("utf-8")
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode()), *headers]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def serve_in_thread(endpoint: FakeLLMEndpoint):
+    """Start the endpoint on a free local port in a daemon thread; sets `endpoint.url`."""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(endpoint, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    endpoint.url = f"http://127.0.0.1:{port}"
+    return server
+
+
+TOPICS = {
+    "Billing/Order": "payment charged twice refund invoice order bill delivery",
+    "Technical Issue": "app crashes error update phone battery screen broken",
+    "General Inquiry": "question how hours store open info support",
+}
+
+
+def labeled_tickets(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Short tickets mixing a few words of their category with filler words."""
+    rng = np.random.default_rng(seed)
+    filler = np.array([f"w{i}" for i in range(200)])
+    categories = rng.choice(list(TOPICS), size=rows)
+    texts = [
+        " ".join(rng.permutation(list(rng.choice(TOPICS[category].split(), size=rng.integers(1, 4)))
+                                 + list(rng.choice(filler, size=rng.integers(2, 10)))))
+        for category in categories
+    ]
+    return pd.DataFrame({"text": texts, "category": categories})
+
+
+def build_saved_models(work_dir: str, rows: int = 500):
+    """Train a TF-IDF + LogisticRegression model into work_dir/saved_models, with its linear artifact."""
+    from sklearn.linear_model import LogisticRegression
+    from src.components.data_transformation import DataTransformation
+    from src.components.linear_artifact import export_linear_artifact
+    from utils import save_object
+
+    df = labeled_tickets(rows)
+    preprocessor = DataTransformation().get_data_transformer_object()
+    model = LogisticRegression(max_iter=1000)
+    model.fit(preprocessor.fit_transform(df[["text"]]), df["category"])
+    saved = os.path.join(work_dir, "saved_models")
+    save_object(os.path.join(saved, "preprocessor.pkl"), preprocessor)
+    save_object(os.path.join(saved, "model.pkl"), model)
+    export_linear_artifact(preprocessor, model, os.path.join(saved, "linear_model"),
+                           model_path=os.path.join(saved, "model.pkl"))
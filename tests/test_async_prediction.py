@@ -0,0 +1,52 @@
+import time
+
+from conftest import CountingChatModel, run
+from src.components.llm_service import LLMService
+from src.pipelines.prediction_pipeline import PredictionPipeline
+
+TICKET = "@AppleSupport my iphone keeps restarting after the update, please help"
+
+
+def test_async_methods_return_what_the_sync_ones_do():
+    service = LLMService(model=CountingChatModel(latency=0))
+
+    summary = run(service.aget_ticket_summary(TICKET))
+    entities = run(service.aextract_ticket_info(TICKET))
+
+    assert summary.content == service.get_ticket_summary(TICKET).content
+    assert entities == service.extract_ticket_info(TICKET)
+    assert service.model.calls == 4
+
+
+def test_apredict_runs_summary_and_extraction_concurrently(in_saved_models_dir):
+    latency = 0.3
+    pipeline = PredictionPipeline(llm_service=LLMService(model=CountingChatModel(latency=latency)))
+    pipeline.classify([TICKET])  # load the model outside the timed calls
+
+    start = time.perf_counter()
+    expected = pipeline.predict(TICKET)
+    sequential = time.perf_counter() - start
+    start = time.perf_counter()
+    result = run(pipeline.apredict(TICKET))
+    concurrent = time.perf_counter() - start
+
+    assert sequential >= 2 * latency
+    assert concurrent < 1.5 * latency
+    assert pipeline.llm_Service.model.max_in_flight == 2
+    assert result["category"] == expected["category"]
+    assert result["summary"].content == expected["summary"].content
+    assert result["entities"] == expected["entities"]
+
+
+def test_apredict_many_limits_tickets_in_flight(in_saved_models_dir):
+    model = CountingChatModel(latency=0.05)
+    pipeline = PredictionPipeline(llm_service=LLMService(model=model))
+    texts = [f"{TICKET} (order {i})" for i in range(6)]
+
+    results = run(pipeline.apredict_many(texts, max_concurrency=2))
+
+    assert len(results) == len(texts)
+    assert all(result["tier"] == "llm" and result["summary"] is not None for result in results)
+    # Two tickets at a time, each with its summary and extraction call in flight.
+    assert model.calls == 2 * len(texts)
+    assert model.max_in_flight == 4
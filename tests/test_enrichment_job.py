@@ -0,0 +1,55 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from conftest import CountingChatModel
+from src.components.llm_service import LLMService
+from src.pipelines.enrichment_job import EnrichmentJob, EnrichmentJobConfig
+from src.pipelines.prediction_pipeline import PredictionPipeline
+
+
+def make_job(tmp_path, tweet_ids, read_batch_size=3, limit=None):
+    data_path = str(tmp_path / "tickets.parquet")
+    pd.DataFrame({
+        "tweet_id": np.asarray(tweet_ids, dtype=np.int64),
+        "text": [f"ticket {tweet_id} row {row}" for row, tweet_id in enumerate(tweet_ids)],
+    }).to_parquet(data_path)
+    config = EnrichmentJobConfig(
+        data_path=data_path,
+        output_path=str(tmp_path / "enriched.jsonl"),
+        ids_path=str(tmp_path / "enriched.ids"),
+        state_path=str(tmp_path / "enriched.state.json"),
+        workers=2,
+        read_batch_size=read_batch_size,
+        checkpoint_every=2,
+        limit=limit,
+    )
+    pipeline = PredictionPipeline(llm_service=LLMService(model=CountingChatModel(latency=0)))
+    return EnrichmentJob(config, pipeline)
+
+
+def output_ids(job):
+    with open(job.config.output_path) as file_obj:
+        return [json.loads(line)["tweet_id"] for line in file_obj]
+
+
+def test_repeated_tweet_ids_are_yielded_once(tmp_path):
+    # 5 repeats within a batch, 2 and 7 across batches of 3 rows.
+    job = make_job(tmp_path, [2, 5, 5, 7, 1, 2, 9, 7, 5])
+
+    assert job.repeated_ids().tolist() == [2, 5, 7]
+    assert [tweet_id for tweet_id, _ in job.iter_tickets(np.array([1, 1, 9]))] == [2, 5, 7]
+    assert [text for _, text in job.iter_tickets(np.empty(0, dtype=np.int64))][:2] == ["ticket 2 row 0", "ticket 5 row 1"]
+
+
+def test_resumed_run_enriches_every_ticket_once(tmp_path):
+    tweet_ids = [4, 8, 8, 15, 16, 4, 23, 42, 15, 42]
+    job = make_job(tmp_path, tweet_ids, limit=3)
+    assert job.run_enrichment()["completed"] == 3
+
+    job = make_job(tmp_path, tweet_ids)
+    result = job.run_enrichment()
+
+    assert result["total_completed"] == 6
+    assert sorted(output_ids(job)) == sorted(set(tweet_ids))
@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.incremental_trainer import IncrementalTrainer, IncrementalTrainerConfig
+from utils import file_sha256, load_object, save_object
+
+CATEGORIES = ["billing", "technical", "account"]
+
+
+def write_tickets(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, len(CATEGORIES), size=rows)
+    texts = [f"ticket {seed} {i} about my {CATEGORIES[label]} problem" for i, label in enumerate(labels)]
+    pd.DataFrame({"text": texts, "category": [CATEGORIES[label] for label in labels]}).to_parquet(
+        path, row_group_size=40
+    )
+
+
+@pytest.fixture
+def make_trainer(tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", "sqlite:///" + str(tmp_path / "mlflow.db"))
+    data_path = str(tmp_path / "tickets.parquet")
+
+    def make(rows=None, seed=0, **overrides):
+        if rows is not None:
+            write_tickets(data_path, rows, seed)
+        config = IncrementalTrainerConfig(
+            data_path=data_path,
+            trained_model_file_path=str(tmp_path / "saved_models" / "model.pkl"),
+            preprocessor_file_path=str(tmp_path / "saved_models" / "preprocessor.pkl"),
+            checkpoint_dir=str(tmp_path / "saved_models" / "incremental"),
+            batch_size=25,
+            checkpoint_every=1,
+            n_features=2 ** 10,
+            **overrides,
+        )
+        return IncrementalTrainer(config)
+
+    return make
+
+
+def test_resumed_run_trains_only_appended_rows(make_trainer):
+    assert make_trainer(rows=100).initiate_incremental_training()["rows_trained"] == 100
+
+    # Same first 100 rows, 30 more at the end.
+    result = make_trainer(rows=130).initiate_incremental_training()
+
+    assert result["rows_trained"] == 30
+    assert result["rows_consumed"] == 130
+
+
+def test_replaced_dataset_is_trained_from_scratch(make_trainer):
+    make_trainer(rows=100).initiate_incremental_training()
+
+    result = make_trainer(rows=130, seed=1).initiate_incremental_training()
+
+    assert result["rows_trained"] == 130
+
+
+def test_serving_pickles_change_only_when_a_run_finishes(make_trainer, monkeypatch):
+    trainer = make_trainer(rows=100)
+    config = trainer.config
+    save_object(config.trained_model_file_path, "serving model")
+
+    # The run dies after two checkpoints.
+    batches = trainer.iter_batches
+
+    def dying_batches(start_row=0):
+        for i, batch in enumerate(batches(start_row)):
+            if i == 2:
+                raise RuntimeError("killed")
+            yield batch
+
+    monkeypatch.setattr(trainer, "iter_batches", dying_batches)
+    with pytest.raises(Exception):
+        trainer.initiate_incremental_training()
+    assert load_object(config.trained_model_file_path) == "serving model"
+
+    result = make_trainer().initiate_incremental_training()
+
+    assert result["rows_trained"] == 50
+    assert file_sha256(config.trained_model_file_path) == file_sha256(
+        os.path.join(config.checkpoint_dir, "model.pkl"))
+    assert hasattr(load_object(config.trained_model_file_path), "classes_")
+
+
+def test_other_trainers_replacing_the_serving_model_do_not_block_resuming(make_trainer):
+    trainer = make_trainer(rows=100)
+    trainer.initiate_incremental_training()
+    save_object(trainer.config.trained_model_file_path, "model from a --train run")
+
+    result = make_trainer(rows=130).initiate_incremental_training()
+
+    assert result["rows_trained"] == 30
+    assert hasattr(load_object(trainer.config.trained_model_file_path), "classes_")
+
+
+def test_checkpoint_with_other_settings_is_not_resumed(make_trainer):
+    make_trainer(rows=100).initiate_incremental_training()
+
+    assert make_trainer(classifier="nb").initiate_incremental_training()["rows_trained"] == 100
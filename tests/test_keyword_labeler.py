@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.keyword_labeler import DEFAULT_KEYWORDS, KeywordLabeler
+
+
+def assign_category(text, keywords=DEFAULT_KEYWORDS):
+    """The exploration notebook's per-row labeling, which KeywordLabeler reproduces."""
+    if not isinstance(text, str):
+        return "Uncategorized"
+    text = text.lower()
+    for category, words in keywords.items():
+        if any(word in text for word in words):
+            return category
+    return "General Inquiry"
+
+
+def test_the_first_category_in_priority_order_wins():
+    texts = pd.Series(["my order arrived with an error", "How to get a refund?", "the app keeps crashing"])
+
+    assert KeywordLabeler().label(texts).tolist() == ["Technical Issue", "Billing/Order", "Technical Issue"]
+    reversed_priority = KeywordLabeler(priority=list(DEFAULT_KEYWORDS)[::-1])
+    assert reversed_priority.label(texts).tolist() == ["Billing/Order", "General Inquiry", "Technical Issue"]
+
+
+def test_labels_match_the_notebook_row_by_row():
+    rng = np.random.default_rng(0)
+    words = ["ERROR", "order", "help", "not working", "hello", "invoice", "Down", "how to", "thanks", "crash"]
+    texts = [" ".join(rng.choice(words, size=rng.integers(0, 4))) for _ in range(300)]
+    texts += [None, np.nan, 42, "", "downtown brokerage"]
+    series = pd.Series(texts, dtype=object, index=np.arange(1000, 1000 + len(texts)))
+
+    labels = KeywordLabeler().label(series)
+
+    assert labels.tolist() == [assign_category(text) for text in texts]
+    assert (labels.index == series.index).all()
+
+
+def test_keywords_are_matched_literally(tmp_path):
+    path = tmp_path / "keywords.json"
+    path.write_text(json.dumps({"Pricing": ["$5", "c++"], "Other": ["a.b"]}))
+    labeler = KeywordLabeler.from_json(str(path), default_label="None")
+
+    labels = labeler.label(pd.Series(["costs $5", "I use C++", "axb", "a.b"], dtype="string"))
+
+    assert labels.tolist() == ["Pricing", "Pricing", "None", "Other"]
+
+
+def test_priority_must_only_name_known_categories():
+    with pytest.raises(ValueError):
+        KeywordLabeler(priority=["Technical Issue", "Refunds"])
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from src.components.linear_artifact import LinearTextClassifier, export_linear_artifact
+
+TOPICS = {
+    "billing": "charged twice refund invoice payment card bill",
+    "technical": "app crashes update phone battery screen error",
+    "account": "password reset locked login email account access",
+}
+FILLER = "please help my the not working again today why is this still".split()
+
+
+def tickets(n, seed=0, categories=tuple(TOPICS)):
+    rng = np.random.default_rng(seed)
+    labels = rng.choice(categories, size=n)
+    texts = []
+    for label in labels:
+        words = list(rng.choice(TOPICS[label].split(), size=rng.integers(1, 5))) + list(
+            rng.choice(FILLER, size=rng.integers(0, 8)))
+        rng.shuffle(words)
+        texts.append(" ".join(words).capitalize() + rng.choice(["", "!", " @AppleSupport", " https://t.co/x"]))
+    return pd.DataFrame({"text": texts}), labels
+
+
+def fitted_pipeline(vectorizer, model, categories=tuple(TOPICS)):
+    X, y = tickets(300, categories=categories)
+    preprocessor = ColumnTransformer([("text_processing", Pipeline([("tfidf", vectorizer)]), "text")],
+                                     remainder="drop", sparse_threshold=1.0)
+    model.fit(preprocessor.fit_transform(X), y)
+    return preprocessor, model
+
+
+def assert_parity(tmp_path, preprocessor, model):
+    artifact = LinearTextClassifier.load(export_linear_artifact(preprocessor, model, str(tmp_path / "artifact")))
+    X, _ = tickets(100, seed=1)
+    # Unseen words, empty and stop-word-only tickets too.
+    texts = X["text"].tolist() + ["", "the and of", "completely unseen words here", "REFUND REFUND refund"]
+    features = preprocessor.transform(pd.DataFrame({"text": texts}))
+
+    assert (artifact.predict(texts) == model.predict(features)).all()
+    assert np.allclose(artifact.decision_function(texts).ravel(), model.decision_function(features).ravel())
+    if hasattr(model, "predict_proba"):
+        assert np.allclose(artifact.predict_proba(texts), model.predict_proba(features))
+
+
+VECTORIZERS = [
+    dict(),
+    dict(stop_words="english", max_features=20),
+    dict(ngram_range=(1, 2), sublinear_tf=True),
+    dict(ngram_range=(2, 3), stop_words="english"),
+    dict(binary=True, norm="l1"),
+    dict(use_idf=False, norm=None, sublinear_tf=True),
+]
+
+
+@pytest.mark.parametrize("settings", VECTORIZERS)
+def test_logistic_regression_matches_sklearn(tmp_path, settings):
+    assert_parity(tmp_path, *fitted_pipeline(TfidfVectorizer(**settings), LogisticRegression(max_iter=1000)))
+
+
+@pytest.mark.parametrize("settings", VECTORIZERS)
+def test_sgd_log_loss_matches_sklearn(tmp_path, settings):
+    assert_parity(tmp_path, *fitted_pipeline(TfidfVectorizer(**settings),
+                                             SGDClassifier(loss="log_loss", random_state=0)))
+
+
+@pytest.mark.parametrize("model", [
+    LogisticRegression(max_iter=1000),
+    LogisticRegression(solver="liblinear"),
+    SGDClassifier(loss="log_loss", random_state=0),
+    SGDClassifier(loss="hinge", random_state=0),
+])
+def test_binary_models_match_sklearn(tmp_path, model):
+    preprocessor, model = fitted_pipeline(TfidfVectorizer(ngram_range=(1, 2)), model, categories=("billing", "account"))
+    assert_parity(tmp_path, preprocessor, model)
+
+
+def test_naive_bayes_on_counts_matches_sklearn(tmp_path):
+    preprocessor, model = fitted_pipeline(CountVectorizer(ngram_range=(1, 2)), MultinomialNB(alpha=0.1))
+    artifact = LinearTextClassifier.load(export_linear_artifact(preprocessor, model, str(tmp_path / "artifact")))
+    X, _ = tickets(50, seed=2)
+
+    features = preprocessor.transform(X)
+    assert (artifact.predict(X["text"].tolist()) == model.predict(features)).all()
+    assert np.allclose(artifact.predict_proba(X["text"].tolist()), model.predict_proba(features))
+
+
+def test_unsupported_preprocessors_are_refused(tmp_path):
+    preprocessor, model = fitted_pipeline(TfidfVectorizer(strip_accents="unicode"), LogisticRegression())
+
+    with pytest.raises(ValueError):
+        export_linear_artifact(preprocessor, model, str(tmp_path / "artifact"))
@@ -0,0 +1,106 @@
+import time
+
+from conftest import CountingChatModel
+from src.components.llm_cache import (
+    InMemoryLRUCache, SQLiteCache, TieredCache, make_cache_key, normalize_ticket_text,
+)
+from src.components.llm_service import LLMService
+from src.pipelines.prediction_pipeline import PredictionPipeline
+
+TICKET = "@AppleSupport my iphone keeps restarting after the update"
+
+
+def test_retweets_links_and_customer_handles_share_a_key():
+    key = make_cache_key("summary", TICKET, "v1", "model")
+
+    assert make_cache_key("summary", f"RT @115712:  {TICKET.upper()}  ", "v1", "model") == key
+    assert normalize_ticket_text("@105835 see https://t.co/abc now") == normalize_ticket_text("@9 see http://x.io now")
+    # Brand handles, the prompt version and the model all change the answer.
+    assert normalize_ticket_text("@AppleSupport hi") != normalize_ticket_text("@AmazonHelp hi")
+    assert make_cache_key("summary", TICKET, "v2", "model") != key
+    assert make_cache_key("summary", TICKET, "v1", "other-model") != key
+    assert make_cache_key("extract", TICKET, "v1", "model") != key
+
+
+def test_repeated_tickets_do_not_reach_the_model():
+    model = CountingChatModel(latency=0)
+    service = LLMService(model=model, cache=InMemoryLRUCache())
+
+    first = (service.get_ticket_summary(TICKET).content, service.extract_ticket_info(TICKET))
+    again = (service.get_ticket_summary(f"RT @12345: {TICKET}").content, service.extract_ticket_info(TICKET + "  "))
+
+    assert again == first
+    assert model.calls == 2
+    assert service.cache.stats()["hits"] == 2
+    assert service.cache.stats()["misses"] == 2
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryLRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite")
+    cache = SQLiteCache(path)
+    cache.set("key", {"summary": "text"})
+    cache.close()
+
+    reopened = SQLiteCache(path)
+    assert reopened.get("key") == {"summary": "text"}
+    assert len(reopened) == 1
+
+
+def test_sqlite_cache_expires_entries_after_ttl(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "llm_cache.sqlite"), ttl_seconds=0.05)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    time.sleep(0.1)
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_sqlite_cache_evicts_least_recently_used_past_max_entries(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "llm_cache.sqlite"), max_entries=10)
+    for i in range(10):
+        cache.set(f"key{i}", i)
+        time.sleep(0.001)  # distinct access times
+    cache.get("key0")
+    cache.set("key10", 10)
+
+    # Back to 90% of max_entries, dropping the entries used longest ago.
+    assert len(cache) == 9
+    assert cache.get("key0") == 0
+    assert cache.get("key10") == 10
+    assert cache.get("key1") is None
+
+
+def test_tiered_cache_promotes_disk_hits_to_memory(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "llm_cache.sqlite"))
+    disk.set("key", "value")
+    cache = TieredCache(InMemoryLRUCache(), disk)
+
+    assert cache.get("key") == "value"
+    assert cache.get("key") == "value"
+    assert cache.stats()["memory"]["hits"] == 1
+    assert cache.stats()["disk"]["hits"] == 1
+
+
+def test_pipeline_reports_cache_hits_and_misses(in_saved_models_dir):
+    model = CountingChatModel(latency=0)
+    pipeline = PredictionPipeline(llm_service=LLMService(model=model, cache=InMemoryLRUCache()))
+
+    for _ in range(3):
+        pipeline.predict(TICKET)
+
+    assert model.calls == 2
+    assert pipeline.cache_stats()["hits"] == 4
+    assert pipeline.cache_stats()["misses"] == 2
@@ -0,0 +1,220 @@
+import time
+import asyncio
+import logging
+import threading
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+from langchain_core.prompt_values import StringPromptValue
+
+from conftest import CountingChatModel, run
+from fakes import FakeLLMEndpoint, serve_in_thread
+from src.components.llm_client import LLMClient, LLMClientConfig
+from src.components.llm_service import LLMService
+
+PROMPT = StringPromptValue(text="Summarize: my order never arrived")
+
+# No quotas and near-instant backoff unless a test sets them.
+FAST = dict(requests_per_minute=None, tokens_per_minute=None, backoff_base=0.001, backoff_max=0.01)
+
+
+class ProviderError(Exception):
+    """An SDK error as LLMClient sees it: a status code and the response headers."""
+
+    def __init__(self, status_code: int, retry_after: float = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {} if retry_after is None else {"retry-after": str(retry_after)}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class FailingChatModel(CountingChatModel):
+    """Raises the queued errors on its first calls, then answers normally."""
+    errors: List[Any] = []
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.errors:
+            self._enter()
+            self._exit()
+            raise self.errors.pop(0)
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+def test_request_quota_paces_calls():
+    model = CountingChatModel(latency=0)
+    client = LLMClient(model, LLMClientConfig(**{**FAST, "requests_per_minute": 1200}))
+
+    start = time.perf_counter()
+    for _ in range(5):
+        client.invoke(PROMPT)
+    elapsed = time.perf_counter() - start
+
+    # 20 calls/s, no burst: the first goes at once, each of the others waits 50 ms.
+    assert elapsed >= 4 * 0.05 * 0.9
+    assert model.calls == 5
+    assert client.stats.throttled_seconds > 0
+
+
+def test_token_quota_paces_calls():
+    model = CountingChatModel(latency=0)
+    client = LLMClient(model, LLMClientConfig(**{**FAST, "tokens_per_minute": 6000}))
+
+    start = time.perf_counter()
+    messages = [client.invoke(PROMPT)[0] for _ in range(3)]
+    elapsed = time.perf_counter() - start
+
+    # Once a response reports its usage the estimate is corrected to it, so each call
+    # after the first waits for that many tokens to refill at 100 tokens/s.
+    used = messages[0].usage_metadata["total_tokens"]
+    assert elapsed >= 2 * used / 100 * 0.9
+    assert client.stats.throttled_seconds > 0
+
+
+def test_rate_limit_is_retried_after_the_providers_wait():
+    model = FailingChatModel(latency=0, errors=[ProviderError(429, retry_after=0.3)])
+    client = LLMClient(model, LLMClientConfig(**FAST))
+
+    start = time.perf_counter()
+    message, coalesced = client.invoke(PROMPT)
+
+    assert time.perf_counter() - start >= 0.3
+    assert message.content and not coalesced
+    assert client.stats.attempts == 2
+    assert client.stats.retries == 1
+    assert client.stats.rate_limited == 1
+
+
+def test_server_errors_are_retried_up_to_max_retries():
+    model = FailingChatModel(latency=0, errors=[ProviderError(503) for _ in range(4)])
+    client = LLMClient(model, LLMClientConfig(**FAST, max_retries=3))
+
+    with pytest.raises(ProviderError):
+        client.invoke(PROMPT)
+    assert client.stats.attempts == 4
+    assert client.stats.retries == 3
+    assert client.stats.failures == 1
+
+
+def test_client_errors_are_not_retried():
+    model = FailingChatModel(latency=0, errors=[ProviderError(400)])
+    client = LLMClient(model, LLMClientConfig(**FAST))
+
+    with pytest.raises(ProviderError):
+        client.invoke(PROMPT)
+    assert client.stats.attempts == 1
+    assert client.stats.retries == 0
+
+
+def test_slow_calls_time_out_and_are_retried():
+    client = LLMClient(CountingChatModel(latency=0.5), LLMClientConfig(**FAST, timeout=0.05, max_retries=1))
+
+    with pytest.raises(asyncio.TimeoutError):
+        run(client.ainvoke(PROMPT))
+    assert client.stats.timeouts == 2
+    assert client.stats.attempts == 2
+
+
+def test_identical_async_calls_in_flight_share_one_model_call():
+    model = CountingChatModel(latency=0.1)
+    client = LLMClient(model, LLMClientConfig(**FAST))
+
+    async def three():
+        return await asyncio.gather(*(client.ainvoke(PROMPT) for _ in range(3)))
+
+    results = run(three())
+
+    assert model.calls == 1
+    assert [coalesced for _, coalesced in results] == [False, True, True]
+    assert len({message.content for message, _ in results}) == 1
+    assert client.stats.coalesced == 2
+
+
+def test_identical_threaded_calls_in_flight_share_one_model_call():
+    model = CountingChatModel(latency=0.2)
+    client = LLMClient(model, LLMClientConfig(**FAST))
+    threads = [threading.Thread(target=client.invoke, args=(PROMPT,)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert model.calls == 1
+    assert client.stats.coalesced == 2
+
+
+def test_coalescing_can_be_turned_off():
+    model = CountingChatModel(latency=0.05)
+    client = LLMClient(model, LLMClientConfig(**FAST, coalesce=False))
+
+    async def three():
+        return await asyncio.gather(*(client.ainvoke(PROMPT) for _ in range(3)))
+
+    run(three())
+    assert model.calls == 3
+
+
+@pytest.fixture
+def fake_endpoint():
+    """Start a FakeLLMEndpoint factory; every endpoint it made is stopped after the test."""
+    from langchain_groq import ChatGroq
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    servers = []
+
+    def start(requests_per_minute):
+        endpoint = FakeLLMEndpoint(requests_per_minute, window_seconds=1.0, latency=0.01)
+        servers.append(serve_in_thread(endpoint))
+        model = ChatGroq(api_key="fake", base_url=endpoint.url, model="llama-3.3-70b-versatile",
+                         max_tokens=1000, max_retries=0, timeout=10)
+        return endpoint, model
+
+    yield start
+    for server in servers:
+        server.should_exit = True
+
+
+def summarize_all(service, texts):
+    async def all_summaries():
+        return await asyncio.gather(*(service.aget_ticket_summary(text) for text in texts))
+
+    return run(all_summaries())
+
+
+def test_client_quota_keeps_the_endpoint_from_rejecting_calls(fake_endpoint):
+    endpoint, model = fake_endpoint(requests_per_minute=600)
+    service = LLMService(model=model, client_config=LLMClientConfig(requests_per_minute=540, tokens_per_minute=None))
+    texts = [f"order {i} never arrived" for i in range(15)]
+
+    summaries = summarize_all(service, texts)
+
+    assert all(summary.content for summary in summaries)
+    assert endpoint.accepted == len(texts)
+    assert endpoint.rejected == 0
+
+
+def test_endpoint_rejections_are_retried_after_its_retry_after(fake_endpoint):
+    endpoint, model = fake_endpoint(requests_per_minute=300)
+    service = LLMService(model=model, client_config=LLMClientConfig(**FAST, max_retries=10))
+    texts = [f"order {i} never arrived" for i in range(12)]
+
+    summaries = summarize_all(service, texts)
+
+    stats = service.client_stats()
+    assert all(summary.content for summary in summaries)
+    assert endpoint.accepted == len(texts)
+    assert endpoint.rejected > 0
+    assert stats["rate_limited"] == endpoint.rejected
+    assert stats["retries"] == endpoint.rejected
+    assert stats["failures"] == 0
+
+
+def test_duplicate_tickets_in_flight_reach_the_endpoint_once(fake_endpoint):
+    endpoint, model = fake_endpoint(requests_per_minute=6000)
+    service = LLMService(model=model, client_config=LLMClientConfig(**FAST))
+
+    summaries = summarize_all(service, ["my parcel is lost"] * 5 + ["my bill is wrong"] * 5)
+
+    assert len(summaries) == 10
+    assert endpoint.accepted == 2
+    assert service.client_stats()["coalesced"] == 8
@@ -0,0 +1,64 @@
+import json
+from typing import Dict
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from conftest import CountingChatModel, run
+from src.components.llm_cache import InMemoryLRUCache
+from src.components.llm_service import LLMService, TicketEntities
+
+TICKET = "@AmazonHelp my parcel never arrived, please email me back"
+
+
+class ScriptedChatModel(CountingChatModel):
+    """Answers prompts containing a marker with the scripted content, others as the fake model does."""
+    replies: Dict[str, str] = {}
+
+    def _respond(self, messages):
+        prompt = "\n".join(str(message.content) for message in messages)
+        for marker, content in self.replies.items():
+            if marker in prompt:
+                return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+        return super()._respond(messages)
+
+
+def analyze_both_ways(service):
+    return service.analyze_ticket(TICKET), run(service.aanalyze_ticket(TICKET + " "))
+
+
+def test_unparsable_analysis_falls_back_to_ticket_entities():
+    entities = {"customer_name": "Dana", "issue_type": "account", "urgency": "high", "contact_method": "email"}
+    model = ScriptedChatModel(latency=0, replies={'"summary"': "Sure! Here is the summary...",
+                                                  '"issue_type"': json.dumps(entities)})
+    service = LLMService(model=model)
+
+    for result in analyze_both_ways(service):
+        assert result["entities"] == TicketEntities.model_validate(entities).model_dump()
+        assert result["summary"]
+        assert result["usage"]["fallback"] is True
+        assert result["usage"]["calls"] == 3
+    assert service.usage.calls == 6
+
+
+def test_fallback_entities_outside_the_schema_are_none_and_not_cached():
+    model = ScriptedChatModel(latency=0, replies={'"summary"': "not json",
+                                                  '"issue_type"': '{"issue_type": "shipping", "urgency": "high"}'})
+    service = LLMService(model=model, cache=InMemoryLRUCache())
+
+    for result in analyze_both_ways(service):
+        assert result["entities"] is None
+        assert result["usage"]["cached"] is False
+    assert len(service.cache) == 0
+
+
+def test_structured_analysis_is_one_call_and_cached():
+    model = CountingChatModel(latency=0)
+    service = LLMService(model=model, cache=InMemoryLRUCache())
+
+    first, again = analyze_both_ways(service)
+
+    assert first["usage"]["fallback"] is False and first["usage"]["calls"] == 1
+    assert again["usage"]["cached"] is True
+    assert {key: again[key] for key in ("summary", "entities")} == {key: first[key] for key in ("summary", "entities")}
+    assert model.calls == 1
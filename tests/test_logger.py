@@ -0,0 +1,119 @@
+import io
+import time
+import logging
+import threading
+
+import pytest
+
+import logger as log_module
+from logger import LoggingConfig, configure_logging, shutdown_logging, logging_stats
+
+test_logger = logging.getLogger("tests.logger")
+
+
+class FailingFlushStream(io.StringIO):
+    """A stream whose flush fails, like a closed stderr or a broken pipe."""
+
+    def flush(self):
+        raise ValueError("I/O operation on closed file.")
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    """Path of a log file for the test; logging goes back to its lazy default afterwards."""
+    monkeypatch.setattr(logging, "raiseExceptions", False)
+    yield tmp_path / "test.log"
+    shutdown_logging()
+
+
+def lines(path):
+    return path.read_text().splitlines()
+
+
+def test_async_records_are_written_in_order_by_the_listener(log_file):
+    configure_logging(LoggingConfig(mode="async", file_path=str(log_file), console=False), force=True)
+
+    for i in range(100):
+        test_logger.info("record %d", i)
+    shutdown_logging()
+
+    messages = [line.rsplit(" - ", 1)[1] for line in lines(log_file)]
+    assert messages == [f"record {i}" for i in range(100)]
+
+
+def test_arguments_are_rendered_when_logged_not_when_written(log_file):
+    configure_logging(LoggingConfig(mode="async", file_path=str(log_file), console=False), force=True)
+    values = ["before"]
+
+    test_logger.info("value %s", values)
+    values[0] = "after"
+    shutdown_logging()
+
+    assert lines(log_file)[0].endswith("value ['before']")
+
+
+def test_dropped_records_are_counted_and_reported(log_file):
+    configure_logging(LoggingConfig(mode="async", file_path=str(log_file), console=False,
+                                    queue_size=2, queue_policy="drop"), force=True)
+    file_handler = log_module._state["handlers"][0]
+
+    # While the listener is stuck writing the first record, only two more fit in the queue.
+    with file_handler.lock:
+        test_logger.info("first")
+        while logging_stats()["queued"]:
+            time.sleep(0.001)
+        for i in range(10):
+            test_logger.info("burst %d", i)
+        assert logging_stats()["dropped"] == 8
+    while logging_stats()["queued"]:
+        time.sleep(0.001)
+    test_logger.info("last")
+    shutdown_logging()
+
+    # The warning goes out ahead of the first record taken off the queue after the drops.
+    messages = [line.rsplit(" - ", 1)[1] for line in lines(log_file)]
+    assert messages == ["first", "Log queue full: 8 records dropped", "burst 0", "burst 1", "last"]
+
+
+def test_failing_flush_does_not_stop_the_listener(log_file):
+    configure_logging(LoggingConfig(mode="async", file_path=str(log_file), console=True, queue_size=10), force=True)
+    log_module._state["handlers"][1].setStream(FailingFlushStream())
+    listener = log_module._state["listener"]
+
+    def log_many():
+        for i in range(200):
+            test_logger.info("record %d", i)
+
+    thread = threading.Thread(target=log_many)
+    thread.start()
+    thread.join(10)
+
+    assert not thread.is_alive()
+    assert listener._thread.is_alive()
+    shutdown_logging()
+    assert len(lines(log_file)) == 200
+
+
+def test_teardown_does_not_hang_when_nobody_drains_the_queue(log_file, monkeypatch):
+    monkeypatch.setattr(log_module, "_STOP_TIMEOUT", 0.2)
+    configure_logging(LoggingConfig(mode="async", file_path=str(log_file), console=False,
+                                    queue_size=5, queue_policy="drop"), force=True)
+    listener = log_module._state["listener"]
+    # The listener thread exits, then the queue fills up with nobody to empty it.
+    listener.queue.put(listener._sentinel)
+    listener._thread.join()
+    for i in range(10):
+        test_logger.info("record %d", i)
+
+    start = time.perf_counter()
+    shutdown_logging()
+    assert time.perf_counter() - start < 2
+
+
+def test_sync_mode_writes_in_the_calling_thread(log_file):
+    configure_logging(LoggingConfig(mode="sync", file_path=str(log_file), console=False), force=True)
+
+    test_logger.info("written at once")
+
+    assert logging_stats()["mode"] == "sync"
+    assert lines(log_file)[0].endswith("written at once")
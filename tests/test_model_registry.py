@@ -0,0 +1,92 @@
+import os
+import time
+
+import pytest
+
+from src.components.linear_artifact import LinearTextClassifier
+from src.components.model_registry import ModelRegistry
+from utils import save_object
+
+
+def bump_mtime(path):
+    """Move the file's mtime forward, as a later write would."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def pickle_path(tmp_path):
+    path = str(tmp_path / "model.pkl")
+    save_object(path, {"version": 1})
+    return path
+
+
+def test_objects_are_loaded_once_and_shared(pickle_path):
+    registry = ModelRegistry()
+
+    assert registry.get(pickle_path) is registry.get(pickle_path)
+    assert registry.get(pickle_path) == {"version": 1}
+    assert list(registry.stats()) == [os.path.abspath(pickle_path)]
+
+
+def test_changed_content_is_reloaded(pickle_path):
+    registry = ModelRegistry(check_interval=0)
+    old = registry.get(pickle_path)
+
+    save_object(pickle_path, {"version": 2})
+    bump_mtime(pickle_path)
+
+    assert registry.get(pickle_path) == {"version": 2}
+    assert old == {"version": 1}  # holders of the old object keep it unchanged
+
+
+def test_touched_but_unchanged_file_keeps_the_loaded_object(pickle_path):
+    registry = ModelRegistry(check_interval=0)
+    old = registry.get(pickle_path)
+    checksum = registry.stats()[os.path.abspath(pickle_path)]["checksum"]
+
+    bump_mtime(pickle_path)
+
+    assert registry.get(pickle_path) is old
+    assert registry.stats()[os.path.abspath(pickle_path)]["checksum"] == checksum
+
+
+def test_changes_are_only_noticed_after_the_check_interval(pickle_path):
+    registry = ModelRegistry(check_interval=0.2)
+    registry.get(pickle_path)
+    save_object(pickle_path, {"version": 2})
+    bump_mtime(pickle_path)
+
+    assert registry.get(pickle_path) == {"version": 1}
+    time.sleep(0.25)
+    assert registry.get(pickle_path) == {"version": 2}
+
+
+def test_linear_artifacts_reload_when_their_manifest_changes(saved_models_dir):
+    artifact_dir = str(saved_models_dir / "saved_models" / "linear_model")
+    manifest = os.path.join(artifact_dir, "manifest.json")
+    registry = ModelRegistry(check_interval=0)
+    old = registry.get(artifact_dir)
+    assert isinstance(old, LinearTextClassifier)
+
+    bump_mtime(manifest)
+    assert registry.get(artifact_dir) is old
+
+    with open(manifest) as file_obj:
+        content = file_obj.read()
+    with open(manifest, "w") as file_obj:
+        file_obj.write(content.replace('"created_at": "', '"created_at": "0'))
+    bump_mtime(manifest)
+    assert registry.get(artifact_dir) is not old
+
+
+def test_file_checksum_is_recomputed_only_when_the_file_changes(pickle_path, monkeypatch):
+    import src.components.model_registry as model_registry
+
+    registry = ModelRegistry()
+    calls = []
+    monkeypatch.setattr(model_registry, "file_sha256", lambda path: calls.append(path) or str(len(calls)))
+
+    assert registry.file_checksum(pickle_path) == registry.file_checksum(pickle_path) == "1"
+    bump_mtime(pickle_path)
+    assert registry.file_checksum(pickle_path) == "2"
@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+import pytest
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.linear_model import LogisticRegression
+
+from src.components.model_trainer import ModelTrainer, ModelTrainerConfig
+
+
+class SleepyClassifier(ClassifierMixin, BaseEstimator):
+    """Predicts the first class after sleeping `seconds` in fit, or fails if `fail`."""
+
+    def __init__(self, seconds=0.0, fail=False):
+        self.seconds = seconds
+        self.fail = fail
+
+    def fit(self, X, y):
+        if self.fail:
+            raise ValueError("fit failed")
+        time.sleep(self.seconds)
+        self.classes_ = np.unique(y)
+        return self
+
+    def predict(self, X):
+        return np.full(X.shape[0], self.classes_[0])
+
+
+def split(seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(200, 5))
+    y = (X[:, 0] > 0).astype(int)
+    return X[:150], y[:150], X[150:], y[150:]
+
+
+def test_timed_out_candidates_are_stopped_without_delaying_the_rest():
+    trainer = ModelTrainer(ModelTrainerConfig(n_jobs=1, model_time_budget=1.0))
+    models = {
+        "slow": SleepyClassifier(seconds=60),
+        "fast": LogisticRegression(),
+        "also fast": SleepyClassifier(),
+    }
+
+    start = time.monotonic()
+    report = trainer.evaluate_models(*split(), models)
+
+    assert time.monotonic() - start < 10
+    assert report["slow"]["status"] == "timeout"
+    assert report["fast"]["status"] == report["also fast"]["status"] == "ok"
+    assert report["fast"]["f1_score"] > 0.8
+    assert hasattr(models["fast"], "coef_")
+
+
+def test_worker_errors_are_raised():
+    trainer = ModelTrainer(ModelTrainerConfig(n_jobs=2))
+
+    with pytest.raises(Exception, match="fit failed"):
+        trainer.evaluate_models(*split(), {"ok": SleepyClassifier(), "broken": SleepyClassifier(fail=True)})
@@ -0,0 +1,72 @@
+import numpy as np
+
+from src.components.near_duplicates import NearDuplicateDetector, NearDuplicateConfig
+
+TICKET = "my order never arrived and nobody answers the phone please help me get a refund"
+
+
+def words(n, start=0):
+    return [f"word{i}" for i in range(start, start + n)]
+
+
+def replaced(tokens, positions, tag):
+    return [f"{tag}{i}" if i in positions else token for i, token in enumerate(tokens)]
+
+
+def test_copies_of_a_ticket_share_the_first_ones_id():
+    texts = [
+        TICKET,
+        "my bill shows a charge i never made",
+        f"RT @115712: {TICKET}",
+        f"@AmazonHelp {TICKET} https://t.co/abc123",
+        TICKET.upper() + "!!",
+        "my bill shows a charge i never made @AskPayPal",
+    ]
+
+    cluster_ids = NearDuplicateDetector().cluster_ids(texts)
+
+    assert cluster_ids.tolist() == [0, 1, 0, 0, 0, 1]
+
+
+def test_members_must_match_the_representative_not_just_another_member():
+    # b is a near-copy of a and c of b, but c is far from a: no chaining c into a's cluster.
+    a = words(30)
+    b = replaced(a, {5, 15, 25}, "b")
+    c = replaced(b, {10, 20, 28}, "c")
+    detector = NearDuplicateDetector(NearDuplicateConfig(threshold=0.5))
+
+    cluster_ids = detector.cluster_ids([" ".join(a), " ".join(b), " ".join(c)])
+
+    assert cluster_ids.tolist() == [0, 0, 2]
+
+
+def test_band_collisions_below_the_threshold_are_not_duplicates():
+    # One band of one row: any shared minimum makes a candidate, whatever the similarity.
+    detector = NearDuplicateDetector(NearDuplicateConfig(threshold=0.8, num_perm=16))
+    detector.bands, detector.rows = 16, 1
+    detector.band_multipliers = detector.band_multipliers[:1]
+    a = words(20)
+    b = words(10) + words(10, start=100)
+
+    assert detector.cluster_ids([" ".join(a), " ".join(b)]).tolist() == [0, 1]
+
+
+def test_tickets_without_words_are_never_duplicates():
+    texts = ["", "@AppleSupport https://t.co/x", "RT", TICKET]
+
+    assert NearDuplicateDetector().cluster_ids(texts).tolist() == [0, 1, 2, 3]
+
+
+def test_first_of_cluster_and_cluster_weights():
+    detector = NearDuplicateDetector()
+    texts = [TICKET, "a different problem with my account login", f"RT @1: {TICKET}", TICKET]
+
+    assert detector.first_of_cluster(texts).tolist() == [True, True, False, False]
+    weights = detector.cluster_weights(detector.cluster_ids(texts))
+    assert np.allclose(weights, [1 / 3, 1, 1 / 3, 1 / 3])
+
+
+def test_bands_fit_the_threshold():
+    assert NearDuplicateDetector.choose_bands(0.8, 128) == (9, 13)
+    bands, rows = NearDuplicateDetector.choose_bands(0.5, 128)
+    assert bands * rows <= 128 and bands > 9
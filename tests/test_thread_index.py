@@ -0,0 +1,62 @@
+import pandas as pd
+import pyarrow as pa
+
+from src.components.thread_index import ThreadIndex
+
+
+def threads(index):
+    return sorted(sorted(index.ids[index.thread_rows(t)].tolist()) for t in range(index.n_threads))
+
+
+def twcs_frame():
+    # Two conversations written out of order, one reply to a tweet missing from the data.
+    return pd.DataFrame({
+        "tweet_id": [12, 10, 11, 20, 21, 30],
+        "in_response_to_tweet_id": [11, None, 10, None, 20, 99],
+        "created_at": ["Tue Oct 31 22:12:00 +0000 2017", "Tue Oct 31 22:10:00 +0000 2017",
+                       "Tue Oct 31 22:11:00 +0000 2017", "Tue Oct 31 21:00:00 +0000 2017",
+                       "Tue Oct 31 20:00:00 +0000 2017", "Tue Oct 31 23:00:00 +0000 2017"],
+        "inbound": [True, True, False, True, False, True],
+        "text": ["still broken", "my app crashes", "@user try updating", "where is my order",
+                 "@user it shipped", "thanks"],
+    })
+
+
+def test_replies_are_grouped_with_their_thread_in_time_order():
+    index = ThreadIndex.from_frame(twcs_frame())
+
+    assert threads(index) == [[10, 11, 12], [20, 21], [30]]
+    assert index.conversation(12).tolist() == [10, 11, 12]
+    # Ordered by created_at, not by tweet id.
+    assert index.conversation(20).tolist() == [21, 20]
+    assert index.root_ids.tolist() == [10, 20, 30]
+
+
+def test_conversation_text_and_iteration():
+    index = ThreadIndex.from_frame(twcs_frame())
+
+    assert index.conversation_text(11) == "my app crashes\nstill broken"
+    assert index.conversation_text(11, inbound_only=False, sep=" | ") == (
+        "my app crashes | @user try updating | still broken")
+    assert list(index.iter_conversations(min_size=2)) == [
+        (10, "my app crashes\nstill broken"), (20, "where is my order")]
+
+
+def test_reply_cycles_become_thread_starts():
+    tweet_ids = [1, 2, 3, 10, 11, 12, 13, 20, 4, 5, 6]
+    parent_ids = [2, 1, 1, 11, 12, 10, 12, 20, -1, 4, 7]
+
+    index = ThreadIndex(tweet_ids, parent_ids, texts=pa.array([str(i) for i in tweet_ids]))
+
+    # Every tweet of a cycle starts its own thread; replies into a cycle keep their parent.
+    assert threads(index) == [[1, 3], [2], [4, 5], [6], [10], [11], [12, 13], [20]]
+    assert index.conversation_text(3) == "1\n3"
+
+
+def test_long_chains_and_empty_index():
+    n = 1000
+    index = ThreadIndex(range(n), [-1] + list(range(n - 1)))
+
+    assert index.n_threads == 1
+    assert index.conversation(n - 1).tolist() == list(range(n))
+    assert ThreadIndex([], []).n_threads == 0
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.components.data_transformation import DataTransformation
+from src.components.token_store import TokenStore, TokenStoreConfig
+
+WORDS = ("order never arrived refund my the package late account locked password reset bill charged twice "
+         "app crashes update phone battery drains help please thanks again why is not working").split()
+
+
+def tickets(n, seed=0):
+    rng = np.random.default_rng(seed)
+    texts = [" ".join(rng.choice(WORDS, size=rng.integers(0, 12))) for _ in range(n)]
+    # Case, punctuation and one-letter tokens are handled as the vectorizers do.
+    return texts + ["My ORDER, never arrived!!", "a b c", "", "Ünïcode café déjà vu"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TokenStore(TokenStoreConfig(store_dir=str(tmp_path / "token_store"), chunk_size=7))
+
+
+def assert_same_counts(matrix, features, expected, vectorizer):
+    assert features.vocabulary() == vectorizer.vocabulary_
+    assert matrix.shape == expected.shape
+    assert (matrix != expected).nnz == 0
+
+
+@pytest.mark.parametrize("settings", [
+    dict(),
+    dict(stop_words="english"),
+    dict(ngram_range=(1, 3)),
+    dict(ngram_range=(2, 2), stop_words="english"),
+    dict(min_df=3, max_df=0.5),
+    dict(max_features=10),
+    dict(max_features=25, ngram_range=(1, 2), binary=True),
+])
+def test_count_matrix_matches_count_vectorizer(store, settings):
+    texts = tickets(200)
+    store.append(texts)
+    vectorizer = CountVectorizer(**settings)
+    expected = vectorizer.fit_transform(texts)
+
+    matrix, features = store.count_matrix(**settings)
+
+    assert_same_counts(matrix, features, expected, vectorizer)
+
+
+def test_selected_features_count_other_rows_like_transform(store):
+    texts = tickets(200)
+    store.append(texts)
+    rows = np.arange(0, len(texts), 2)
+    vectorizer = CountVectorizer(ngram_range=(1, 2), stop_words="english", max_features=30)
+    vectorizer.fit([texts[row] for row in rows])
+    _, features = store.count_matrix(rows, ngram_range=(1, 2), stop_words="english", max_features=30)
+
+    # Rows appended after the selection bring new tokens, which must match nothing.
+    new_texts = ["brand new words arrived late", "order never arrived again zzz"]
+    store.append(new_texts)
+    other = np.r_[np.arange(1, len(texts), 2), len(texts), len(texts) + 1]
+    matrix, _ = store.count_matrix(other, ngram_range=(1, 2), stop_words="english", features=features)
+
+    all_texts = texts + new_texts
+    assert_same_counts(matrix, features, vectorizer.transform([all_texts[row] for row in other]), vectorizer)
+
+
+def test_store_reopens_and_syncs_with_its_dataset(tmp_path, store):
+    data_path = str(tmp_path / "tickets.parquet")
+    pd.DataFrame({"text": tickets(50)}).to_parquet(data_path)
+    store.sync(data_path)
+    reopened = TokenStore(store.config)
+    assert reopened.rows == 54
+    assert reopened.sync(data_path).manifest["updated_at"] == store.manifest["updated_at"]
+
+    pd.DataFrame({"text": tickets(30, seed=1)}).to_parquet(data_path)
+    assert reopened.sync(data_path).rows == 34
+    matrix, _ = reopened.count_matrix()
+    assert (matrix != CountVectorizer().fit_transform(tickets(30, seed=1))).nnz == 0
+
+
+def test_features_from_the_store_match_fitting_on_the_text(tmp_path, store, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the preprocessor is saved to saved_models/
+    df = pd.DataFrame({"text": tickets(400), "category": np.arange(404) % 3})
+    store.append(df["text"])
+
+    expected = DataTransformation().initiate_data_transformation(df, "category")
+    transformation = DataTransformation(token_store=store)
+    calls = []
+    monkeypatch.setattr(store, "count_matrix", lambda *args, **kwargs: calls.append(args) or
+                        TokenStore.count_matrix(store, *args, **kwargs))
+    X_train, y_train, X_test, y_test, preprocessor_path = transformation.initiate_data_transformation(df, "category")
+
+    assert len(calls) == 2
+    assert abs(X_train - expected[0]).max() < 1e-12
+    assert abs(X_test - expected[2]).max() < 1e-12
+    assert (y_train == expected[1]).all() and (y_test == expected[3]).all()
+    # The saved preprocessor turns raw text into the store's features.
+    from utils import load_object
+    _, X_test_text, _, _ = DataTransformation().split_data(df, "category")
+    assert abs(load_object(preprocessor_path).transform(X_test_text) - X_test).max() < 1e-12
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from src.components.triage_policy import TIER_LLM, TIER_LOCAL, TriagePolicy
+
+CONFIDENCES = [0.99, 0.95, 0.9, 0.8, 0.7, 0.6]
+CORRECT = [True, True, True, False, True, False]
+CALM = np.zeros(len(CONFIDENCES))
+
+
+def test_calibration_picks_the_lowest_threshold_that_keeps_local_accuracy():
+    policy, report = TriagePolicy.calibrate(CONFIDENCES, CALM, CORRECT,
+                                            max_llm_fraction=0.9, min_local_accuracy=0.95)
+
+    assert policy.confidence_threshold == 0.9
+    assert report["local_accuracy"] == 1.0
+    assert report["llm_fraction"] == 0.5
+    assert report["meets_accuracy"] and report["meets_budget"]
+    assert policy.route(CONFIDENCES, CALM).tolist() == [TIER_LOCAL] * 3 + [TIER_LLM] * 3
+
+
+def test_llm_budget_wins_over_the_accuracy_target():
+    policy, report = TriagePolicy.calibrate(CONFIDENCES, CALM, CORRECT,
+                                            max_llm_fraction=0.2, min_local_accuracy=0.95)
+
+    assert policy.confidence_threshold == 0.7
+    assert report["llm_fraction"] == pytest.approx(1 / 6)
+    assert report["local_accuracy"] == pytest.approx(0.8)
+    assert not report["meets_accuracy"]
+    assert report["meets_budget"]
+
+
+def test_threshold_never_splits_tied_confidences():
+    confidences = [0.9, 0.9, 0.9, 0.5]
+    correct = [True, True, False, True]
+
+    # The two correct tickets tied with a wrong one can't be kept local on their own.
+    policy, report = TriagePolicy.calibrate(confidences, np.zeros(4), correct,
+                                            max_llm_fraction=1.0, min_local_accuracy=0.9)
+    assert policy.confidence_threshold == float("inf")
+    assert report["local_accuracy"] is None
+    assert report["llm_fraction"] == 1.0
+
+    # Under a budget, the whole tie goes local.
+    policy, report = TriagePolicy.calibrate(confidences, np.zeros(4), correct,
+                                            max_llm_fraction=0.3, min_local_accuracy=0.9)
+    assert policy.confidence_threshold == 0.9
+    assert report["llm_fraction"] == 0.25
+
+
+def test_urgent_tickets_always_go_to_the_llm():
+    confidences = [1.0, 0.9, 0.8]
+    urgency = np.array([1.0, 0.0, 0.0])
+
+    policy, report = TriagePolicy.calibrate(confidences, urgency, [True] * 3,
+                                            max_llm_fraction=1.0, min_local_accuracy=0.9)
+
+    assert policy.confidence_threshold == 0.8
+    assert report["urgent_fraction"] == pytest.approx(1 / 3)
+    assert policy.route(confidences, urgency).tolist() == [TIER_LLM, TIER_LOCAL, TIER_LOCAL]
+
+
+def test_unknown_confidence_goes_to_the_llm():
+    policy = TriagePolicy(confidence_threshold=0.5)
+
+    assert policy.route([None, 0.6], np.zeros(2)).tolist() == [TIER_LLM, TIER_LOCAL]
+
+
+@pytest.mark.parametrize("text, score", [
+    ("How do I change my delivery address?", 0.0),
+    ("Charged again, this is unacceptable", 1.0),
+    ("Please cancel my order", 0.5),
+    ("It gains weight over time", 0.0),
+    ("Where is my refund!!", 0.25),
+    ("MY PHONE KEEPS CRASHING", 0.25),
+    ("NOT OK", 0.0),
+])
+def test_urgency_score(text, score):
+    assert TriagePolicy().urgency(text) == score
+
+
+def test_triage_without_urgent_keywords():
+    tiers, urgency = TriagePolicy(urgent_keywords=[]).triage(["urgent!!", "hello"], [0.9, 0.9])
+
+    assert urgency.tolist() == [0.25, 0.0]
+    assert tiers.tolist() == [TIER_LOCAL, TIER_LOCAL]
+
+
+def test_saved_policy_round_trips(tmp_path):
+    path = str(tmp_path / "triage_policy.json")
+    TriagePolicy(confidence_threshold=0.72, urgency_threshold=0.4, urgent_keywords=["refund"]).save(path)
+
+    policy = TriagePolicy.load(path)
+
+    assert (policy.confidence_threshold, policy.urgency_threshold) == (0.72, 0.4)
+    assert policy.urgency("REFUND please") == 0.5
+    assert TriagePolicy.load(str(tmp_path / "missing.json")).confidence_threshold == 0.8
@@ -1,6 +1,6 @@
 import os
 import sys
-import dill
+import hashlib
 
 # Make imports work even when utils.py is imported from subdirectories
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -19,6 +19,9 @@ def save_object(file_path, obj):
         CustomException: If there is an error during the saving process.
     """
     try:
+        # Imported here so modules that only need file_sha256 do not load dill.
+        import dill
+
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
 
@@ -41,9 +44,30 @@ def load_object(file_path):
         CustomException: If there is an error during the loading process.
     """
     try:
+        import dill
+
         with open(file_path, 'rb') as file_obj:
             obj = dill.load(file_obj)
         return obj
 
+    except Exception as e:
+        raise CustomException(e, sys)
+def file_sha256(file_path):
+    """
+    Return the hex sha256 of a file, read in 1 MiB blocks.
+
+    Args:
+        file_path (str): The path to the file to hash.
+
+    Raises:
+        CustomException: If the file cannot be read.
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file_obj:
+            for block in iter(lambda: file_obj.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
     except Exception as e:
         raise CustomException(e, sys)
\ No newline at end of file